@@ -0,0 +1,283 @@
+"""Load test for generated projects (`fasterapi bench`).
+
+Starts the app with uvicorn against a throwaway database (or targets a
+running server), seeds users through /auth/join and drives the real
+endpoints at a fixed concurrency with httpx. Results are written as JSON so
+runs can be diffed between releases.
+"""
+import asyncio
+import contextlib
+import json
+import os
+import platform
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from importlib import metadata
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+import httpx
+
+API = "/api/v1"
+PASSWORD = "bench-password"
+
+SCENARIOS = ["login", "refresh", "me", "profile"]
+
+# Longest pause of a client task after a transport error (seconds)
+MAX_BACKOFF = 1.0
+
+# JSON-serializable results of one scenario or a whole run
+Results = Dict[str, Any]
+
+
+class BenchUser:
+    """Credentials and tokens of one seeded user, owned by one client task."""
+
+    def __init__(self, email: str) -> None:
+        self.email = email
+        self.access_token: Optional[str] = None
+        self.refresh_token: Optional[str] = None
+
+    async def login(self, client: httpx.AsyncClient) -> httpx.Response:
+        response = await client.post(f"{API}/auth/login", data={
+            "username": self.email, "password": PASSWORD})
+        if response.status_code == 200:
+            self.access_token = response.json()["access_token"]
+            self.refresh_token = response.cookies.get("refresh_token")
+        return response
+
+    async def refresh(self, client: httpx.AsyncClient) -> httpx.Response:
+        # Each refresh rotates the token, so the cookie is tracked per user
+        response = await client.post(f"{API}/auth/refresh", headers={
+            "Cookie": f"refresh_token={self.refresh_token}"})
+        if response.status_code == 200:
+            self.access_token = response.json()["access_token"]
+            self.refresh_token = response.cookies.get("refresh_token")
+        return response
+
+    async def me(self, client: httpx.AsyncClient) -> httpx.Response:
+        return await client.get(f"{API}/user/", headers=self._auth())
+
+    async def profile(self, client: httpx.AsyncClient) -> httpx.Response:
+        return await client.patch(f"{API}/user/profile", headers=self._auth(),
+                                  json={"timezone": "UTC", "locale": "en"})
+
+    def _auth(self) -> Dict[str, str]:
+        return {"Authorization": f"Bearer {self.access_token}"}
+
+
+def percentile(sorted_values: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, round(pct / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def summarize(latencies: List[float], statuses: Mapping[int, int], errors: int,
+              elapsed: float) -> Results:
+    """Return RPS and latency percentiles (in ms) for one scenario."""
+    latencies = sorted(latencies)
+    requests = len(latencies)
+    return {
+        "requests": requests,
+        "errors": errors,
+        "status_codes": {str(code): count for code, count in sorted(statuses.items())},
+        "rps": round(requests / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": {
+            "mean": round(sum(latencies) / requests, 3) if requests else 0.0,
+            "p50": round(percentile(latencies, 50), 3),
+            "p95": round(percentile(latencies, 95), 3),
+            "p99": round(percentile(latencies, 99), 3),
+            "max": round(latencies[-1], 3) if requests else 0.0,
+        },
+    }
+
+
+async def run_scenario(client: httpx.AsyncClient, users: List[BenchUser], scenario: str,
+                       concurrency: int, duration: float) -> Results:
+    """Run one scenario with `concurrency` tasks for `duration` seconds."""
+    latencies: List[float] = []
+    statuses: Dict[int, int] = {}
+    errors = 0
+    deadline = time.perf_counter() + duration
+
+    async def worker(user: BenchUser) -> None:
+        nonlocal errors
+        action: Callable[[httpx.AsyncClient], Any] = getattr(user, scenario)
+        backoff = 0.0
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            try:
+                response: httpx.Response = await action(client)
+            except httpx.HTTPError:
+                # Refused connections fail at once while the server is down,
+                # so wait before retrying instead of spinning
+                errors += 1
+                backoff = min(max(backoff * 2, 0.01), MAX_BACKOFF)
+                await asyncio.sleep(min(backoff, max(deadline - time.perf_counter(), 0)))
+                continue
+            backoff = 0.0
+            latencies.append((time.perf_counter() - started) * 1000)
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+            if response.status_code >= 400:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(user) for user in users[:concurrency]))
+    return summarize(latencies, statuses, errors, time.perf_counter() - started)
+
+
+async def seed_users(client: httpx.AsyncClient, count: int, concurrency: int) -> List[BenchUser]:
+    """Register `count` users through /auth/join; existing ones are reused."""
+    users = [BenchUser(f"bench{index}@example.com") for index in range(count)]
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def join(user: BenchUser) -> None:
+        async with semaphore:
+            response = await client.post(f"{API}/auth/join", json={
+                "email": user.email, "password": PASSWORD, "name": "Bench User"})
+            # 400 means the user exists from an earlier run against the same DB
+            if response.status_code not in (201, 400):
+                raise RuntimeError(
+                    f"Seeding {user.email} failed: {response.status_code} {response.text}")
+            await user.login(client)
+            if user.access_token is None:
+                raise RuntimeError(f"Logging in {user.email} failed")
+
+    await asyncio.gather(*(join(user) for user in users))
+    return users
+
+
+async def _bench(base_url: str, scenarios: Sequence[str], users: int, concurrency: int,
+                 duration: float, on_scenario: Callable[[str, Results], None]) -> Results:
+    limits = httpx.Limits(max_connections=concurrency,
+                          max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+        # One user per client task keeps refresh token chains independent
+        bench_users = await seed_users(client, max(users, concurrency), concurrency)
+        results: Results = {}
+        for scenario in scenarios:
+            results[scenario] = await run_scenario(
+                client, bench_users, scenario, concurrency, duration)
+            on_scenario(scenario, results[scenario])
+        return results
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port: int = sock.getsockname()[1]
+        return port
+
+
+def _wait_until_up(base_url: str, process: "subprocess.Popen[bytes]", timeout: float = 30) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError("The app exited during startup, see its output above")
+        try:
+            if httpx.get(f"{base_url}/", timeout=1).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"The app did not answer on {base_url} within {timeout}s")
+
+
+@contextlib.contextmanager
+def start_app(database_url: Optional[str], workers: int,
+              env_overrides: Optional[Mapping[str, str]] = None) -> Iterator[str]:
+    """Run the project in the current directory with uvicorn for a with block.
+
+    Yields the base URL and stops the server on exit. Without database_url a
+    temporary SQLite file is used, so the run never touches the development
+    database; it is removed afterwards. A given database_url must already
+    be migrated.
+    """
+    with tempfile.TemporaryDirectory(prefix="fasterapi-bench-") as tmp_dir:
+        env = dict(os.environ)
+        if database_url is None:
+            database_url = "sqlite:///" + os.path.join(tmp_dir, "bench.db")
+            # The throwaway database has no alembic history; create the tables
+            env["DB_SCHEMA_CHECK"] = "create_all"
+        env["DATABASE_URL"] = database_url
+        env.update(env_overrides or {})
+        port = _free_port()
+        process = subprocess.Popen([
+            sys.executable, "-m", "uvicorn", "app.main:app",
+            "--host", "127.0.0.1", "--port", str(port),
+            "--workers", str(workers),
+            "--no-access-log", "--log-level", "warning",
+        ], cwd=os.getcwd(), env=env)
+        base_url = f"http://127.0.0.1:{port}"
+        try:
+            _wait_until_up(base_url, process)
+            yield base_url
+        finally:
+            process.terminate()
+            process.wait()
+
+
+def run_bench(url: Optional[str] = None, database_url: Optional[str] = None, workers: int = 1,
+              users: int = 50, concurrency: int = 10, duration: float = 10.0,
+              scenarios: Optional[Sequence[str]] = None,
+              on_scenario: Callable[[str, Results], None] = lambda name, result: None) -> Results:
+    """Benchmark the app and return the JSON-serializable results."""
+    scenarios = scenarios or SCENARIOS
+    external = url is not None
+    with contextlib.ExitStack() as stack:
+        if url is None:
+            url = stack.enter_context(start_app(database_url, workers))
+        results = asyncio.run(_bench(url.rstrip("/"), scenarios, users,
+                                     concurrency, duration, on_scenario))
+
+    try:
+        version = metadata.version("tle-faster-api")
+    except metadata.PackageNotFoundError:
+        version = "unknown"
+    return {
+        "meta": {
+            "faster_api_version": version,
+            "python": platform.python_version(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "target": "external" if external else
+                      (database_url or "sqlite").split(":", 1)[0],
+            "workers": workers,
+            "users": max(users, concurrency),
+            "concurrency": concurrency,
+            "duration_s": duration,
+        },
+        "scenarios": results,
+    }
+
+
+def compare(results: Results, baseline: Results,
+            threshold: float) -> List[Tuple[str, str, float, float, float, bool]]:
+    """Compare two result files scenario by scenario.
+
+    Returns rows of (scenario, metric, baseline, current, change, regressed);
+    a drop in RPS or a rise in p99 latency beyond `threshold` (a fraction)
+    counts as a regression.
+    """
+    rows: List[Tuple[str, str, float, float, float, bool]] = []
+    for scenario, current in results["scenarios"].items():
+        previous = baseline.get("scenarios", {}).get(scenario)
+        if previous is None:
+            continue
+        for metric, before, after, higher_is_better in (
+            ("rps", previous["rps"], current["rps"], True),
+            ("p99_ms", previous["latency_ms"]["p99"], current["latency_ms"]["p99"], False),
+        ):
+            change = (after - before) / before if before else 0.0
+            regressed = -change > threshold if higher_is_better else change > threshold
+            rows.append((scenario, metric, before, after, change, regressed))
+    return rows
+
+
+def write_results(results: Results, path: str) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+        f.write("\n")
@@ -1,27 +1,54 @@
 # type: ignore
+import time
+
+# Measured from here so `--timing` can report how long the CLI took to import
+_STARTED = time.perf_counter()
+
 import argparse
-import getpass
 import os
 import subprocess
 import sys
-import uuid
 from pathlib import Path
 
-from pydantic import ValidationError as PydanticValidationError
-from rich.console import Console
-from rich.markdown import Markdown
-from rich.panel import Panel
-from rich.prompt import Confirm, Prompt
-
-import faster_api.messages as messages
+# rich, pydantic and the project's own modules are imported by the commands
+# that use them, so `fasterapi --help` and commands like `migrate` start fast
+# and work without a configured project.
 
-console = Console()
+MIGRATIONS_DIR = Path(__file__).parent / "templates/migrations"
 
 sys.path.insert(0, os.getcwd())
 
+_IMPORTED = time.perf_counter()
+
+
+class _LazyConsole:
+    """Stands in for a rich Console until the first command prints."""
+
+    def __init__(self):
+        self._console = None
+
+    def __getattr__(self, name):
+        if self._console is None:
+            from rich.console import Console
+            self._console = Console()
+        return getattr(self._console, name)
+
+
+console = _LazyConsole()
+
+
+def positive_int(value):
+    """argparse type for counts that must be at least 1."""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
 
 def main():
     parser = argparse.ArgumentParser(prog="fasterapi")
+    parser.add_argument("--timing", action="store_true",
+                        help="Print how long importing and running the command took")
     subparsers = parser.add_subparsers(dest="command")
 
     # Start a new Project
@@ -30,11 +57,17 @@ def main():
     project_parser.add_argument("name", help="Project name")
     project_parser.add_argument("--db_port", type=int, default=5432,
                                 help="The port to run the (optional) local PostgreSQL server on.")
+    project_parser.add_argument("--async-db", action="store_true",
+                                help="Generate an async SQLAlchemy engine, CRUD layer and views.")
+    project_parser.add_argument("--template", default=None,
+                                help="Template directory or registered template name to use instead of the bundled one.")
 
     # Start a new App
     app_parser = subparsers.add_parser(
         "startapp", help="Start a new app in the current directory")
     app_parser.add_argument("name", help="App name")
+    app_parser.add_argument("--template", default=None,
+                            help="Template directory or registered template name to use instead of the bundled one.")
 
     # Run the local development server
     runserver_parser = subparsers.add_parser(
@@ -44,11 +77,81 @@ def main():
     runserver_parser.add_argument(
         "--port", type=int, default=8080, help="Port to bind (default: 8080)")
 
+    # Run the production server
+    serve_parser = subparsers.add_parser(
+        "serve", help="Run the app with multiple uvicorn worker processes")
+    serve_parser.add_argument(
+        "--host", default="127.0.0.1", help="Host to bind (default: 127.0.0.1)")
+    serve_parser.add_argument(
+        "--port", type=int, default=8080, help="Port to bind (default: 8080)")
+    serve_parser.add_argument(
+        "--workers", type=int, default=os.cpu_count() or 1,
+        help="Number of worker processes (default: CPU count)")
+    serve_parser.add_argument(
+        "--loop", choices=["auto", "asyncio", "uvloop"], default="auto",
+        help="Event loop implementation (default: auto, uvloop when installed)")
+    serve_parser.add_argument(
+        "--http", choices=["auto", "h11", "httptools"], default="auto",
+        help="HTTP parser implementation (default: auto, httptools when installed)")
+    serve_parser.add_argument(
+        "--backlog", type=int, default=2048,
+        help="Maximum number of pending connections (default: 2048)")
+    serve_parser.add_argument(
+        "--limit-concurrency", type=int, default=None,
+        help="Answer 503 once a worker has this many open connections or tasks")
+    serve_parser.add_argument(
+        "--timeout-keep-alive", type=int, default=5,
+        help="Seconds to keep idle keep-alive connections open (default: 5)")
+    serve_parser.add_argument(
+        "--limit-max-requests", type=int, default=None,
+        help="Restart a worker after it has served this many requests")
+    serve_parser.add_argument(
+        "--timeout-graceful-shutdown", type=int, default=30,
+        help="Seconds a stopping worker waits for in-flight requests (default: 30)")
+
+    # Load test
+    bench_parser = subparsers.add_parser(
+        "bench", help="Load test the project's auth and user endpoints")
+    bench_parser.add_argument(
+        "--url", default=None,
+        help="Benchmark an already running server instead of starting one")
+    bench_parser.add_argument(
+        "--database-url", default=None,
+        help="Database for the started app (default: a temporary SQLite file)")
+    bench_parser.add_argument(
+        "--workers", type=int, default=1,
+        help="Worker processes for the started app (default: 1)")
+    bench_parser.add_argument(
+        "--users", type=int, default=50, help="Users to seed (default: 50)")
+    bench_parser.add_argument(
+        "--concurrency", type=int, default=10,
+        help="Concurrent clients (default: 10)")
+    bench_parser.add_argument(
+        "--duration", type=float, default=10,
+        help="Seconds to run each scenario (default: 10)")
+    bench_parser.add_argument(
+        "--scenarios", default="login,refresh,me,profile",
+        help="Comma-separated scenarios: login, refresh, me, profile")
+    bench_parser.add_argument(
+        "--output", default="bench-results.json",
+        help="JSON results file (default: bench-results.json)")
+    bench_parser.add_argument(
+        "--compare", default=None,
+        help="Earlier results file; exit with status 1 on a regression")
+    bench_parser.add_argument(
+        "--threshold", type=float, default=10,
+        help="Allowed RPS drop or p99 rise in percent for --compare (default: 10)")
+
     # Database migrations
     makemigrations_parser = subparsers.add_parser(
         "makemigrations", help="Create new alembic migration")
     migrate_parser = subparsers.add_parser(
         "migrate", help="Apply alembic migrations")
+    addmigration_parser = subparsers.add_parser(
+        "addmigration", help="Add a migration shipped with faster-api on top of the current alembic head")
+    addmigration_parser.add_argument(
+        "name", choices=sorted(p.stem for p in MIGRATIONS_DIR.glob("*.py")),
+        help="Name of the shipped migration")
 
     # Local Development DB Controls
     dbup_parser = subparsers.add_parser(
@@ -58,31 +161,129 @@ def main():
     dbreset_parser = subparsers.add_parser(
         "dbreset", help="Deletes the local development database container and volume from docker")
 
+    dbpool_parser = subparsers.add_parser(
+        "dbpool", help="Print live connection pool stats from a running app")
+    dbpool_parser.add_argument(
+        "--host", default="127.0.0.1", help="Host of the running app (default: 127.0.0.1)")
+    dbpool_parser.add_argument(
+        "--port", type=int, default=8080, help="Port of the running app (default: 8080)")
+    dbpool_parser.add_argument(
+        "--interval", type=float, default=0,
+        help="Keep sampling every INTERVAL seconds (default: print once)")
+    dbpool_parser.add_argument(
+        "--samples", type=int, default=0,
+        help="Stop after this many samples when --interval is set (default: until interrupted)")
+
+    purgetokens_parser = subparsers.add_parser(
+        "purgetokens", help="Delete expired and revoked refresh tokens")
+    purgetokens_parser.add_argument(
+        "--batch-size", type=int, default=None,
+        help="Rows deleted per transaction (default: REFRESH_TOKEN_SWEEP_BATCH_SIZE)")
+
+    # Import time of the app, to find what slows down worker startup
+    importtime_parser = subparsers.add_parser(
+        "importtime", help="Show which modules dominate the app's import time")
+    importtime_parser.add_argument(
+        "--module", default="app.main", help="Module to import (default: app.main)")
+    importtime_parser.add_argument(
+        "--apps", default=None,
+        help="Comma-separated apps to load, as FASTERAPI_APPS (default: all)")
+    importtime_parser.add_argument(
+        "--runs", type=positive_int, default=3, help="Imports to run; the fastest is reported (default: 3)")
+    importtime_parser.add_argument(
+        "--top", type=int, default=15, help="Rows per table (default: 15)")
+
+    # Manage the local template registry
+    template_parser = subparsers.add_parser(
+        "template", help="Register custom templates for startproject/startapp --template")
+    template_subparsers = template_parser.add_subparsers(dest="template_command", required=True)
+    template_add_parser = template_subparsers.add_parser(
+        "add", help="Register a template directory under a name")
+    template_add_parser.add_argument("name", help="Template name")
+    template_add_parser.add_argument("path", help="Template directory")
+    template_subparsers.add_parser("list", help="List registered templates")
+    template_remove_parser = template_subparsers.add_parser(
+        "remove", help="Unregister a template")
+    template_remove_parser.add_argument("name", help="Template name")
+
     createsuperuser_parser = subparsers.add_parser(
         "createsuperuser", help="Interactive command to create a new superuser in the database.")
 
-    args = parser.parse_args()
-    if args.command is None:
-        parser.print_help()
-        return
+    # argparse exits from parse_args() for --help and usage errors, so look
+    # for --timing before it runs to report those as well
+    timing = "--timing" in sys.argv[1:]
+    parsed = None
+    try:
+        args = parser.parse_args()
+        timing = args.timing
+        parsed = time.perf_counter()
+        if args.command is None:
+            parser.print_help()
+        else:
+            run_command(args)
+    finally:
+        if timing:
+            print_timing(parsed)
+
+
+def print_timing(parsed=None):
+    """Report import, argument parsing and command time on stderr.
+
+    parsed is None when argparse exited before a command ran.
+    """
+    finished = time.perf_counter()
+    if parsed is None:
+        parsed = finished
+    sys.stderr.write(
+        f"import: {(_IMPORTED - _STARTED) * 1000:.1f} ms, "
+        f"startup: {(parsed - _STARTED) * 1000:.1f} ms, "
+        f"command: {(finished - parsed) * 1000:.1f} ms, "
+        f"total: {(finished - _STARTED) * 1000:.1f} ms\n")
+
+
+def run_command(args):
+    """Run the subcommand chosen on the command line."""
     if args.command == "startproject":
+        from rich.panel import Panel
+
+        import faster_api.messages as messages
         console.print(
             f"[bold green]Setting up your FastAPI project...[/bold green]")
-        copy_template(Path(__file__).parent / "templates/project", ".", args.name, {
+        replacements = {
             "<<PROJECT_NAME>>": args.name,
             "<<DB_PORT>>": args.db_port
-        })
+        }
+        templates = template_layers(
+            args.template, "project", "project_async" if args.async_db else None)
+        if templates is None:
+            return
+        copy_template(templates, ".", args.name, replacements)
         console.print(Panel(messages.SUCCESSFUL_PROJECT_CREATION.format(
             project_name=args.name), title="[bold green]Success[/bold green]"))
 
     elif args.command == "startapp":
+        from rich.panel import Panel
+
+        import faster_api.messages as messages
         console.print(
             f"[bold green]Creating new app:[/bold green] {args.name}")
-        copy_template(Path(__file__).parent / "templates/app",
-                      "app", args.name, {"<<APP_NAME>>": args.name})
-        console.print(Panel(messages.SUCCESSFUL_APP_CREATION.format(
+        templates = template_layers(
+            args.template, "app", "app_async" if is_async_project() else None)
+        if templates is None:
+            return
+        copy_template(templates, "app", args.name, {"<<APP_NAME>>": args.name})
+        # Projects generated before the app registry are wired up by hand
+        message = messages.SUCCESSFUL_APP_REGISTRATION if register_app(args.name) \
+            else messages.SUCCESSFUL_APP_CREATION
+        console.print(Panel(message.format(
             app_name=args.name), title="[bold green]Success[/bold green]"))
 
+    elif args.command == "template":
+        handle_template(args)
+
+    elif args.command == "importtime":
+        handle_importtime(args)
+
     elif args.command == "runserver":
         cmd = [
             "uvicorn",
@@ -95,7 +296,14 @@ def main():
             f"[bold cyan]Running server:[/bold cyan] {' '.join(cmd)}")
         subprocess.run(cmd, cwd=os.getcwd(), check=True)
 
+    elif args.command == "serve":
+        handle_serve(args)
+
+    elif args.command == "bench":
+        handle_bench(args)
+
     elif args.command == "makemigrations":
+        import uuid
         cmd = ["alembic", "revision",
                "--autogenerate", "-m", str(uuid.uuid4())]
         console.print(
@@ -108,6 +316,9 @@ def main():
             f"[bold cyan]Applying migrations:[/bold cyan] {' '.join(cmd)}")
         subprocess.run(cmd, cwd=os.getcwd(), check=True)
 
+    elif args.command == "addmigration":
+        handle_addmigration(args.name)
+
     elif args.command == "dbup":
         console.print(
             "[bold cyan]Starting database with docker-compose up -d[/bold cyan]")
@@ -120,6 +331,7 @@ def main():
         subprocess.run(["docker-compose", "down"], cwd=os.getcwd(), check=True)
 
     elif args.command == "dbreset":
+        from rich.prompt import Confirm
         confirm = Confirm.ask(
             "[bold red]Are you sure you want to completely remove all database containers and volumes? This cannot be undone![/bold red]")
         if confirm:
@@ -130,84 +342,433 @@ def main():
         else:
             console.print("[bold yellow]Aborted dbreset.[/bold yellow]")
 
+    elif args.command == "dbpool":
+        handle_dbpool(args.host, args.port, args.interval, args.samples)
+
     elif args.command == "createsuperuser":
         console.print("[bold green]Creating superuser...[/bold green]")
         handle_createsuperuser()
 
+    elif args.command == "purgetokens":
+        handle_purgetokens(args.batch_size)
+
+
+def is_async_project(project_root="."):
+    """Return True if the project in project_root was generated with --async-db."""
+    session_file = Path(project_root) / "app/core/db/session.py"
+    try:
+        return "create_async_engine" in session_file.read_text(encoding="utf-8")
+    except OSError:
+        return False
+
+
+def register_app(name, project_root="."):
+    """Add an app to the project's app/apps.json.
+
+    Returns False if the project has no apps.json (generated by an older
+    faster-api release).
+    """
+    import json
+
+    apps_file = Path(project_root) / "app/apps.json"
+    try:
+        with open(apps_file, encoding="utf-8") as f:
+            registry = json.load(f)
+    except FileNotFoundError:
+        return False
+    if not any(entry["name"] == name for entry in registry["apps"]):
+        registry["apps"].append({"name": name, "prefix": f"/{name}", "tags": [name]})
+        # One line per app keeps diffs small in projects with many apps
+        entries = ",\n".join(f"        {json.dumps(entry)}" for entry in registry["apps"])
+        apps_file.write_text('{\n    "apps": [\n' + entries + "\n    ]\n}\n",
+                             encoding="utf-8")
+    return True
+
+
+def template_layers(template, bundled, overlay=None):
+    """Return the template directories to render, or None if --template is unknown.
+
+    A custom template is rendered as it is; the bundled async overlays only
+    apply to the bundled templates.
+    """
+    if template is None:
+        layers = [Path(__file__).parent / "templates" / bundled]
+        if overlay is not None:
+            # Overlay the async engine, CRUD layer and views on the sync one
+            layers.append(Path(__file__).parent / "templates" / overlay)
+        return layers
+
+    from faster_api.registry import TemplateNotFoundError, resolve_template
+
+    try:
+        path = resolve_template(template)
+    except TemplateNotFoundError as e:
+        console.print(f"[red]{e}[/red]")
+        return None
+    if overlay is not None:
+        console.print(
+            f"[yellow]Using template {path} as is; the bundled {overlay} overlay is not applied.[/yellow]")
+    return [path]
+
+
+def handle_template(args):
+    """Add, list or remove templates of the local registry."""
+    from faster_api import registry
+
+    if args.template_command == "add":
+        try:
+            manifest = registry.register_template(args.name, args.path)
+        except NotADirectoryError as e:
+            console.print(f"[red]{e}[/red]")
+            return
+        console.print(
+            f"[bold green]Registered template {args.name}:[/bold green] {manifest['template']} ({len(manifest['files'])} files)")
+
+    elif args.template_command == "list":
+        from rich.table import Table
+
+        templates = registry.load_registry()
+        if not templates:
+            console.print(
+                "[yellow]No templates registered. Add one with `fasterapi template add <name> <path>`.[/yellow]")
+            return
+        table = Table(title="Registered templates",
+                      caption=str(registry.registry_path()))
+        for column in ["name", "path"]:
+            table.add_column(column)
+        for name, path in sorted(templates.items()):
+            table.add_row(name, path)
+        console.print(table)
+
+    elif args.template_command == "remove":
+        if registry.unregister_template(args.name):
+            console.print(f"[bold green]Removed template {args.name}.[/bold green]")
+        else:
+            console.print(f"[yellow]Template {args.name} is not registered.[/yellow]")
+
+
+def copy_template(template_dirs, dest_root, name, text_replacements=None):
+    """Render template_dirs (later ones overlay earlier ones) into dest_root/name.
+
+    Re-running over an existing project only rewrites the files whose
+    rendered content changed.
+    """
+    from faster_api.render import render_tree
 
-def copy_template(template_dir, dest_root, name, text_replacements=None):
     if text_replacements is None:
         text_replacements = {"<<PROJECT_NAME>>": name}
+    counts = render_tree(template_dirs, Path(dest_root) / name, text_replacements)
+    if counts["unchanged"]:
+        console.print(
+            f"[yellow]{counts['unchanged']} files already up to date in {Path(dest_root) / name}[/yellow]")
+    return counts
+
 
-    root_target = Path(dest_root) / name
+def handle_serve(args):
+    """Run uvicorn with worker processes instead of the reloader.
+
+    The supervisor replaces any worker that exits, so --limit-max-requests
+    recycles workers one at a time while the others keep serving.
+    """
+    import importlib.util
+
+    for option, module in (("loop", "uvloop"), ("http", "httptools")):
+        if getattr(args, option) == module and importlib.util.find_spec(module) is None:
+            console.print(
+                f"[red]--{option} {module} requires {module}: pip install \"tle-faster-api\\[server]\"[/red]")
+            return
+
+    cmd = [
+        "uvicorn",
+        "app.main:app",
+        "--host", args.host,
+        "--port", str(args.port),
+        "--workers", str(args.workers),
+        "--loop", args.loop,
+        "--http", args.http,
+        "--backlog", str(args.backlog),
+        "--timeout-keep-alive", str(args.timeout_keep_alive),
+        "--timeout-graceful-shutdown", str(args.timeout_graceful_shutdown),
+    ]
+    if args.limit_concurrency:
+        cmd += ["--limit-concurrency", str(args.limit_concurrency)]
+    if args.limit_max_requests:
+        cmd += ["--limit-max-requests", str(args.limit_max_requests)]
+    console.print(
+        f"[bold cyan]Running server:[/bold cyan] {' '.join(cmd)}")
+    subprocess.run(cmd, cwd=os.getcwd(), check=True)
+
+
+def handle_bench(args):
+    """Run `fasterapi bench` and print a table per run (and per comparison)."""
+    import json
+
+    from rich.table import Table
+
+    try:
+        import faster_api.bench as bench
+    except ImportError:
+        console.print(
+            "[red]bench requires httpx: pip install \"tle-faster-api\\[bench]\"[/red]")
+        return
 
-    for root, dirs, files in os.walk(template_dir):
-        # Skip __pycache__ directories
-        dirs[:] = [d for d in dirs if d != "__pycache__"]
+    scenarios = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    unknown = set(scenarios) - set(bench.SCENARIOS)
+    if unknown:
+        console.print(
+            f"[red]Unknown scenarios: {', '.join(sorted(unknown))}[/red]")
+        return
 
-        rel_path = Path(root).relative_to(template_dir)
-        target_root = Path(dest_root) / name / rel_path
-        target_root.mkdir(parents=True, exist_ok=True)
+    table = Table(title="Benchmark results")
+    for column in ["scenario", "requests", "errors", "rps",
+                   "p50 ms", "p95 ms", "p99 ms"]:
+        table.add_column(column)
+
+    def on_scenario(name, result):
+        latency = result["latency_ms"]
+        console.print(f"[cyan]{name}:[/cyan] {result['rps']} req/s")
+        table.add_row(name, str(result["requests"]), str(result["errors"]),
+                      str(result["rps"]), str(latency["p50"]),
+                      str(latency["p95"]), str(latency["p99"]))
+
+    console.print(
+        f"[bold cyan]Benchmarking {', '.join(scenarios)} with {args.concurrency} clients for {args.duration}s each[/bold cyan]")
+    results = bench.run_bench(
+        url=args.url, database_url=args.database_url, workers=args.workers,
+        users=args.users, concurrency=args.concurrency,
+        duration=args.duration, scenarios=scenarios, on_scenario=on_scenario)
+    console.print(table)
+    bench.write_results(results, args.output)
+    console.print(f"[bold green]Results written to {args.output}[/bold green]")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        rows = bench.compare(results, baseline, args.threshold / 100)
+        comparison = Table(title=f"Compared with {args.compare}")
+        for column in ["scenario", "metric", "baseline", "current", "change"]:
+            comparison.add_column(column)
+        for scenario, metric, before, after, change, regressed in rows:
+            style = "red" if regressed else None
+            comparison.add_row(scenario, metric, str(before), str(after),
+                               f"{change:+.1%}", style=style)
+        console.print(comparison)
+        if any(row[-1] for row in rows):
+            console.print("[red]Performance regression detected.[/red]")
+            sys.exit(1)
+
+
+def handle_importtime(args):
+    """Print the slowest project modules and packages imported by the app."""
+    from rich.table import Table
+
+    import faster_api.importtime as importtime
+
+    env = dict(os.environ)
+    if args.apps is not None:
+        env["FASTERAPI_APPS"] = args.apps
+    console.print(
+        f"[bold cyan]Importing {args.module} {args.runs} times with -X importtime[/bold cyan]")
+    try:
+        records = importtime.measure(args.module, env=env, runs=args.runs)
+    except RuntimeError as e:
+        console.print(f"[red]{e}[/red]")
+        return
+    total = importtime.total_us(records, args.module) or 1
+
+    modules = Table(title="Project modules")
+    for column in ["module", "self ms", "cumulative ms", "share"]:
+        modules.add_column(column)
+    for record in importtime.project_modules(records)[:args.top]:
+        modules.add_row(record.name, f"{record.self_us / 1000:.1f}",
+                        f"{record.cumulative_us / 1000:.1f}",
+                        f"{record.cumulative_us / total:.0%}")
+    console.print(modules)
+
+    packages = Table(title="Packages (self time)")
+    for column in ["package", "ms", "share"]:
+        packages.add_column(column)
+    for package, self_us in importtime.other_packages(records)[:args.top]:
+        packages.add_row(package, f"{self_us / 1000:.1f}", f"{self_us / total:.0%}")
+    console.print(packages)
+    console.print(
+        f"[bold green]{args.module} imported in {total / 1000:.1f} ms[/bold green]")
+
+
+def handle_addmigration(name, project_root="."):
+    """Copy a shipped migration into alembic/versions, chained to the current head.
+
+    Shipped migrations upgrade projects generated by older faster-api releases;
+    new projects already get the current schema from their first makemigrations.
+    """
+    import uuid
+
+    from alembic.config import Config
+    from alembic.script import ScriptDirectory
+
+    from faster_api.render import render_text
+
+    versions_dir = Path(project_root) / "alembic/versions"
+    if any(versions_dir.glob(f"*_{name}.py")):
+        console.print(
+            f"[yellow]Migration {name} already exists in {versions_dir}.[/yellow]")
+        return
 
-        for file in files:
-            src_file = Path(root) / file
-            dst_file = target_root / file
+    config = Config(str(Path(project_root) / "alembic.ini"))
+    config.set_main_option("script_location",
+                           str(Path(project_root) / "alembic"))
+    head = ScriptDirectory.from_config(config).get_current_head()
+    if head is None:
+        console.print(
+            "[red]No existing migrations found. Run makemigrations and migrate first.[/red]")
+        return
 
+    revision = uuid.uuid4().hex[:12]
+    content = render_text((MIGRATIONS_DIR / f"{name}.py").read_text(encoding="utf-8"), {
+        "<<REVISION>>": revision,
+        "<<DOWN_REVISION>>": head,
+        "<<CREATE_DATE>>": time.strftime("%Y-%m-%d %H:%M:%S"),
+    })
+    target = versions_dir / f"{revision}_{name}.py"
+    target.write_text(content, encoding="utf-8")
+    console.print(
+        f"[bold green]Added migration:[/bold green] {target} (revises {head})")
+    console.print(
+        "[yellow bold]Reminder: run `fasterapi migrate` to apply it.[/yellow bold]")
+
+
+def handle_dbpool(host, port, interval=0, samples=0):
+    """Poll the /health/db-pool endpoint of a running app and print the counters.
+
+    Each worker process owns its own pool, so with several workers every
+    sample may come from a different pid.
+    """
+    import json
+    import urllib.error
+    import urllib.request
+
+    from rich.table import Table
+
+    url = f"http://{host}:{port}/health/db-pool"
+    columns = ["pid", "pool_class", "size", "checkedin",
+               "checkedout", "overflow", "timeout"]
+    table = Table(title=f"Connection pool stats ({url})")
+    for column in columns:
+        table.add_column(column)
+
+    taken = 0
+    try:
+        while True:
             try:
-                with open(src_file, "r", encoding="utf-8") as f:
-                    content = f.read()
-                for placeholder, replacement_text in text_replacements.items():
-                    content = content.replace(
-                        placeholder, str(replacement_text))
-                with open(dst_file, "w", encoding="utf-8") as f:
-                    f.write(content)
-            except UnicodeDecodeError:
+                with urllib.request.urlopen(url, timeout=5) as response:
+                    stats = json.load(response)
+            except (urllib.error.URLError, OSError) as e:
+                console.print(
+                    f"[red]Could not read pool stats from {url}: {e}[/red]")
                 console.print(
-                    f"[yellow]Skipping binary file:[/yellow] {src_file}")
+                    "[yellow bold]Reminder: start the app with DB_POOL_STATS_ENABLED=true.[/yellow bold]")
+                return
+            table.add_row(*(str(stats.get(column, "-")) for column in columns))
+            taken += 1
+            if interval <= 0 or (samples and taken >= samples):
+                break
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        pass
+    console.print(table)
 
 
-"""These functions only work after a project has been started in the current directory. """
-try:
-    from app.auth.crud import create_superuser
-    from app.core.db.session import SessionLocal
+def import_project(feature):
+    """Import the project-context helpers of the project in the current directory.
 
-    def handle_createsuperuser():
-        db = SessionLocal()
+    Returns a namespace with create_superuser and SessionLocal, or None (after
+    printing why) when there is no project or DATABASE_URL is missing.
+    """
+    from types import SimpleNamespace
 
-        try:
-            email = Prompt.ask("Email").strip()
-            name = Prompt.ask("Name").strip()
-            while True:
-                password = getpass.getpass("Password: ")
-                password_confirm = getpass.getpass("Confirm Password: ")
-                if password == password_confirm:
-                    break
-                console.print(
-                    "[red]Passwords do not match. Please try again.[/red]")
+    from pydantic import ValidationError as PydanticValidationError
+
+    try:
+        from app.auth.crud import create_superuser
+        from app.core.db.session import SessionLocal
+    except PydanticValidationError as e:
+        if (
+            len(e.errors()) == 1 and
+            e.errors()[0].get("loc") == ("database_url",)
+        ):
+            console.print(
+                "[red]Failed: DATABASE_URL is missing from FastAPI app.core.config.settings[/red]")
+            console.print(
+                "[yellow bold]Reminder: Configure your .env file or set the DATABASE_URL environment variable.[/yellow bold]")
+            return None
+        raise
+    except ModuleNotFoundError:
+        console.print(f"[red]{feature} requires a project context.[/red]")
+        return None
+    return SimpleNamespace(create_superuser=create_superuser,
+                           SessionLocal=SessionLocal)
 
+
+def handle_createsuperuser():
+    import asyncio
+    import getpass
+    import inspect
+
+    from rich.prompt import Prompt
+
+    project = import_project("Superuser creation")
+    if project is None:
+        return
+    create_superuser, SessionLocal = project.create_superuser, project.SessionLocal
+
+    email = Prompt.ask("Email").strip()
+    name = Prompt.ask("Name").strip()
+    while True:
+        password = getpass.getpass("Password: ")
+        password_confirm = getpass.getpass("Confirm Password: ")
+        if password == password_confirm:
+            break
+        console.print(
+            "[red]Passwords do not match. Please try again.[/red]")
+
+    if inspect.iscoroutinefunction(create_superuser):
+        # Projects generated with --async-db use an AsyncSession
+        async def _create():
+            async with SessionLocal() as db:
+                user = await create_superuser(
+                    db, name=name, email=email, password=password)
+                await db.commit()
+                return user
+        user = asyncio.run(_create())
+    else:
+        db = SessionLocal()
+        try:
             user = create_superuser(
                 db, name=name, email=email, password=password)
-            console.print(
-                f"[bold green]Superuser {user.email} created successfully.[/bold green]")
+            db.commit()
         finally:
             db.close()
+    console.print(
+        f"[bold green]Superuser {user.email} created successfully.[/bold green]")
 
-except PydanticValidationError as e:
-    if (
-        len(e.errors()) == 1 and
-        e.errors()[0].get("loc") == ("database_url",)
-    ):
-        console.print(
-            "[red]Failed: DATABASE_URL is missing from FastAPI app.core.config.settings[/red]")
-        console.print(
-            "[yellow bold]Reminder: Configure your .env file or set the DATABASE_URL environment variable.[/yellow bold]")
-        exit()
-    raise
-except ModuleNotFoundError:
-    def handle_createsuperuser():
+
+def handle_purgetokens(batch_size=None):
+    import asyncio
+
+    project = import_project("Purging refresh tokens")
+    if project is None:
+        return
+    try:
+        from app.auth.sweeper import run_sweep
+    except ModuleNotFoundError as e:
+        if e.name != "app.auth.sweeper":
+            raise
         console.print(
-            "[red]Superuser creation requires a project context.[/red]")
-        pass
+            "[red]This project has no app/auth/sweeper.py; it was generated before purgetokens existed.[/red]")
+        return
+    deleted = asyncio.run(run_sweep(batch_size))
+    console.print(
+        f"[bold green]Purged {deleted} expired or revoked refresh tokens.[/bold green]")
 
 
 if __name__ == "__main__":
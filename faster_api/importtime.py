@@ -0,0 +1,91 @@
+"""Import time report for generated projects (`fasterapi importtime`).
+
+Imports the app in a fresh interpreter with `python -X importtime` and ranks
+the project's own modules, and the packages they pull in, by the time they
+add to worker startup.
+"""
+import os
+import subprocess
+import sys
+from typing import Dict, List, Mapping, Optional, Tuple
+
+
+class ImportRecord:
+    """One line of -X importtime output; times are in microseconds."""
+
+    def __init__(self, name: str, self_us: int, cumulative_us: int) -> None:
+        self.name = name
+        self.self_us = self_us
+        self.cumulative_us = cumulative_us
+
+    @property
+    def package(self) -> str:
+        return self.name.split(".", 1)[0]
+
+
+def parse(output: str) -> List[ImportRecord]:
+    """Parse the stderr of `python -X importtime` into ImportRecords."""
+    records: List[ImportRecord] = []
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            # The "self [us] | cumulative | imported package" header
+            continue
+        records.append(ImportRecord(
+            fields[2].strip(), int(fields[0]), int(fields[1])))
+    return records
+
+
+def measure(module: str = "app.main", env: Optional[Mapping[str, str]] = None,
+            runs: int = 3) -> List[ImportRecord]:
+    """Import module `runs` times and return the records of the fastest run.
+
+    The first run also writes the bytecode cache, so more than one run gives
+    the startup time of a deployed worker.
+    """
+    if runs < 1:
+        raise ValueError(f"runs must be at least 1, got {runs}")
+    best: Optional[List[ImportRecord]] = None
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=os.getcwd(), env=env, capture_output=True, text=True)
+        if result.returncode != 0:
+            error = result.stderr.strip().splitlines()[-1:] or ["unknown error"]
+            raise RuntimeError(f"Importing {module} failed: {error[0]}")
+        records = parse(result.stderr)
+        if best is None or total_us(records, module) < total_us(best, module):
+            best = records
+    assert best is not None
+    return best
+
+
+def total_us(records: List[ImportRecord], module: str) -> int:
+    """Cumulative import time of module itself."""
+    return next((record.cumulative_us for record in records
+                 if record.name == module), 0)
+
+
+def project_modules(records: List[ImportRecord], package: str = "app") -> List[ImportRecord]:
+    """Records of the project's own modules, slowest (cumulative) first."""
+    own: Dict[str, ImportRecord] = {}
+    for record in records:
+        # A module can be listed twice when a package import triggers it
+        if record.package == package and record.cumulative_us > getattr(
+                own.get(record.name), "cumulative_us", -1):
+            own[record.name] = record
+    return sorted(own.values(), key=lambda record: record.cumulative_us, reverse=True)
+
+
+def other_packages(records: List[ImportRecord], package: str = "app") -> List[Tuple[str, int]]:
+    """(top-level package, self time of all its modules), slowest first.
+
+    Covers third-party packages and the standard library.
+    """
+    totals: Dict[str, int] = {}
+    for record in records:
+        if record.package != package:
+            totals[record.package] = totals.get(record.package, 0) + record.self_us
+    return sorted(totals.items(), key=lambda item: item[1], reverse=True)
@@ -1,5 +1,3 @@
-from rich.markdown import Markdown
-
 SUCCESSFUL_PROJECT_CREATION = """
 # Your project was [bold green]successfully created[/bold green]! 
 
@@ -41,3 +39,18 @@ SUCCESSFUL_APP_CREATION = """
    ...  
    [bold yellow]+ api_router.include_router({app_name}_views.router, prefix="/{app_name}", tags=["{app_name}"])[/bold yellow]
 """
+
+SUCCESSFUL_APP_REGISTRATION = """
+# Your app was [bold green]successfully created[/bold green]! 
+
+It is registered in `/app/apps.json`, so its router is mounted under
+[bold cyan]/api/v1/{app_name}[/bold cyan] and alembic picks up its models.
+
+Next steps:
+
+    1. Define your models, schemas and endpoints in app/{app_name}/
+
+    2. Create and apply the migration:
+
+        [bold cyan]> fasterapi makemigrations; fasterapi migrate[/bold cyan]
+"""
@@ -0,0 +1,194 @@
+"""Template registry and cached template manifests.
+
+`fasterapi template add <name> <path>` records a template directory in a
+JSON registry under the user config dir, so `--template <name>` can refer
+to it. Every template rendered by the CLI, bundled or not, is described by
+a manifest (files, content hashes, placeholder positions) cached under the
+user cache dir. A cached manifest is checked with stat() calls only; the
+template is walked again only when a directory changed, and only the
+modified files are parsed again.
+"""
+import hashlib
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Tuple, Union
+
+from faster_api.render import (SKIPPED_DIRS, FileEntry, content_hash, find_placeholders,
+                               is_binary)
+
+# Bump when the manifest layout changes so old caches are rebuilt
+MANIFEST_VERSION = 1
+
+# {"version", "template", "dirs": {path: mtime_ns}, "files": {path: FileEntry}}
+Manifest = Dict[str, Any]
+
+
+class TemplateNotFoundError(LookupError):
+    """--template names neither a directory nor a registered template."""
+
+
+def _user_dir(override: str, xdg_variable: str, windows_variable: str, fallback: str) -> Path:
+    if os.environ.get(override):
+        return Path(os.environ[override])
+    if sys.platform == "win32" and os.environ.get(windows_variable):
+        return Path(os.environ[windows_variable]) / "fasterapi"
+    if os.environ.get(xdg_variable):
+        return Path(os.environ[xdg_variable]) / "fasterapi"
+    return Path.home() / fallback / "fasterapi"
+
+
+def user_config_dir() -> Path:
+    """Where the registry lives (FASTERAPI_CONFIG_DIR overrides it)."""
+    return _user_dir("FASTERAPI_CONFIG_DIR", "XDG_CONFIG_HOME", "APPDATA", ".config")
+
+
+def user_cache_dir() -> Path:
+    """Where manifests are cached (FASTERAPI_CACHE_DIR overrides it)."""
+    return _user_dir("FASTERAPI_CACHE_DIR", "XDG_CACHE_HOME", "LOCALAPPDATA", ".cache")
+
+
+def _write_json(path: Path, data: Any) -> None:
+    # Written to a temporary file first so concurrent runs never read half a file
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=1)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def registry_path() -> Path:
+    return user_config_dir() / "templates.json"
+
+
+def load_registry() -> Dict[str, str]:
+    """Return the registered templates as {name: path}."""
+    try:
+        with open(registry_path(), encoding="utf-8") as f:
+            registry: Dict[str, str] = json.load(f)
+            return registry
+    except FileNotFoundError:
+        return {}
+
+
+def register_template(name: str, path: Union[str, Path]) -> Manifest:
+    """Add or replace a registered template and build its manifest."""
+    template_dir = Path(path).expanduser().resolve()
+    if not template_dir.is_dir():
+        raise NotADirectoryError(f"{template_dir} is not a directory")
+    registry = load_registry()
+    registry[name] = str(template_dir)
+    _write_json(registry_path(), registry)
+    return load_manifest(template_dir)
+
+
+def unregister_template(name: str) -> bool:
+    """Remove a registered template; return False if it was not registered."""
+    registry = load_registry()
+    if registry.pop(name, None) is None:
+        return False
+    _write_json(registry_path(), registry)
+    return True
+
+
+def resolve_template(value: str) -> Path:
+    """Return the directory of a --template value: a path or a registered name."""
+    path = Path(value).expanduser()
+    if path.is_dir():
+        return path.resolve()
+    registry = load_registry()
+    if value in registry:
+        path = Path(registry[value])
+        if not path.is_dir():
+            raise TemplateNotFoundError(
+                f"Template {value!r} is registered at {path}, which is not a directory "
+                f"anymore (re-add it with `fasterapi template add {value} <path>`)")
+        return path
+    names = ", ".join(sorted(registry)) or "none"
+    raise TemplateNotFoundError(
+        f"Template {value!r} is neither a directory nor a registered template "
+        f"(registered: {names})")
+
+
+def _manifest_path(template_dir: Path) -> Path:
+    key = hashlib.sha256(str(template_dir).encode("utf-8")).hexdigest()[:32]
+    return user_cache_dir() / "manifests" / f"{key}.json"
+
+
+def _file_entry(path: Path, stat: os.stat_result) -> FileEntry:
+    content = path.read_bytes()
+    binary = is_binary(content)
+    return {
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "mode": stat.st_mode,
+        "hash": content_hash(content),
+        "binary": binary,
+        "placeholders": [] if binary else find_placeholders(content),
+    }
+
+
+def build_manifest(template_dir: Path) -> Manifest:
+    """Walk and parse template_dir."""
+    if not Path(template_dir).is_dir():
+        # os.walk() would silently yield nothing
+        raise FileNotFoundError(f"Template directory {template_dir} does not exist")
+    dirs: Dict[str, int] = {}
+    files: Dict[str, FileEntry] = {}
+    for dirpath, subdirs, names in os.walk(template_dir):
+        subdirs[:] = [d for d in subdirs if d not in SKIPPED_DIRS]
+        root = Path(dirpath)
+        rel_root = root.relative_to(template_dir).as_posix()
+        dirs[rel_root] = root.stat().st_mtime_ns
+        for name in names:
+            path = root / name
+            files[path.relative_to(template_dir).as_posix()] = _file_entry(path, path.stat())
+    return {"version": MANIFEST_VERSION, "template": str(template_dir),
+            "dirs": dirs, "files": files}
+
+
+def _refresh(manifest: Manifest, template_dir: Path) -> Tuple[Manifest, bool]:
+    """Bring a cached manifest up to date; return (manifest, changed)."""
+    for rel_dir, mtime_ns in manifest["dirs"].items():
+        try:
+            if (template_dir / rel_dir).stat().st_mtime_ns != mtime_ns:
+                return build_manifest(template_dir), True
+        except FileNotFoundError:
+            return build_manifest(template_dir), True
+
+    changed = False
+    for rel_path, entry in manifest["files"].items():
+        path = template_dir / rel_path
+        stat = path.stat()
+        if stat.st_size != entry["size"] or stat.st_mtime_ns != entry["mtime_ns"]:
+            manifest["files"][rel_path] = _file_entry(path, stat)
+            changed = True
+    return manifest, changed
+
+
+def load_manifest(template_dir: Union[str, Path]) -> Manifest:
+    """Return the manifest of template_dir, from the cache when it is current."""
+    root = Path(template_dir).resolve()
+    cache_file = _manifest_path(root)
+    try:
+        with open(cache_file, encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest.get("version") != MANIFEST_VERSION or manifest.get("template") != str(root):
+            raise ValueError("stale manifest")
+        manifest, changed = _refresh(manifest, root)
+    except (OSError, ValueError, KeyError):
+        manifest, changed = build_manifest(root), True
+
+    if changed:
+        try:
+            _write_json(cache_file, manifest)
+        except OSError:
+            # A read-only cache only costs the next run a re-parse
+            pass
+    return manifest
@@ -0,0 +1,142 @@
+"""Template rendering for `startproject` and `startapp`.
+
+Files are handled as bytes. Placeholders look like <<NAME>>; their
+positions come from the template's cached manifest (see
+faster_api.registry), so rendering a file is a single splice. Binary files
+(anything with a NUL byte) are copied as they are, destination files whose
+content would not change are left untouched, and files are rendered
+concurrently on a thread pool.
+"""
+import hashlib
+import os
+import re
+import shutil
+import stat
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, Union
+
+PLACEHOLDER = re.compile(rb"<<[A-Z][A-Z0-9_]*>>")
+
+# Bytes inspected to tell binary files from text
+BINARY_SNIFF_SIZE = 8192
+
+SKIPPED_DIRS = {"__pycache__"}
+
+CREATED = "created"
+UPDATED = "updated"
+UNCHANGED = "unchanged"
+
+# A file of a template manifest, see faster_api.registry
+FileEntry = Dict[str, Any]
+
+
+def is_binary(content: bytes) -> bool:
+    return b"\0" in content[:BINARY_SNIFF_SIZE]
+
+
+def content_hash(content: bytes) -> str:
+    return hashlib.blake2b(content, digest_size=16).hexdigest()
+
+
+def find_placeholders(content: bytes) -> List[List[int]]:
+    """Return the [start, end] offsets of every <<NAME>> in content."""
+    return [list(match.span()) for match in PLACEHOLDER.finditer(content)]
+
+
+def encode_replacements(replacements: Mapping[str, object]) -> Dict[bytes, bytes]:
+    return {placeholder.encode("utf-8"): str(value).encode("utf-8")
+            for placeholder, value in replacements.items()}
+
+
+def substitute(content: bytes, positions: Iterable[Sequence[int]],
+               replacements: Mapping[bytes, bytes]) -> bytes:
+    """Replace the placeholders at positions; unknown placeholders are kept."""
+    parts: List[bytes] = []
+    last = 0
+    for start, end in positions:
+        placeholder = content[start:end]
+        parts.append(content[last:start])
+        parts.append(replacements.get(placeholder, placeholder))
+        last = end
+    parts.append(content[last:])
+    return b"".join(parts)
+
+
+def render_text(text: str, replacements: Mapping[str, object]) -> str:
+    """Render a template string without a manifest."""
+    content = text.encode("utf-8")
+    return substitute(content, find_placeholders(content),
+                      encode_replacements(replacements)).decode("utf-8")
+
+
+def _unchanged(dst_file: Path, size: int, digest: str) -> bool:
+    try:
+        if dst_file.stat().st_size != size:
+            return False
+        return content_hash(dst_file.read_bytes()) == digest
+    except FileNotFoundError:
+        return False
+
+
+def render_file(src_file: Path, dst_file: Path, entry: FileEntry,
+                replacements: Mapping[bytes, bytes]) -> str:
+    """Render one manifest entry and return CREATED, UPDATED or UNCHANGED."""
+    status = UPDATED if dst_file.exists() else CREATED
+    if entry["binary"]:
+        if _unchanged(dst_file, entry["size"], entry["hash"]):
+            return UNCHANGED
+        shutil.copyfile(src_file, dst_file)
+    else:
+        content = src_file.read_bytes()
+        positions = entry["placeholders"]
+        if len(content) != entry["size"]:
+            # Edited since the manifest was loaded
+            positions = find_placeholders(content)
+        content = substitute(content, positions, replacements)
+        if _unchanged(dst_file, len(content), content_hash(content)):
+            return UNCHANGED
+        dst_file.write_bytes(content)
+    if entry["mode"] & stat.S_IXUSR:
+        _make_executable(dst_file)
+    return status
+
+
+def _make_executable(path: Path) -> None:
+    # Only the executable bit is carried over from the template, like git
+    # does; the rest of the mode comes from the umask
+    mode = path.stat().st_mode
+    os.chmod(path, mode | (mode & 0o444) >> 2)
+
+
+def render_tree(template_dirs: Iterable[Union[str, Path]], target_dir: Union[str, Path],
+                replacements: Mapping[str, object], max_workers: Optional[int] = None) -> Dict[str, int]:
+    """Render the template layers in template_dirs into target_dir.
+
+    A file in a later layer replaces the file at the same path in an earlier
+    one, so overlays are resolved before anything is written. Returns a dict
+    counting the files per status.
+    """
+    from faster_api.registry import load_manifest
+
+    target = Path(target_dir)
+    encoded = encode_replacements(replacements)
+
+    sources: Dict[Path, Tuple[Path, FileEntry]] = {}
+    for template_dir in template_dirs:
+        manifest = load_manifest(template_dir)
+        root = Path(manifest["template"])
+        for rel_dir in manifest["dirs"]:
+            (target / rel_dir).mkdir(parents=True, exist_ok=True)
+        for rel_path, entry in manifest["files"].items():
+            sources[target / rel_path] = (root / rel_path, entry)
+
+    def render(dst_file: Path) -> str:
+        src_file, entry = sources[dst_file]
+        return render_file(src_file, dst_file, entry, encoded)
+
+    counts = {CREATED: 0, UPDATED: 0, UNCHANGED: 0}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for status in executor.map(render, sources):
+            counts[status] += 1
+    return counts
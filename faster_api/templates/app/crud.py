@@ -4,13 +4,22 @@ from sqlalchemy.orm import Session
 
 # TODO: Implement CRUD functions for <<APP_NAME>>.
 # Example:
+# from app.core.pagination import Keyset, PageParams
+# from sqlalchemy import select
 # from .models import MyModel
-# def get_items(db: Session):
-#     return db.query(MyModel).all()
+#
+# # Sort key of list pages; end it with the primary key so the order is stable
+# item_keyset = Keyset(MyModel.created_at, MyModel.id)
+#
+# def list_items(db: Session, params: PageParams):
+#     """Return one keyset page (never the whole table)."""
+#     rows = db.scalars(item_keyset.apply(select(MyModel), params)).all()
+#     return item_keyset.page(rows, params)
 #
 # def create_item(db: Session, item_data):
 #     db_item = MyModel(**item_data)
 #     db.add(db_item)
-#     db.commit()
-#     db.refresh(db_item)
-#     return db_item
\ No newline at end of file
+#     # Only flush: deps.get_db commits once the request succeeds, and
+#     # server defaults are loaded during the flush (eager_defaults)
+#     db.flush()
+#     return db_item
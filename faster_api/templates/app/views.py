@@ -2,7 +2,12 @@
 from fastapi import APIRouter, Depends
 from app.core import deps
 # TODO: import your user model and schemas
-# from app.auth.models import User
+# from app.auth.schemas import Principal, User
+# from app.core.pagination import Page, PageParams, stream_ndjson
+# from app.core.responses import SchemaResponse, schema_response
+# from sqlalchemy import select
+# from .crud import list_items
+# from .models import MyModel
 # from .schemas import YourSchema
 
 # Initialize API router
@@ -13,4 +18,27 @@ router = APIRouter()
 # @router.get("/", response_model=YourSchema)
 # def example_endpoint(current_user: User = Depends(deps.get_current_user)) -> YourSchema:
 #     """Example endpoint for <<APP_NAME>>."""
-#     return {"key": "value"}
\ No newline at end of file
+#     return {"key": "value"}
+#
+# Endpoints that only need the caller's id, email or admin flag can depend on
+# deps.get_current_principal instead, which reads signed token claims and
+# never opens a database session:
+# def whoami(principal: Principal = Depends(deps.get_current_principal)) -> dict:
+#     return {"id": principal.id}
+#
+# Hot endpoints that return ORM rows can validate and serialize them in one
+# pass with app.core.responses.schema_response (keep response_model for docs):
+# @router.get("/{item_id}", response_model=YourSchema)
+# def read_item(item_id: str, db=Depends(deps.get_db)) -> SchemaResponse:
+#     return schema_response(YourSchema, get_item(db, item_id))
+#
+# List endpoints return keyset pages; clients pass next_cursor back as ?cursor=
+# until it is null. limit is capped by PAGE_SIZE_MAX:
+# @router.get("/", response_model=Page[YourSchema])
+# def list_items_endpoint(params: PageParams = Depends(), db=Depends(deps.get_db)) -> SchemaResponse:
+#     return schema_response(Page[YourSchema], list_items(db, params))
+#
+# Optional NDJSON export that streams the whole table in constant memory:
+# @router.get("/export")
+# def export_items():
+#     return stream_ndjson(select(MyModel).order_by(MyModel.id), YourSchema)
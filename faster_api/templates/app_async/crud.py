@@ -0,0 +1,25 @@
+"""CRUD functions for <<APP_NAME>>."""
+# Import SQLAlchemy async session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# TODO: Implement CRUD functions for <<APP_NAME>>.
+# Example:
+# from app.core.pagination import Keyset, PageParams
+# from .models import MyModel
+#
+# # Sort key of list pages; end it with the primary key so the order is stable
+# item_keyset = Keyset(MyModel.created_at, MyModel.id)
+#
+# async def list_items(db: AsyncSession, params: PageParams):
+#     """Return one keyset page (never the whole table)."""
+#     rows = (await db.scalars(item_keyset.apply(select(MyModel), params))).all()
+#     return item_keyset.page(rows, params)
+#
+# async def create_item(db: AsyncSession, item_data):
+#     db_item = MyModel(**item_data)
+#     db.add(db_item)
+#     # Only flush: deps.get_db commits once the request succeeds, and
+#     # server defaults are loaded during the flush (eager_defaults)
+#     await db.flush()
+#     return db_item
@@ -0,0 +1,44 @@
+"""Endpoints for <<APP_NAME>>"""
+from fastapi import APIRouter, Depends
+from app.core import deps
+# TODO: import your user model and schemas
+# from app.auth.schemas import Principal, User
+# from app.core.pagination import Page, PageParams, stream_ndjson
+# from app.core.responses import SchemaResponse, schema_response
+# from sqlalchemy import select
+# from .crud import list_items
+# from .models import MyModel
+# from .schemas import YourSchema
+
+# Initialize API router
+router = APIRouter()
+
+# TODO: Define your API endpoints here.
+# Example:
+# @router.get("/", response_model=YourSchema)
+# async def example_endpoint(current_user: User = Depends(deps.get_current_user)) -> YourSchema:
+#     """Example endpoint for <<APP_NAME>>."""
+#     return {"key": "value"}
+#
+# Endpoints that only need the caller's id, email or admin flag can depend on
+# deps.get_current_principal instead, which reads signed token claims and
+# never opens a database session:
+# async def whoami(principal: Principal = Depends(deps.get_current_principal)) -> dict:
+#     return {"id": principal.id}
+#
+# Hot endpoints that return ORM rows can validate and serialize them in one
+# pass with app.core.responses.schema_response (keep response_model for docs):
+# @router.get("/{item_id}", response_model=YourSchema)
+# async def read_item(item_id: str, db=Depends(deps.get_db)) -> SchemaResponse:
+#     return schema_response(YourSchema, await get_item(db, item_id))
+#
+# List endpoints return keyset pages; clients pass next_cursor back as ?cursor=
+# until it is null. limit is capped by PAGE_SIZE_MAX:
+# @router.get("/", response_model=Page[YourSchema])
+# async def list_items_endpoint(params: PageParams = Depends(), db=Depends(deps.get_db)) -> SchemaResponse:
+#     return schema_response(Page[YourSchema], await list_items(db, params))
+#
+# Optional NDJSON export that streams the whole table in constant memory:
+# @router.get("/export")
+# def export_items():
+#     return stream_ndjson(select(MyModel).order_by(MyModel.id), YourSchema)
@@ -0,0 +1,78 @@
+"""Store refresh tokens as SHA-256 digests
+
+Revision ID: <<REVISION>>
+Revises: <<DOWN_REVISION>>
+Create Date: <<CREATE_DATE>>
+"""
+import hashlib
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "<<REVISION>>"
+down_revision = "<<DOWN_REVISION>>"
+branch_labels = None
+depends_on = None
+
+# Rows hashed per round trip while backfilling token_hash
+BATCH_SIZE = 1000
+
+refresh_tokens = sa.table(
+    "refresh_tokens",
+    sa.column("id", sa.String),
+    sa.column("token", sa.String),
+    sa.column("token_hash", sa.LargeBinary),
+)
+
+
+def upgrade():
+    """Replace refresh_tokens.token with a unique 32-byte token_hash."""
+    op.add_column("refresh_tokens", sa.Column(
+        "token_hash", sa.LargeBinary(32), nullable=True))
+
+    # Hash the existing tokens in keyset-ordered batches
+    conn = op.get_bind()
+    last_id = ""
+    while True:
+        rows = conn.execute(
+            sa.select(refresh_tokens.c.id, refresh_tokens.c.token)
+            .where(refresh_tokens.c.id > last_id)
+            .order_by(refresh_tokens.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        conn.execute(
+            refresh_tokens.update()
+            .where(refresh_tokens.c.id == sa.bindparam("row_id"))
+            .values(token_hash=sa.bindparam("digest")),
+            [{"row_id": row.id,
+              "digest": hashlib.sha256(row.token.encode("utf-8")).digest()}
+             for row in rows],
+        )
+        last_id = rows[-1].id
+
+    op.drop_index("ix_refresh_tokens_token", table_name="refresh_tokens")
+    with op.batch_alter_table("refresh_tokens") as batch_op:
+        batch_op.alter_column("token_hash", existing_type=sa.LargeBinary(32),
+                              nullable=False)
+        batch_op.create_unique_constraint(
+            "uq_refresh_tokens_token_hash", ["token_hash"])
+        batch_op.drop_column("token")
+
+
+def downgrade():
+    """Restore the plain token column.
+
+    Digests cannot be turned back into tokens, so every stored refresh token
+    is deleted and users have to log in again.
+    """
+    op.execute(refresh_tokens.delete())
+    with op.batch_alter_table("refresh_tokens") as batch_op:
+        batch_op.add_column(sa.Column("token", sa.String(), nullable=False))
+        batch_op.drop_constraint(
+            "uq_refresh_tokens_token_hash", type_="unique")
+        batch_op.drop_column("token_hash")
+    op.create_index("ix_refresh_tokens_token", "refresh_tokens", ["token"],
+                    unique=True)
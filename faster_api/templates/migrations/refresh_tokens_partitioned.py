@@ -0,0 +1,91 @@
+"""Partition refresh_tokens by month of expires_at (PostgreSQL)
+
+Revision ID: <<REVISION>>
+Revises: <<DOWN_REVISION>>
+Create Date: <<CREATE_DATE>>
+
+Set REFRESH_TOKEN_PARTITIONED=true after applying this migration: the sweeper
+then creates upcoming partitions and drops the ones whose tokens have all
+expired. The primary key and the token_hash unique constraint include
+expires_at, as PostgreSQL requires for partitioned tables.
+"""
+from datetime import datetime, timedelta, timezone
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "<<REVISION>>"
+down_revision = "<<DOWN_REVISION>>"
+branch_labels = None
+depends_on = None
+
+# Partitions are created at least this far ahead; the sweeper extends them
+PARTITION_HORIZON = timedelta(days=62)
+
+COLUMNS = """
+    id VARCHAR NOT NULL,
+    user_id VARCHAR NOT NULL,
+    token_hash BYTEA NOT NULL,
+    expires_at TIMESTAMP WITH TIME ZONE NOT NULL,
+    revoked BOOLEAN NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT now() NOT NULL,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT now() NOT NULL
+"""
+
+
+def _add_months(month, months):
+    years, index = divmod(month.month - 1 + months, 12)
+    return month.replace(year=month.year + years, month=index + 1)
+
+
+def _add_constraints(primary_key, unique):
+    op.execute(f"ALTER TABLE refresh_tokens ADD CONSTRAINT refresh_tokens_pkey "
+               f"PRIMARY KEY ({primary_key})")
+    op.execute(f"ALTER TABLE refresh_tokens ADD CONSTRAINT uq_refresh_tokens_token_hash "
+               f"UNIQUE ({unique})")
+    op.execute("ALTER TABLE refresh_tokens ADD CONSTRAINT refresh_tokens_user_id_fkey "
+               "FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE")
+    op.create_index("ix_refresh_tokens_id", "refresh_tokens", ["id"])
+    op.create_index("ix_refresh_tokens_user_id", "refresh_tokens", ["user_id"])
+
+
+def upgrade():
+    """Copy live tokens into a table range-partitioned by expires_at."""
+    conn = op.get_bind()
+    if conn.dialect.name != "postgresql":
+        raise RuntimeError("refresh_tokens_partitioned requires PostgreSQL")
+
+    op.execute(f"CREATE TABLE refresh_tokens_partitioned ({COLUMNS}) "
+               f"PARTITION BY RANGE (expires_at)")
+
+    now = datetime.now(timezone.utc)
+    latest = conn.scalar(sa.text("SELECT max(expires_at) FROM refresh_tokens"))
+    horizon = max(filter(None, [latest, now + PARTITION_HORIZON]))
+    month = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    while month <= horizon:
+        upper = _add_months(month, 1)
+        op.execute(f"CREATE TABLE refresh_tokens_p{month:%Y%m} "
+                   f"PARTITION OF refresh_tokens_partitioned "
+                   f"FOR VALUES FROM ('{month.isoformat()}') TO ('{upper.isoformat()}')")
+        month = upper
+
+    # Expired and revoked tokens are not worth copying
+    op.execute("INSERT INTO refresh_tokens_partitioned "
+               "SELECT id, user_id, token_hash, expires_at, revoked, created_at, updated_at "
+               "FROM refresh_tokens WHERE expires_at > now() AND NOT revoked")
+    op.drop_table("refresh_tokens")
+    op.rename_table("refresh_tokens_partitioned", "refresh_tokens")
+    _add_constraints("id, expires_at", "token_hash, expires_at")
+
+
+def downgrade():
+    """Copy live tokens back into a plain table."""
+    op.execute(f"CREATE TABLE refresh_tokens_plain ({COLUMNS})")
+    op.execute("INSERT INTO refresh_tokens_plain "
+               "SELECT id, user_id, token_hash, expires_at, revoked, created_at, updated_at "
+               "FROM refresh_tokens WHERE expires_at > now() AND NOT revoked")
+    # Dropping the parent drops every partition with it
+    op.drop_table("refresh_tokens")
+    op.rename_table("refresh_tokens_plain", "refresh_tokens")
+    _add_constraints("id", "token_hash")
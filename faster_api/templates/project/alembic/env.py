@@ -6,6 +6,7 @@ from alembic import context
 import os
 import sys
 from logging.config import fileConfig
+from typing import Any, Optional
 
 # Insert the parent directory of env.py to sys.path
 sys.path.insert(0, os.path.abspath(
@@ -14,23 +15,38 @@ sys.path.insert(0, os.path.abspath(
 try:
     from app.core.db.base import Base
     from app.core.config import settings
-    from app.core.db.session import SessionLocal
-    from app.auth.crud import create_superuser
+    from app.core.apps import import_models
+    from app.auth.models import PARTITION_PREFIX
 except:
     raise
 
+# Register the models of every app listed in app/apps.json
+import_models()
+
 config = context.config
 fileConfig(config.config_file_name or "")
 config.set_main_option('sqlalchemy.url', settings.database_url)
 target_metadata = Base.metadata
 
 
+def include_object(object: Any, name: Optional[str], type_: str, reflected: bool,
+                   compare_to: Any) -> bool:
+    """Leave refresh_tokens partitions and their constraints to the sweeper."""
+    if type_ == "table" and name and name.startswith(PARTITION_PREFIX):
+        return not name[len(PARTITION_PREFIX):].isdigit()
+    if (type_ == "unique_constraint" and settings.refresh_token_partitioned
+            and object.table.name == "refresh_tokens"):
+        return False
+    return True
+
+
 def run_migrations_offline() -> None:
     """Run migrations in 'offline' mode."""
     url = config.get_main_option('sqlalchemy.url')
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_object=include_object,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -49,6 +65,7 @@ def run_migrations_online() -> None:
         context.configure(
             connection=connection,
             target_metadata=target_metadata,
+            include_object=include_object,
         )
         with context.begin_transaction():
             context.run_migrations()
@@ -0,0 +1,83 @@
+"""Principal cache: authenticated users keyed by id.
+
+get_current_user_schema checks this cache before querying the users table.
+It holds the public columns of the user as app.auth.schemas.User, which is
+also what get_current_user_schema returns, so a cached caller is never
+mistaken for a row of the session. Entries are evicted whenever a session commits a write to a
+user, so readers never see data that is older than the last commit made
+through this app.
+"""
+from itertools import chain
+from typing import Any, Optional, Set
+
+from app.auth.models import User
+from app.auth.schemas import User as UserSchema
+from app.core.cache import CacheBackend, create_cache_backend
+from app.core.config import settings
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+user_cache: Optional[CacheBackend] = create_cache_backend(
+    settings.user_cache_backend,
+    maxsize=settings.user_cache_size,
+    ttl=settings.user_cache_ttl_seconds,
+    redis_url=settings.redis_url,
+    prefix=f"{settings.app_name}:",
+)
+
+_EVICT_KEY = "evict_user_ids"
+
+
+def _cache_key(user_id: str) -> str:
+    return f"user:{user_id}"
+
+
+def get_cached_user(user_id: str) -> Optional[UserSchema]:
+    """Return the cached user, or None on a miss."""
+    if user_cache is None:
+        return None
+    raw = user_cache.get(_cache_key(user_id))
+    if raw is None:
+        return None
+    return UserSchema.model_validate_json(raw)
+
+
+def cache_user(user: UserSchema) -> None:
+    """Store the public fields of a user (the schema has no password hash)."""
+    if user_cache is None:
+        return
+    user_cache.set(_cache_key(user.id), user.model_dump_json(),
+                   ttl=settings.user_cache_ttl_seconds)
+
+
+def evict_user(user_id: str) -> None:
+    """Drop a user from the cache."""
+    if user_cache is not None:
+        user_cache.delete(_cache_key(user_id))
+
+
+def mark_user_changed(session: Session, user_id: str) -> None:
+    """Evict user_id once session commits, for writes the ORM can't see.
+
+    Call it after a Core UPDATE or DELETE of the users table.
+    """
+    pending: Set[str] = session.info.setdefault(_EVICT_KEY, set())
+    pending.add(user_id)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changed_users(session: Session, flush_context: Any) -> None:
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if isinstance(obj, User):
+            mark_user_changed(session, obj.id)
+
+
+@event.listens_for(Session, "after_commit")
+def _evict_changed_users(session: Session) -> None:
+    for user_id in session.info.pop(_EVICT_KEY, ()):
+        evict_user(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_changed_users(session: Session) -> None:
+    session.info.pop(_EVICT_KEY, None)
@@ -2,9 +2,12 @@
 import datetime
 from typing import Optional
 
+import app.auth.cache  # noqa: F401  (evicts cached users on commit)
 from app.auth.models import RefreshToken
 from app.auth.models import User as UserModel
 from app.auth.schemas import UserCreate
+from app.core.security import token_digest
+from sqlalchemy import insert, update
 from sqlalchemy.orm import Session
 
 
@@ -20,15 +23,14 @@ def get_user_by_email(db: Session, email: str) -> Optional[UserModel]:
 
 def create_user(db: Session, user: UserCreate) -> UserModel:
     """Create a new user with hashed password."""
-    from app.core.security import get_password_hash
+    from app.core.security import get_password_hash, hashing_pool
     db_user = UserModel(
         email=user.email,
-        hashed_password=get_password_hash(user.password),
+        hashed_password=hashing_pool.run(get_password_hash, user.password),
         name=user.name
     )
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    db.flush()
     return db_user
 
 
@@ -42,8 +44,7 @@ def create_superuser(db: Session, name: str, email: str, password: str) -> UserM
         is_admin=True
     )
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    db.flush()
     return db_user
 
 
@@ -51,23 +52,55 @@ def create_refresh_token(db: Session, user_id: str, token: str, expires_at: date
     """Create and persist a new refresh token."""
     db_token = RefreshToken(
         user_id=user_id,
-        token=token,
+        token_hash=token_digest(token),
         expires_at=expires_at,
     )
     db.add(db_token)
-    db.commit()
-    db.refresh(db_token)
+    db.flush()
     return db_token
 
 
 def get_refresh_token(db: Session, token: str) -> Optional[RefreshToken]:
-    """Retrieve a refresh token by its token string."""
-    return db.query(RefreshToken).filter(RefreshToken.token == token).first()
+    """Retrieve a refresh token by the digest of its token string."""
+    return db.query(RefreshToken).filter(RefreshToken.token_hash == token_digest(token)).first()
 
 
 def revoke_refresh_token(db: Session, db_token: RefreshToken) -> None:
-    """Revoke a refresh token by marking it revoked."""
     """Mark a refresh token as revoked."""
     db_token.revoked = True
     db.add(db_token)
-    db.commit()
+    db.flush()
+
+
+def rotate_refresh_token(
+    db: Session,
+    token: str,
+    new_token: str,
+    expires_at: datetime.datetime,
+    now: datetime.datetime,
+) -> Optional[str]:
+    """Revoke a live refresh token and store its replacement.
+
+    The conditional UPDATE ... RETURNING only matches a token that is neither
+    revoked nor expired, so concurrent rotations of the same token cannot
+    both succeed. Returns the owning user id, or None if nothing matched.
+    """
+    user_id = db.scalars(
+        update(RefreshToken)
+        .where(
+            RefreshToken.token_hash == token_digest(token),
+            RefreshToken.revoked.is_(False),
+            RefreshToken.expires_at > now,
+        )
+        .values(revoked=True)
+        .returning(RefreshToken.user_id),
+        execution_options={"synchronize_session": False},
+    ).first()
+    if user_id is None:
+        return None
+    db.execute(insert(RefreshToken), [{
+        "user_id": user_id,
+        "token_hash": token_digest(new_token),
+        "expires_at": expires_at,
+    }])
+    return user_id
@@ -5,3 +5,9 @@ from fastapi import HTTPException, status
 class InvalidTokenPayloadException(HTTPException):
     def __init__(self, detail: str, status_code: int = status.HTTP_401_UNAUTHORIZED):
         super().__init__(status_code=status_code, detail=detail)
+
+
+class PasswordHashingBusyException(HTTPException):
+    def __init__(self, detail: str = "Server is busy, please retry shortly", retry_after: int = 1):
+        super().__init__(status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                         detail=detail, headers={"Retry-After": str(retry_after)})
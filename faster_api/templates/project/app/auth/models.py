@@ -3,7 +3,8 @@ import uuid
 from datetime import datetime
 
 from app.core.db.base import Base
-from sqlalchemy import Boolean, DateTime, ForeignKey, String
+from sqlalchemy import (Boolean, DateTime, ForeignKey, LargeBinary, String,
+                        UniqueConstraint)
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.sql import func
 
@@ -25,16 +26,27 @@ class User(Base):
         DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
 
+# Monthly partitions of refresh_tokens (REFRESH_TOKEN_PARTITIONED) are named
+# refresh_tokens_pYYYYMM; the sweeper manages them, not alembic
+PARTITION_PREFIX = "refresh_tokens_p"
+
+
 class RefreshToken(Base):
-    """Database model for refresh tokens."""
+    """Database model for refresh tokens.
+
+    Only the SHA-256 digest of the token is stored, so the table never holds
+    a usable bearer secret and the unique index stays fixed-width.
+    """
     __tablename__ = "refresh_tokens"
+    __table_args__ = (
+        UniqueConstraint("token_hash", name="uq_refresh_tokens_token_hash"),
+    )
 
     id: Mapped[str] = mapped_column(
         String, primary_key=True, index=True, default=lambda: str(uuid.uuid4()))
     user_id: Mapped[str] = mapped_column(String, ForeignKey(
         "users.id", ondelete="CASCADE"), nullable=False, index=True)
-    token: Mapped[str] = mapped_column(
-        String, unique=True, nullable=False, index=True)
+    token_hash: Mapped[bytes] = mapped_column(LargeBinary(32), nullable=False)
     expires_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), nullable=False)
     revoked: Mapped[bool] = mapped_column(Boolean, default=False)
@@ -27,6 +27,13 @@ class User(UserBase):
         from_attributes = True
 
 
+class Principal(BaseModel):
+    """Authenticated caller, built from signed access token claims."""
+    id: str
+    email: str
+    is_admin: bool
+
+
 class Token(BaseModel):
     """Schema for JWT access token response."""
     access_token: str
@@ -0,0 +1,144 @@
+"""Background removal of expired and revoked refresh tokens.
+
+Rotation only flips `revoked`, so without a sweep refresh_tokens grows with
+every login and refresh. The sweep deletes dead rows in bounded batches, one
+short transaction each, so it never holds long locks on the table.
+
+The sweep is written against a sync Session; async projects run the same
+code through AsyncSession.run_sync. It runs as a lifespan task in every
+worker and as `fasterapi purgetokens`.
+"""
+import asyncio
+import logging
+import random
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+
+from app.auth.models import PARTITION_PREFIX, RefreshToken
+from app.core.config import settings
+from app.core.db import session as db_session
+from sqlalchemy import delete, or_, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+
+def purge_refresh_tokens(db: Session, now: datetime, batch_size: int) -> int:
+    """Delete up to batch_size expired or revoked refresh tokens."""
+    batch = (
+        select(RefreshToken.id)
+        .where(or_(RefreshToken.expires_at <= now,
+                   RefreshToken.revoked.is_(True)))
+        .limit(batch_size)
+        .scalar_subquery()
+    )
+    result = db.execute(
+        delete(RefreshToken).where(RefreshToken.id.in_(batch)),
+        execution_options={"synchronize_session": False},
+    )
+    return result.rowcount
+
+
+def _add_months(month: datetime, months: int) -> datetime:
+    years, index = divmod(month.month - 1 + months, 12)
+    return month.replace(year=month.year + years, month=index + 1)
+
+
+def maintain_partitions(db: Session, now: datetime) -> List[str]:
+    """Create the monthly partitions new tokens need and drop expired ones.
+
+    Only used with the partitioned layout (PostgreSQL). Partitions are created
+    far enough ahead to hold a token issued now; a partition is dropped once
+    every token it can hold has expired. Returns the dropped partition names.
+    """
+    month = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    horizon = now + timedelta(days=settings.refresh_token_expire_days)
+    while month <= horizon:
+        upper = _add_months(month, 1)
+        db.execute(text(
+            f"CREATE TABLE IF NOT EXISTS {PARTITION_PREFIX}{month:%Y%m} "
+            f"PARTITION OF refresh_tokens "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{upper.isoformat()}')"
+        ))
+        month = upper
+
+    partitions = db.scalars(text(
+        "SELECT c.relname FROM pg_inherits i "
+        "JOIN pg_class c ON c.oid = i.inhrelid "
+        "WHERE i.inhparent = 'refresh_tokens'::regclass"
+    )).all()
+    dropped = []
+    for name in partitions:
+        try:
+            start = datetime.strptime(name[len(PARTITION_PREFIX):], "%Y%m")
+        except ValueError:
+            continue
+        if _add_months(start.replace(tzinfo=timezone.utc), 1) <= now:
+            db.execute(text(f"DROP TABLE {name}"))
+            dropped.append(name)
+    return dropped
+
+
+def sweep_refresh_tokens(db: Session, batch_size: int, now: Optional[datetime] = None) -> int:
+    """Purge dead refresh tokens batch by batch, committing after each one.
+
+    Returns the number of deleted rows (dropped partitions are not counted).
+    """
+    now = now or datetime.now(timezone.utc)
+    if settings.refresh_token_partitioned:
+        maintain_partitions(db, now)
+        db.commit()
+
+    total = 0
+    while True:
+        deleted = purge_refresh_tokens(db, now, batch_size)
+        db.commit()
+        total += deleted
+        if deleted < batch_size:
+            return total
+
+
+async def run_sweep(batch_size: Optional[int] = None) -> int:
+    """Run one sweep on a new session from the app's session factory."""
+    batch_size = batch_size or settings.refresh_token_sweep_batch_size
+    session = db_session.SessionLocal()
+    if isinstance(session, AsyncSession):
+        async with session:
+            return await session.run_sync(sweep_refresh_tokens, batch_size)
+
+    def _sweep() -> int:
+        with session:
+            return sweep_refresh_tokens(session, batch_size)
+    return await asyncio.to_thread(_sweep)
+
+
+async def _sweep_forever(interval: float) -> None:
+    # Start at a random point of the interval so workers do not sweep together
+    await asyncio.sleep(random.uniform(0, interval))
+    while True:
+        try:
+            deleted = await run_sweep()
+            logger.info("Purged %d refresh tokens", deleted)
+        except Exception:
+            logger.exception("Refresh token sweep failed")
+        await asyncio.sleep(interval)
+
+
+def start_sweeper() -> Optional["asyncio.Task[None]"]:
+    """Start the periodic sweep on the running loop, if enabled."""
+    if not settings.refresh_token_sweep_enabled:
+        return None
+    return asyncio.create_task(
+        _sweep_forever(settings.refresh_token_sweep_interval_seconds))
+
+
+async def stop_sweeper(task: Optional["asyncio.Task[None]"]) -> None:
+    """Cancel a task returned by start_sweeper and wait for it to finish."""
+    if task is None:
+        return
+    task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
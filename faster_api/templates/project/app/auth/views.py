@@ -4,18 +4,19 @@ from datetime import datetime, timedelta, timezone
 from app.core import deps
 from app.core.config import settings
 from app.core.security import (create_access_token, create_refresh_token,
-                               verify_password, verify_token)
-from app.user.crud import create_preferences, create_profile
+                               get_password_hash_async, verify_password_async,
+                               verify_token)
+from app.user.crud import register_user
 from fastapi import (APIRouter, Depends, HTTPException, Request, Response,
                      status)
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 
 from .crud import create_refresh_token as create_refresh_token_db
-from .crud import create_user
-from .crud import get_refresh_token as get_refresh_token_db
+from .crud import get_user
 from .crud import get_user_by_email
-from .crud import revoke_refresh_token as revoke_refresh_token_db
+from .crud import rotate_refresh_token as rotate_refresh_token_db
 from .exceptions import InvalidTokenPayloadException
 from .schemas import Token
 from .schemas import User as UserSchema
@@ -23,32 +24,34 @@ from .schemas import UserCreate
 
 router = APIRouter()
 
+# /join and /login are async so the slow password hash is awaited on the
+# hashing pool instead of holding one of the request threadpool's threads
+# while it runs or waits in the pool's queue. Only their database calls go
+# to the request threadpool.
+
 
 @router.post("/join", response_model=UserSchema, status_code=status.HTTP_201_CREATED)
-def create_new_user(user_in: UserCreate, db: Session = Depends(deps.get_db)) -> UserSchema:
+async def create_new_user(user_in: UserCreate, db: Session = Depends(deps.get_db)) -> UserSchema:
     """Register a new user and initialize profile and preferences."""
+    hashed_password = await get_password_hash_async(user_in.password)
 
-    existing = get_user_by_email(db, email=user_in.email)
-
-    if existing:
+    # User, profile and preferences are written in one transaction
+    new_user = await run_in_threadpool(register_user, db, user_in, hashed_password)
+    if new_user is None:
         raise HTTPException(status_code=400, detail="Email already registered")
-    new_user = create_user(db, user=user_in)
-
-    create_profile(db, {"user_id": new_user.id})
-    create_preferences(db, {"user_id": new_user.id})
 
     return new_user
 
 
 @router.post("/login", response_model=Token)
-def request_access_token(
+async def request_access_token(
     response: Response,
     db: Session = Depends(deps.get_db),
     form_data: OAuth2PasswordRequestForm = Depends(),
 ) -> Token:
     """Authenticate user and issue access & refresh tokens."""
-    user = get_user_by_email(db, form_data.username)
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    user = await run_in_threadpool(get_user_by_email, db, form_data.username)
+    if not user or not await verify_password_async(form_data.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
@@ -56,7 +59,8 @@ def request_access_token(
         )
 
     # Create tokens
-    access_token, access_token_expires = create_access_token({"sub": user.id})
+    access_token, access_token_expires = create_access_token(
+        {"sub": user.id, "email": user.email, "is_admin": user.is_admin})
     refresh_token = create_refresh_token({"sub": user.id})
 
     # Calculate cookie expiration in seconds
@@ -65,7 +69,7 @@ def request_access_token(
     # Persist the refresh token in the database along with expiry details
     expires_at = datetime.now(timezone.utc) + \
         timedelta(days=settings.refresh_token_expire_days)
-    create_refresh_token_db(db, user.id, refresh_token, expires_at)
+    await run_in_threadpool(create_refresh_token_db, db, user.id, refresh_token, expires_at)
 
     # Set the refresh token as an HttpOnly cookie
     response.set_cookie(
@@ -107,27 +111,24 @@ def refresh_access_token(
     payload = verify_token(refresh_token_cookie,
                            credentials_exception, token_type="refresh")
 
-    # Check refresh token existence and validity in the database.
-    # Use datetime.now(timezone.utc) to ensure a timezone-aware datetime for comparison.
-    if (
-        not (token_in_db := get_refresh_token_db(db, refresh_token_cookie))
-        or token_in_db.revoked
-        or token_in_db.expires_at < datetime.now(timezone.utc)
-    ):
-        raise credentials_exception
-
-    # Revoke the old refresh token in the database
-    revoke_refresh_token_db(db, token_in_db)
-
-    # Issue new tokens
     user_id = payload.get("sub")
     if not user_id:
         raise InvalidTokenPayloadException("Invalid token received.")
-    access_token, access_token_expires = create_access_token({"sub": user_id})
+
+    # Revoke the presented token and store its replacement in one transaction.
+    # The revoke only matches a live token, so of two concurrent refreshes
+    # with the same cookie exactly one succeeds.
+    now = datetime.now(timezone.utc)
     new_refresh_token = create_refresh_token({"sub": user_id})
-    expires_at = datetime.now(timezone.utc) + \
-        timedelta(days=settings.refresh_token_expire_days)
-    create_refresh_token_db(db, user_id, new_refresh_token, expires_at)
+    expires_at = now + timedelta(days=settings.refresh_token_expire_days)
+    if rotate_refresh_token_db(db, refresh_token_cookie, new_refresh_token, expires_at, now) != user_id:
+        raise credentials_exception
+
+    # Reload the user so the new access token carries current claims
+    if not (user := get_user(db, user_id)):
+        raise credentials_exception
+    access_token, access_token_expires = create_access_token(
+        {"sub": user.id, "email": user.email, "is_admin": user.is_admin})
 
     # Calculate cookie expiration in seconds
     max_age = settings.refresh_token_expire_days * 24 * 3600
@@ -0,0 +1,176 @@
+"""App registry: the apps listed in app/apps.json.
+
+`fasterapi startapp` adds every new app to apps.json. The v1 API router and
+alembic discover apps from it instead of hand-maintained import lists.
+
+With LAZY_ROUTERS, each app's routes are mounted as a placeholder that
+imports the app's views (and everything they import) on the first request
+for its URL prefix, so a worker only loads the apps it actually serves.
+FASTERAPI_APPS goes further and never mounts the other apps, so their views
+are not imported at all. Modules of other apps that a selected app imports
+itself (e.g. the user app's use of the auth models and CRUD) still load.
+"""
+import copy
+import json
+import threading
+from functools import lru_cache
+from importlib import import_module
+from importlib.util import find_spec
+from pathlib import Path
+from typing import Any, List, Optional, Tuple
+
+from app.core.config import settings
+from fastapi import FastAPI
+from pydantic import BaseModel
+from starlette.routing import BaseRoute, Match, NoMatchFound
+from starlette.types import Receive, Scope, Send
+
+APPS_FILE = Path(__file__).resolve().parents[1] / "apps.json"
+
+_load_lock = threading.Lock()
+
+
+class AppConfig(BaseModel):
+    """One entry of apps.json."""
+    name: str
+    prefix: str
+    tags: List[str] = []
+
+    @property
+    def package(self) -> str:
+        return f"app.{self.name}"
+
+
+@lru_cache(maxsize=None)
+def load_apps() -> Tuple[AppConfig, ...]:
+    """Return the registered apps, in apps.json order."""
+    with open(APPS_FILE, encoding="utf-8") as f:
+        return tuple(AppConfig(**entry) for entry in json.load(f)["apps"])
+
+
+def enabled_apps() -> Tuple[AppConfig, ...]:
+    """Return the registered apps selected by FASTERAPI_APPS (all when unset)."""
+    apps = load_apps()
+    if not settings.enabled_apps:
+        return apps
+    unknown = set(settings.enabled_apps) - {config.name for config in apps}
+    if unknown:
+        raise ValueError(
+            f"FASTERAPI_APPS names unregistered apps: {', '.join(sorted(unknown))} "
+            f"(registered: {', '.join(config.name for config in apps)})")
+    return tuple(config for config in apps if config.name in settings.enabled_apps)
+
+
+def is_enabled(name: str) -> bool:
+    """Whether this process serves the app called name."""
+    return any(config.name == name for config in enabled_apps())
+
+
+def import_models() -> None:
+    """Import the models module of every registered app into Base.metadata.
+
+    Migrations and create_all need the whole schema, so FASTERAPI_APPS does
+    not apply here.
+    """
+    for config in load_apps():
+        module = f"{config.package}.models"
+        if find_spec(module) is not None:
+            import_module(module)
+
+
+def _route_path(scope: Scope) -> str:
+    root_path = scope.get("root_path", "")
+    path: str = scope["path"]
+    return path[len(root_path):] if root_path and path.startswith(root_path) else path
+
+
+class LazyAppRoutes(BaseRoute):
+    """Stands in for the routes of one app until a request needs them."""
+
+    def __init__(self, app: FastAPI, config: AppConfig, prefix: str) -> None:
+        self.fastapi_app = app
+        self.config = config
+        self.path = prefix + config.prefix
+        self.routes: Optional[List[BaseRoute]] = None
+
+    def load(self) -> List[BaseRoute]:
+        """Import the app's views and build its routes (once)."""
+        if self.routes is None:
+            with _load_lock:
+                if self.routes is None:
+                    views = import_module(f"{self.config.package}.views")
+                    # A copy of the app's router gives the routes the same
+                    # response class, dependencies and dependency_overrides
+                    # as eagerly included ones
+                    router = copy.copy(self.fastapi_app.router)
+                    router.routes = []
+                    router.include_router(views.router, prefix=self.path,
+                                          tags=list(self.config.tags))
+                    self.routes = router.routes
+        return self.routes
+
+    def replace(self) -> None:
+        """Swap this placeholder for the loaded routes in the app's router."""
+        routes = self.fastapi_app.router.routes
+        if self in routes:
+            index = routes.index(self)
+            routes[index:index + 1] = self.load()
+
+    def matches(self, scope: Scope) -> Tuple[Match, Scope]:
+        if scope["type"] not in ("http", "websocket"):
+            return Match.NONE, {}
+        path = _route_path(scope)
+        if path != self.path and not path.startswith(self.path + "/"):
+            return Match.NONE, {}
+        partial: Optional[Scope] = None
+        for route in self.load():
+            match, child_scope = route.matches(scope)
+            if match == Match.FULL:
+                return match, child_scope
+            if match == Match.PARTIAL and partial is None:
+                partial = child_scope
+        if partial is not None:
+            return Match.PARTIAL, partial
+        return Match.NONE, {}
+
+    async def handle(self, scope: Scope, receive: Receive, send: Send) -> None:
+        # The router is done iterating its routes by now, so it is safe to
+        # splice the real ones in for the next requests
+        self.replace()
+        route = scope.get("route")
+        if route is None:
+            route = next(route for route in self.load()
+                         if route.matches(scope)[0] != Match.NONE)
+        await route.handle(scope, receive, send)
+
+    def url_path_for(self, name: str, /, **path_params: Any) -> Any:
+        for route in self.load():
+            try:
+                return route.url_path_for(name, **path_params)
+            except NoMatchFound:
+                pass
+        raise NoMatchFound(name, path_params)
+
+
+def include_apps(app: FastAPI, prefix: str, lazy: bool = False) -> None:
+    """Add the routers of the enabled apps to app under prefix."""
+    for config in enabled_apps():
+        if lazy:
+            app.router.routes.append(LazyAppRoutes(app, config, prefix))
+        else:
+            views = import_module(f"{config.package}.views")
+            app.include_router(views.router, prefix=prefix + config.prefix,
+                               tags=list(config.tags))
+
+    if lazy:
+        generate_openapi = app.openapi
+
+        def openapi() -> Any:
+            # The schema documents every app, so load them all first
+            if app.openapi_schema is None:
+                for route in list(app.router.routes):
+                    if isinstance(route, LazyAppRoutes):
+                        route.replace()
+            return generate_openapi()
+
+        app.openapi = openapi  # type: ignore[method-assign]
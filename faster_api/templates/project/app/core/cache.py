@@ -0,0 +1,142 @@
+"""In-process and Redis backed caches."""
+import threading
+import time
+from collections import OrderedDict
+from typing import (Any, Dict, Generic, Hashable, Optional, Protocol, Tuple,
+                    TypeVar, Union)
+
+V = TypeVar("V")
+
+
+class TTLCache(Generic[V]):
+    """Thread-safe LRU cache whose entries also expire after a TTL.
+
+    The least recently used entry is evicted once `maxsize` is reached.
+    Hit and miss counters are kept for monitoring.
+    """
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[Hashable, Tuple[float, V]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[V]:
+        """Return the cached value, or None if missing or expired."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: V, ttl: Optional[float] = None) -> None:
+        """Cache a value for `ttl` seconds (capped at the cache TTL)."""
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if ttl <= 0 or self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        """Drop a key if present."""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop every entry and reset the counters."""
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters and current size."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+            }
+
+
+class CacheBackend(Protocol):
+    """Minimal string key/value cache interface used by the app."""
+
+    def get(self, key: str) -> Optional[str]: ...
+
+    def set(self, key: str, value: str, ttl: int) -> None: ...
+
+    def delete(self, key: str) -> None: ...
+
+
+class MemoryCacheBackend:
+    """CacheBackend kept in this process, backed by a TTLCache.
+
+    Every worker has its own copy, so writes committed by another worker are
+    only seen once the entry expires.
+    """
+
+    def __init__(self, maxsize: int, ttl: int) -> None:
+        self.cache: TTLCache[str] = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    def get(self, key: str) -> Optional[str]:
+        return self.cache.get(key)
+
+    def set(self, key: str, value: str, ttl: int) -> None:
+        self.cache.set(key, value, ttl=ttl)
+
+    def delete(self, key: str) -> None:
+        self.cache.delete(key)
+
+
+class RedisCacheBackend:
+    """CacheBackend shared by all workers through a Redis compatible client.
+
+    `client` only needs redis-py's get/set(ex=)/delete methods.
+    """
+
+    def __init__(self, client: Any, prefix: str = "") -> None:
+        self.client = client
+        self.prefix = prefix
+
+    def get(self, key: str) -> Optional[str]:
+        value: Union[bytes, str, None] = self.client.get(self.prefix + key)
+        if isinstance(value, bytes):
+            return value.decode("utf-8")
+        return value
+
+    def set(self, key: str, value: str, ttl: int) -> None:
+        self.client.set(self.prefix + key, value, ex=ttl)
+
+    def delete(self, key: str) -> None:
+        self.client.delete(self.prefix + key)
+
+
+def create_cache_backend(
+    kind: str, maxsize: int, ttl: int, redis_url: str, prefix: str = ""
+) -> Optional[CacheBackend]:
+    """Build the cache backend named by `kind` ("memory", "redis" or "none")."""
+    if kind == "memory":
+        return MemoryCacheBackend(maxsize=maxsize, ttl=ttl)
+    if kind == "redis":
+        try:
+            import redis  # type: ignore[import-not-found, unused-ignore]
+        except ImportError as e:
+            raise RuntimeError(
+                "The redis cache backend requires the 'redis' package: pip install redis") from e
+        return RedisCacheBackend(redis.Redis.from_url(redis_url), prefix=prefix)
+    return None
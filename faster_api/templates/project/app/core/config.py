@@ -1,5 +1,8 @@
 """Configuration settings for the FastAPI application."""
-from pydantic_settings import BaseSettings
+from typing import Annotated, Any, List, Literal
+
+from pydantic import AliasChoices, Field, field_validator
+from pydantic_settings import BaseSettings, NoDecode
 
 
 class Settings(BaseSettings):
@@ -10,6 +13,40 @@ class Settings(BaseSettings):
     # Database Config
     database_url: str
 
+    # Database connection pool (ignored for SQLite)
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30.0
+    db_pool_recycle: int = 1800  # seconds, -1 disables recycling
+    db_pool_pre_ping: bool = True
+    db_statement_timeout: int = 0  # milliseconds, 0 disables (PostgreSQL only)
+    # /health/db-pool has no authentication; only enable it where the port is private
+    db_pool_stats_enabled: bool = False
+
+    # Startup: "alembic" checks the DB is at the migration head (one query),
+    # "create_all" creates missing tables (local development), "off" skips both
+    db_schema_check: Literal["alembic", "create_all", "off"] = "alembic"
+    db_pool_prewarm: int = 1  # connections opened at startup, capped at DB_POOL_SIZE
+
+    # Debug-mode SQL profiling: Server-Timing header and per-request log line
+    db_profiler_enabled: bool = False
+    db_profiler_repeat_threshold: int = 3  # identical statements flagged as N+1
+
+    # Apps of app/apps.json this process serves, e.g. FASTERAPI_APPS=auth,user
+    # (empty serves all); lets specialized worker pools skip the other apps
+    enabled_apps: Annotated[List[str], NoDecode] = Field(
+        default=[], validation_alias=AliasChoices("fasterapi_apps", "enabled_apps"))
+    # Import each app's views on its first request instead of at startup
+    lazy_routers: bool = False
+
+    # Prometheus metrics on /metrics (per worker process)
+    metrics_enabled: bool = False
+
+    # List endpoints (app.core.pagination)
+    page_size_default: int = 50
+    page_size_max: int = 200
+    export_batch_size: int = 1000  # rows fetched per round trip by NDJSON exports
+
     # Security
     secret_key: str = "NOT_SET"
     algorithm: str = "HS256"
@@ -17,6 +54,38 @@ class Settings(BaseSettings):
     refresh_token_expire_days: int = 7
     password_pepper: str = "NOT_SET"
 
+    # Removal of expired and revoked refresh tokens
+    refresh_token_sweep_enabled: bool = True
+    refresh_token_sweep_interval_seconds: int = 3600
+    refresh_token_sweep_batch_size: int = 1000
+    refresh_token_partitioned: bool = False  # PostgreSQL, see `addmigration refresh_tokens_partitioned`
+
+    # Cache of verified access token claims, keyed by token digest
+    access_token_cache_enabled: bool = True
+    access_token_cache_size: int = 10000
+    access_token_cache_ttl_seconds: int = 300
+
+    # Cache of authenticated users looked up by get_current_user_schema
+    user_cache_backend: Literal["none", "memory", "redis"] = "none"
+    user_cache_size: int = 10000
+    user_cache_ttl_seconds: int = 60
+    redis_url: str = "redis://localhost:6379/0"
+
+    # Password hashing (argon2id)
+    argon2_time_cost: int = 3
+    argon2_memory_cost: int = 65536  # KiB
+    argon2_parallelism: int = 4
+    password_hash_executor: Literal["thread", "process"] = "thread"
+    password_hash_workers: int = 4
+    password_hash_queue_size: int = 32  # pending hashes before answering 503
+
+    @field_validator("enabled_apps", mode="before")
+    @classmethod
+    def _split_enabled_apps(cls, value: Any) -> Any:
+        if isinstance(value, str):
+            return [name.strip() for name in value.split(",") if name.strip()]
+        return value
+
     class Config:
         # Load environment variables from a .env file
         env_file = ".env"
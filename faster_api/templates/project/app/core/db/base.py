@@ -1,4 +1,11 @@
 """SQLAlchemy Declarative Base."""
 from sqlalchemy.ext.declarative import declarative_base
 
-Base = declarative_base()
+
+class _BaseMixin:
+    # Load server generated columns (created_at, updated_at, ...) with
+    # RETURNING during flush, so CRUD functions never need db.refresh()
+    __mapper_args__ = {"eager_defaults": True}
+
+
+Base = declarative_base(cls=_BaseMixin)
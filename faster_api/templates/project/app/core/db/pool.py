@@ -0,0 +1,47 @@
+"""Connection pool configuration and statistics."""
+import os
+from typing import Any, Dict
+
+from app.core.config import settings
+from sqlalchemy.pool import Pool, StaticPool
+
+
+def engine_options(database_url: str) -> Dict[str, Any]:
+    """Return create_engine keyword arguments for the configured pool."""
+    if database_url.startswith("sqlite"):
+        # An in-memory database only lives as long as its connection, so every
+        # thread has to share one (StaticPool). File databases get a regular
+        # pool: a shared connection breaks as soon as two requests overlap.
+        if ":memory:" in database_url or database_url.split("///", 1)[-1] == "":
+            return {
+                "connect_args": {"check_same_thread": False},
+                "poolclass": StaticPool,
+            }
+        return {"connect_args": {"check_same_thread": False}}
+
+    connect_args: Dict[str, Any] = {}
+    if settings.db_statement_timeout and database_url.startswith("postgresql"):
+        connect_args["options"] = f"-c statement_timeout={settings.db_statement_timeout}"
+
+    return {
+        "connect_args": connect_args,
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+    }
+
+
+def pool_status(pool: Pool) -> Dict[str, Any]:
+    """Snapshot the checkout and overflow counters of a connection pool."""
+    stats: Dict[str, Any] = {
+        "pid": os.getpid(),
+        "pool_class": type(pool).__name__,
+    }
+    # Only QueuePool style pools track checkouts, StaticPool and NullPool don't
+    for name in ("size", "checkedin", "checkedout", "overflow", "timeout"):
+        counter = getattr(pool, name, None)
+        if callable(counter):
+            stats[name] = counter()
+    return stats
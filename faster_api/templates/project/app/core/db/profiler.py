@@ -0,0 +1,151 @@
+"""Per-request SQL profiling for debugging and query budgets in tests.
+
+With DB_PROFILER_ENABLED, session.py installs the engine hooks and main.py
+adds QueryProfilerMiddleware: every statement a request runs is recorded
+with its timing, statement shapes that repeat (the N+1 pattern) are
+flagged, and the totals are sent back in a Server-Timing header and logged.
+
+Tests use capture_queries/assert_max_queries, which record everything the
+engine runs inside a with block, to pin each endpoint's query count.
+"""
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from app.core.config import settings
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+# Expanded IN lists render one placeholder per value; fold them into one shape
+_PLACEHOLDER_LIST = re.compile(r"\((?:\s*(?:\?|%s|%\(\w+\)s|:\w+)\s*,?)+\)")
+# Transaction control is not counted, like the COMMITs that never reach the
+# cursor; the test fixtures' SAVEPOINTs would otherwise inflate every budget
+_TRANSACTION_CONTROL = re.compile(
+    r"\s*(?:BEGIN|SAVEPOINT|RELEASE SAVEPOINT|ROLLBACK TO SAVEPOINT)\b", re.IGNORECASE)
+
+
+def statement_shape(statement: str) -> str:
+    """Normalize a statement so executions of the same query compare equal."""
+    return _PLACEHOLDER_LIST.sub("(...)", _WHITESPACE.sub(" ", statement).strip())
+
+
+class QueryProfile:
+    """Statements run during one request or capture block."""
+
+    def __init__(self) -> None:
+        self.queries: List[Tuple[str, float]] = []
+
+    @property
+    def count(self) -> int:
+        return len(self.queries)
+
+    @property
+    def total_seconds(self) -> float:
+        return sum(seconds for _, seconds in self.queries)
+
+    def repeated(self, threshold: Optional[int] = None) -> Dict[str, int]:
+        """Statement shapes run at least `threshold` times (likely N+1)."""
+        threshold = threshold or settings.db_profiler_repeat_threshold
+        shapes = Counter(statement_shape(statement) for statement, _ in self.queries)
+        return {shape: count for shape, count in shapes.items() if count >= threshold}
+
+    def server_timing(self) -> str:
+        """Value for a Server-Timing header."""
+        repeated = len(self.repeated())
+        return (f'db;dur={self.total_seconds * 1000:.2f};'
+                f'desc="{self.count} queries, {repeated} repeated"')
+
+    def summary(self) -> str:
+        lines = [f"{self.count} queries in {self.total_seconds * 1000:.2f} ms"]
+        for shape, count in self.repeated().items():
+            lines.append(f"  repeated {count}x: {shape}")
+        return "\n".join(lines)
+
+
+_current_profile: ContextVar[Optional[QueryProfile]] = ContextVar(
+    "query_profile", default=None)
+# Profiles of active capture_queries blocks, which see every statement
+_captures: List[QueryProfile] = []
+
+
+def _before_cursor_execute(conn: Any, cursor: Any, statement: str,
+                           parameters: Any, context: Any, executemany: bool) -> None:
+    conn.info.setdefault("profiler_query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn: Any, cursor: Any, statement: str,
+                          parameters: Any, context: Any, executemany: bool) -> None:
+    elapsed = time.perf_counter() - conn.info["profiler_query_start"].pop()
+    if _TRANSACTION_CONTROL.match(statement):
+        return
+    profile = _current_profile.get()
+    if profile is not None:
+        profile.queries.append((statement, elapsed))
+    for capture in _captures:
+        capture.queries.append((statement, elapsed))
+
+
+def install_profiler(engine: Any) -> None:
+    """Record the statements of a sync or async engine."""
+    engine = getattr(engine, "sync_engine", engine)
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+@contextmanager
+def capture_queries(engine: Any) -> Iterator[QueryProfile]:
+    """Record every statement the engine runs inside the block."""
+    install_profiler(engine)
+    profile = QueryProfile()
+    _captures.append(profile)
+    try:
+        yield profile
+    finally:
+        _captures.remove(profile)
+
+
+@contextmanager
+def assert_max_queries(engine: Any, budget: int) -> Iterator[QueryProfile]:
+    """Fail if the block runs more than `budget` statements."""
+    with capture_queries(engine) as profile:
+        yield profile
+    assert profile.count <= budget, (
+        f"Expected at most {budget} queries, got {profile.count}:\n"
+        + "\n".join(statement_shape(statement) for statement, _ in profile.queries))
+
+
+class QueryProfilerMiddleware:
+    """Pure ASGI middleware that profiles the statements of each request."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        profile = QueryProfile()
+        token = _current_profile.set(profile)
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"server-timing", profile.server_timing().encode("latin-1"))]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current_profile.reset(token)
+            log = logger.warning if profile.repeated() else logger.info
+            log("%s %s: %s", scope["method"], scope["path"], profile.summary())
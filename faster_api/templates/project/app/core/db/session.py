@@ -1,21 +1,32 @@
 """Database session and engine."""
+import asyncio
+
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
-from sqlalchemy.pool import StaticPool
+from app.core.db.base import Base
+from app.core.db.pool import engine_options
+from app.core.db.profiler import install_profiler
+
+# Pool sizing, recycling and timeouts are configured through Settings
+engine = create_engine(
+    settings.database_url,
+    **engine_options(settings.database_url),
+)
+
+# Debug-mode statement profiling, see app.core.db.profiler
+if settings.db_profiler_enabled:
+    install_profiler(engine)
+
+# expire_on_commit=False keeps rows returned by INSERT/UPDATE ... RETURNING
+# usable after commit instead of re-selecting them
+SessionLocal = sessionmaker(
+    autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
+
 
-# For SQLite (including in-memory), use StaticPool to ensure the same connection across threads
-if settings.database_url.startswith("sqlite"):
-    engine = create_engine(
-        settings.database_url,
-        connect_args={"check_same_thread": False},
-        poolclass=StaticPool,
-    )
-else:
-    # For other databases, default engine
-    engine = create_engine(
-        settings.database_url,
-        connect_args={},
-    )
+async def init_models() -> None:
+    """Create all tables that do not exist yet (DB_SCHEMA_CHECK=create_all).
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
\ No newline at end of file
+    create_all blocks on the database, so it runs in a worker thread.
+    """
+    await asyncio.to_thread(Base.metadata.create_all, bind=engine)
@@ -0,0 +1,104 @@
+"""Database checks run once per worker when the app starts.
+
+By default startup does not reflect or create the schema. It runs one
+query to make sure the database is at the alembic head this code was
+written for, then opens a few pooled connections so the first requests do
+not pay for connection setup. DB_SCHEMA_CHECK=create_all restores the old
+development behaviour of creating missing tables on boot.
+"""
+import asyncio
+from pathlib import Path
+from typing import Any, Callable, Set
+
+from app.core.apps import import_models
+from app.core.config import settings
+from app.core.db import session as db_session
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import StaticPool
+
+# Project root, where alembic.ini lives
+PROJECT_ROOT = Path(__file__).resolve().parents[3]
+
+
+class SchemaOutOfDateError(RuntimeError):
+    """The database is not at the alembic head of this codebase."""
+
+
+def expected_heads() -> Set[str]:
+    """Head revisions of the project's alembic scripts (read from disk)."""
+    from alembic.config import Config
+    from alembic.script import ScriptDirectory
+
+    config = Config(str(PROJECT_ROOT / "alembic.ini"))
+    config.set_main_option("script_location", str(PROJECT_ROOT / "alembic"))
+    return set(ScriptDirectory.from_config(config).get_heads())
+
+
+def current_heads(conn: Connection) -> Set[str]:
+    """Revisions stored in alembic_version; empty if it does not exist."""
+    try:
+        return set(conn.scalars(text("SELECT version_num FROM alembic_version")))
+    except DBAPIError:
+        conn.rollback()
+        return set()
+
+
+def check_revision(conn: Connection) -> None:
+    """Raise SchemaOutOfDateError unless the database is at the alembic head."""
+    expected = expected_heads()
+    current = current_heads(conn)
+    if not expected:
+        raise SchemaOutOfDateError(
+            "No alembic migrations found. Run `fasterapi makemigrations` and "
+            "`fasterapi migrate`, or set DB_SCHEMA_CHECK=create_all for local development.")
+    if current != expected:
+        raise SchemaOutOfDateError(
+            f"Database is at revision {', '.join(sorted(current)) or '(none)'} but the "
+            f"code expects {', '.join(sorted(expected))}. Run `fasterapi migrate`.")
+
+
+async def _run_sync(engine: Any, fn: Callable[[Connection], None]) -> None:
+    if isinstance(engine, AsyncEngine):
+        async with engine.connect() as conn:
+            await conn.run_sync(fn)
+        return
+
+    def run() -> None:
+        with engine.connect() as conn:
+            fn(conn)
+    await asyncio.to_thread(run)
+
+
+async def prewarm_pool(engine: Any, size: int) -> None:
+    """Open `size` pooled connections and hand them back to the pool."""
+    sync_engine = getattr(engine, "sync_engine", engine)
+    size = min(size, getattr(sync_engine.pool, "size", lambda: size)())
+    if size <= 0 or isinstance(sync_engine.pool, StaticPool):
+        return
+
+    if isinstance(engine, AsyncEngine):
+        connections = await asyncio.gather(*(engine.connect() for _ in range(size)))
+        for conn in connections:
+            await conn.close()
+        return
+
+    def open_and_close() -> None:
+        connections = [engine.connect() for _ in range(size)]
+        for conn in connections:
+            conn.close()
+    await asyncio.to_thread(open_and_close)
+
+
+async def prepare_database() -> None:
+    """Run the configured schema check, then pre-warm the connection pool."""
+    engine = db_session.engine
+    if settings.db_schema_check == "create_all":
+        # Lazily mounted apps have not imported their models yet
+        import_models()
+        await db_session.init_models()
+    elif settings.db_schema_check == "alembic":
+        await _run_sync(engine, check_revision)
+    await prewarm_pool(engine, settings.db_pool_prewarm)
@@ -0,0 +1,78 @@
+"""Database helpers for the test suite's fixtures.
+
+The fixtures in tests/conftest.py create the schema once per test session
+and run every test inside a transaction that is rolled back afterwards;
+commits made by the code under test only release a SAVEPOINT. Under
+pytest-xdist every worker process gets its own database, so parallel
+tests never see each other's rows.
+"""
+from pathlib import Path
+from typing import Any, Optional
+
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import make_url
+
+# Used when TEST_DATABASE_URL is not set
+DEFAULT_TEST_DATABASE_URL = "sqlite:///:memory:"
+
+
+def worker_database_url(url: str, worker: Optional[str]) -> str:
+    """Return url with the database name suffixed by the xdist worker id.
+
+    worker is the PYTEST_XDIST_WORKER environment variable (e.g. "gw0"); it
+    is unset when tests run without xdist, which keeps url unchanged. In
+    memory SQLite databases are already private to each worker process.
+    """
+    parsed = make_url(url)
+    database = parsed.database
+    if not worker or not database or database == ":memory:":
+        return url
+    if parsed.get_backend_name() == "sqlite":
+        path = Path(database)
+        database = str(path.with_name(f"{path.stem}_{worker}{path.suffix}"))
+    else:
+        database = f"{database}_{worker}"
+    return parsed.set(database=database).render_as_string(hide_password=False)
+
+
+def create_database(url: str) -> None:
+    """Create the PostgreSQL database of url if it does not exist yet.
+
+    SQLite creates its database file on first connect, so other backends
+    are left alone.
+    """
+    parsed = make_url(url)
+    if parsed.get_backend_name() != "postgresql":
+        return
+    # CREATE DATABASE cannot run in a transaction, nor with an async driver
+    admin = create_engine(
+        parsed.set(drivername="postgresql+psycopg", database="postgres"),
+        isolation_level="AUTOCOMMIT")
+    try:
+        with admin.connect() as conn:
+            exists = conn.scalar(
+                text("SELECT 1 FROM pg_database WHERE datname = :name"),
+                {"name": parsed.database})
+            if not exists:
+                conn.execute(text(f'CREATE DATABASE "{parsed.database}"'))
+    finally:
+        admin.dispose()
+
+
+def enable_sqlite_savepoints(engine: Any) -> None:
+    """Let SQLAlchemy emit BEGIN itself so SAVEPOINTs work on pysqlite.
+
+    The sqlite3 module starts and commits transactions on its own, which
+    breaks nested transactions. No-op for other backends.
+    """
+    sync_engine = getattr(engine, "sync_engine", engine)
+    if sync_engine.dialect.name != "sqlite":
+        return
+
+    @event.listens_for(sync_engine, "connect")
+    def _disable_pysqlite_transactions(dbapi_connection: Any, connection_record: Any) -> None:
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(sync_engine, "begin")
+    def _begin(conn: Any) -> None:
+        conn.exec_driver_sql("BEGIN")
@@ -1,19 +1,36 @@
-"""Dependencies for API routes."""
-from typing import Generator, Optional
+"""Dependencies for API routes.
+
+The auth app (its models and cache, and passlib and jose through
+app.core.security) is imported by the dependencies that need it when they
+first run, so apps that only use get_db don't load it.
+"""
+from typing import TYPE_CHECKING, Generator, Optional
 
-from app.auth.crud import get_user
-from app.auth.models import User
 from app.core.db.session import SessionLocal
-from app.core.security import verify_token
 from fastapi import Depends, HTTPException, WebSocket, status
 from fastapi.security import OAuth2PasswordBearer
+from pydantic import ValidationError
 from sqlalchemy.orm import Session
 
+if TYPE_CHECKING:
+    from app.auth.models import User
+    from app.auth.schemas import Principal
+    from app.auth.schemas import User as UserSchema
+
 
 def get_db() -> Generator[Session, None, None]:
+    """Request scoped unit of work.
+
+    CRUD functions only flush; the session is committed once after the
+    endpoint returns, or rolled back if it raised.
+    """
     db = SessionLocal()
     try:
         yield db
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
     finally:
         db.close()
 
@@ -22,28 +39,92 @@ def get_db() -> Generator[Session, None, None]:
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
 
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+def _current_user_id(token: str) -> str:
+    """Return the user id of a verified access token."""
+    from app.core.security import verify_token
+
+    credentials_exception = _credentials_exception()
+    payload = verify_token(token, credentials_exception, token_type="access")
+    user_id: Optional[str] = payload.get("sub")
+    if user_id is None:
+        raise credentials_exception
+    return user_id
+
+
 def get_current_user(
     db: Session = Depends(get_db),
     token: str = Depends(oauth2_scheme),
-) -> User:
+) -> "User":
     """Retrieve current user based on JWT access token."""
+    from app.auth.crud import get_user
+
+    user = get_user(db, _current_user_id(token))
+    if user is None:
+        raise _credentials_exception()
+    return user
+
+
+def get_current_user_schema(
+    db: Session = Depends(get_db),
+    token: str = Depends(oauth2_scheme),
+) -> "UserSchema":
+    """Retrieve the current user's public fields.
+
+    Served from the principal cache when it has them (see app.auth.cache),
+    so a hit skips the users query. Use get_current_user for the row itself.
+    """
+    from app.auth.cache import cache_user, get_cached_user
+    from app.auth.crud import get_user
+    from app.auth.schemas import User as UserSchema
+
+    user_id = _current_user_id(token)
+    user = get_cached_user(user_id)
+    if user is None:
+        db_user = get_user(db, user_id)
+        if db_user is None:
+            raise _credentials_exception()
+        user = UserSchema.model_validate(db_user)
+        cache_user(user)
+    return user
+
+
+async def get_current_principal(token: str = Depends(oauth2_scheme)) -> "Principal":
+    """Identify the caller from signed access token claims.
+
+    Unlike get_current_user this never opens a database session, so endpoints
+    that only need the caller's id, email or admin flag don't hold a pooled
+    connection for it. Claims are as fresh as the token (see
+    access_token_expire_minutes).
+    """
+    from app.auth.schemas import Principal
+    from app.core.security import verify_token
+
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
     payload = verify_token(token, credentials_exception, token_type="access")
-    user_id: Optional[str] = payload.get("sub")
-    if user_id is None:
-        raise credentials_exception
-    user = get_user(db, user_id)
-    if user is None:
+    try:
+        return Principal(id=payload["sub"], email=payload["email"], is_admin=payload["is_admin"])
+    except (KeyError, ValidationError):
+        # Tokens issued before the claims were embedded
         raise credentials_exception
-    return user
 
 
-async def authenticate_websocket(websocket: WebSocket) -> User:
+async def authenticate_websocket(websocket: WebSocket) -> "User":
     """Authenticate a WebSocket connection using a JWT token."""
+    from app.auth.crud import get_user
+    from app.core.security import verify_token
+
     token = websocket.query_params.get("token")
     if not token:
         await websocket.close(code=1008)
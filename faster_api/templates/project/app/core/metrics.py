@@ -0,0 +1,298 @@
+"""In-process request and database metrics in the Prometheus text format.
+
+Enabled with METRICS_ENABLED. MetricsMiddleware times every HTTP request by
+route template. Events of the instrumented engine count queries and their
+time, pool checkouts, and the time spent opening new connections. Each
+worker keeps its own numbers; Prometheus adds them up across the scraped
+processes.
+"""
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import event
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+# Route label for requests that matched no route, to keep cardinality bounded
+UNMATCHED_ROUTE = "<unmatched>"
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape_label_value(value: Any) -> str:
+    # Backslashes first, so the ones added for quotes and newlines stay single
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Sequence[str], values: Sequence[Any]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(
+        f'{name}="{_escape_label_value(value)}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self._lock = threading.Lock()
+
+    def collect(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}",
+                f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    """Monotonic counter per label set."""
+    kind = "counter"
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, *label_values: str, amount: float = 1) -> None:
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def value(self, *label_values: str) -> float:
+        return self._values.get(label_values, 0)
+
+    def collect(self) -> List[str]:
+        lines = super().collect()
+        with self._lock:
+            values = list(self._values.items())
+        for label_values, value in values:
+            lines.append(f"{self.name}{_format_labels(self.labels, label_values)} {value}")
+        return lines
+
+
+class Gauge(Counter):
+    """Value that goes up and down per label set."""
+    kind = "gauge"
+
+    def dec(self, *label_values: str, amount: float = 1) -> None:
+        self.inc(*label_values, amount=-amount)
+
+
+class Histogram(_Metric):
+    """Cumulative bucket histogram per label set."""
+    kind = "histogram"
+
+    def __init__(self, *args: Any, buckets: Sequence[float] = LATENCY_BUCKETS, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.buckets = tuple(buckets)
+        # label values -> [per-bucket counts (+Inf last), sum, count]
+        self._values: Dict[LabelValues, List[Any]] = {}
+
+    def observe(self, value: float, *label_values: str) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(label_values)
+            if state is None:
+                state = self._values[label_values] = [
+                    [0] * (len(self.buckets) + 1), 0.0, 0]
+            state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    def count(self, *label_values: str) -> int:
+        state = self._values.get(label_values)
+        return state[2] if state else 0
+
+    def collect(self) -> List[str]:
+        lines = super().collect()
+        with self._lock:
+            values = [(key, list(state[0]), state[1], state[2])
+                      for key, state in self._values.items()]
+        names = self.labels + ("le",)
+        for label_values, counts, total, count in values:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                le = "+Inf" if bound == float("inf") else repr(float(bound))
+                lines.append(f"{self.name}_bucket"
+                             f"{_format_labels(names, label_values + (le,))} {cumulative}")
+            labels = _format_labels(self.labels, label_values)
+            lines.append(f"{self.name}_sum{labels} {total}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+http_requests_total = Counter(
+    "http_requests_total", "HTTP requests by route and status code.",
+    ("method", "route", "status"))
+http_request_duration_seconds = Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route.",
+    ("method", "route"))
+http_requests_in_progress = Gauge(
+    "http_requests_in_progress", "HTTP requests currently being served.",
+    ("method",))
+http_request_db_queries = Histogram(
+    "http_request_db_queries", "Database queries issued per HTTP request.",
+    ("method", "route"), buckets=QUERY_COUNT_BUCKETS)
+http_request_db_seconds = Histogram(
+    "http_request_db_seconds", "Time per HTTP request spent in database queries.",
+    ("method", "route"))
+http_request_db_connect_seconds = Histogram(
+    "http_request_db_connect_seconds", "Time per HTTP request spent opening database connections.",
+    ("method", "route"))
+db_query_duration_seconds = Histogram(
+    "db_query_duration_seconds", "Database query latency.")
+db_connect_duration_seconds = Histogram(
+    "db_connect_duration_seconds", "Time spent opening a new database connection.")
+db_pool_checkouts_total = Counter(
+    "db_pool_checkouts_total", "Connections checked out of the pool.")
+db_pool_checked_out = Gauge(
+    "db_pool_checked_out", "Connections currently checked out of the pool.")
+
+REGISTRY: List[_Metric] = [
+    http_requests_total,
+    http_request_duration_seconds,
+    http_requests_in_progress,
+    http_request_db_queries,
+    http_request_db_seconds,
+    http_request_db_connect_seconds,
+    db_query_duration_seconds,
+    db_connect_duration_seconds,
+    db_pool_checkouts_total,
+    db_pool_checked_out,
+]
+
+
+def render() -> str:
+    """Return every metric in the Prometheus text exposition format."""
+    lines: List[str] = []
+    for metric in REGISTRY:
+        lines.extend(metric.collect())
+    return "\n".join(lines) + "\n"
+
+
+class RequestStats:
+    """Database work done on behalf of the current request."""
+    __slots__ = ("queries", "query_seconds", "connect_seconds")
+
+    def __init__(self) -> None:
+        self.queries = 0
+        self.query_seconds = 0.0
+        self.connect_seconds = 0.0
+
+
+# Set by MetricsMiddleware; threadpool-run endpoints inherit a copy of the
+# context, so they update the same RequestStats object.
+request_stats: ContextVar[Optional[RequestStats]] = ContextVar(
+    "request_stats", default=None)
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware recording per-route HTTP and database metrics."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status = 500
+        stats = RequestStats()
+        token = request_stats.set(stats)
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        http_requests_in_progress.inc(method)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            http_requests_in_progress.dec(method)
+            request_stats.reset(token)
+            # The router stores the matched route in the scope; use its path
+            # template so /users/1 and /users/2 share one series.
+            route = getattr(scope.get("route"), "path", UNMATCHED_ROUTE)
+            http_requests_total.inc(method, route, str(status))
+            http_request_duration_seconds.observe(elapsed, method, route)
+            http_request_db_queries.observe(stats.queries, method, route)
+            http_request_db_seconds.observe(stats.query_seconds, method, route)
+            http_request_db_connect_seconds.observe(stats.connect_seconds, method, route)
+
+
+def _before_cursor_execute(conn: Any, cursor: Any, statement: Any,
+                           parameters: Any, context: Any, executemany: bool) -> None:
+    conn.info.setdefault("metrics_query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn: Any, cursor: Any, statement: Any,
+                          parameters: Any, context: Any, executemany: bool) -> None:
+    elapsed = time.perf_counter() - conn.info["metrics_query_start"].pop()
+    db_query_duration_seconds.observe(elapsed)
+    stats = request_stats.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.query_seconds += elapsed
+
+
+def _before_connect(dialect: Any, connection_record: Any, cargs: Any, cparams: Any) -> None:
+    connection_record.info["metrics_connect_start"] = time.perf_counter()
+
+
+def _on_connect(dbapi_connection: Any, connection_record: Any) -> None:
+    started = connection_record.info.pop("metrics_connect_start", None)
+    if started is None:
+        return
+    elapsed = time.perf_counter() - started
+    db_connect_duration_seconds.observe(elapsed)
+    stats = request_stats.get()
+    if stats is not None:
+        stats.connect_seconds += elapsed
+
+
+def _on_checkout(dbapi_connection: Any, connection_record: Any, connection_proxy: Any) -> None:
+    db_pool_checkouts_total.inc()
+    db_pool_checked_out.inc()
+    connection_record.info["metrics_checked_out"] = True
+
+
+def _on_checkin(dbapi_connection: Any, connection_record: Any) -> None:
+    # Connections checked out before instrument_engine() were never counted
+    if connection_record.info.pop("metrics_checked_out", False):
+        db_pool_checked_out.dec()
+
+
+_LISTENERS = (
+    ("before_cursor_execute", _before_cursor_execute),
+    ("after_cursor_execute", _after_cursor_execute),
+    ("do_connect", _before_connect),
+    ("connect", _on_connect),
+    ("checkout", _on_checkout),
+    ("checkin", _on_checkin),
+)
+
+
+def instrument_engine(engine: Any) -> None:
+    """Record query, connection and pool checkout metrics for one engine.
+
+    Takes a sync or async engine. The pool events are registered on the
+    engine, so they carry over to the new pool dispose() creates.
+    """
+    engine = getattr(engine, "sync_engine", engine)
+    for name, listener in _LISTENERS:
+        if not event.contains(engine, name, listener):
+            event.listen(engine, name, listener)
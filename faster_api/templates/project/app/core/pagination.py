@@ -0,0 +1,146 @@
+"""Keyset pagination and NDJSON export for list endpoints.
+
+Keyset pages filter on the sort key of the last row seen instead of using
+OFFSET, so every page is an index range scan no matter how deep the client
+pages. The cursor is the URL-safe base64 of the JSON-encoded sort key.
+"""
+import base64
+import binascii
+import json
+from datetime import date, datetime
+from typing import (Any, AsyncIterator, Dict, Generic, Iterator, List, Optional,
+                    Sequence, Type, TypeVar)
+
+from app.core.config import settings
+from app.core.db import session as db_session
+from fastapi import HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from pydantic_core import to_json
+from sqlalchemy import Select, tuple_
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+T = TypeVar("T")
+
+
+class InvalidCursorException(HTTPException):
+    """Raised when a pagination cursor cannot be decoded."""
+
+    def __init__(self) -> None:
+        super().__init__(status_code=status.HTTP_400_BAD_REQUEST,
+                         detail="Invalid pagination cursor")
+
+
+class Page(BaseModel, Generic[T]):
+    """One page of results and the cursor of the next one (None on the last page)."""
+    items: List[T]
+    next_cursor: Optional[str] = None
+
+
+class PageParams:
+    """Query parameters of a paginated list endpoint, used as a dependency."""
+
+    def __init__(
+        self,
+        cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+        limit: int = Query(settings.page_size_default, ge=1, le=settings.page_size_max),
+    ) -> None:
+        self.cursor = cursor
+        self.limit = limit
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Encode a sort key as an opaque cursor."""
+    return base64.urlsafe_b64encode(to_json(list(values))).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> List[Any]:
+    """Decode a cursor created by encode_cursor."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, UnicodeError, binascii.Error):
+        raise InvalidCursorException()
+    if not isinstance(values, list):
+        raise InvalidCursorException()
+    return values
+
+
+class Keyset:
+    """Sort key of a paginated query: columns that together are unique.
+
+    End the key with the primary key so rows with equal sort values still
+    have a stable order, e.g. Keyset(Item.created_at, Item.id).
+    """
+
+    def __init__(self, *columns: Any) -> None:
+        self.columns = columns
+
+    def _parse(self, values: List[Any]) -> List[Any]:
+        if len(values) != len(self.columns):
+            raise InvalidCursorException()
+        parsed = []
+        for column, value in zip(self.columns, values):
+            try:
+                python_type = column.type.python_type
+            except NotImplementedError:
+                python_type = None
+            try:
+                if value is not None and python_type is datetime:
+                    value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+                elif value is not None and python_type is date:
+                    value = date.fromisoformat(value)
+            except (AttributeError, ValueError):
+                raise InvalidCursorException()
+            parsed.append(value)
+        return parsed
+
+    def apply(self, stmt: Select[Any], params: PageParams) -> Select[Any]:
+        """Restrict stmt to the page after params.cursor.
+
+        One extra row is fetched to tell whether another page follows.
+        """
+        if params.cursor:
+            values = self._parse(decode_cursor(params.cursor))
+            stmt = stmt.where(tuple_(*self.columns) > tuple_(*values))
+        return stmt.order_by(*self.columns).limit(params.limit + 1)
+
+    def page(self, rows: Sequence[Any], params: PageParams) -> Dict[str, Any]:
+        """Build the Page content for rows fetched with a statement from apply()."""
+        items = list(rows[:params.limit])
+        next_cursor = None
+        if len(rows) > params.limit:
+            last = items[-1]
+            next_cursor = encode_cursor(
+                [getattr(last, column.key) for column in self.columns])
+        return {"items": items, "next_cursor": next_cursor}
+
+
+def _ndjson_line(schema: Type[BaseModel], row: Any) -> bytes:
+    model = schema.model_validate(row)
+    return model.__pydantic_serializer__.to_json(model) + b"\n"
+
+
+def stream_ndjson(stmt: Select[Any], schema: Type[BaseModel], batch_size: Optional[int] = None) -> StreamingResponse:
+    """Stream every row of stmt as newline-delimited JSON.
+
+    Rows are fetched in batches of batch_size with yield_per (a server-side
+    cursor on PostgreSQL), so memory stays constant however big the table is.
+    The export opens its own session: the request's session is already
+    closed by the time the response body is sent.
+    """
+    stmt = stmt.execution_options(
+        yield_per=batch_size or settings.export_batch_size)
+
+    if isinstance(db_session.SessionLocal, async_sessionmaker):
+        async def content() -> AsyncIterator[bytes]:
+            async with db_session.SessionLocal() as db:
+                async for row in await db.stream_scalars(stmt):
+                    yield _ndjson_line(schema, row)
+        return StreamingResponse(content(), media_type="application/x-ndjson")
+
+    def rows() -> Iterator[bytes]:
+        with db_session.SessionLocal() as db:
+            for row in db.scalars(stmt):
+                yield _ndjson_line(schema, row)
+    return StreamingResponse(rows(), media_type="application/x-ndjson")
@@ -0,0 +1,43 @@
+"""JSON responses serialized by pydantic-core.
+
+FastJSONResponse is the app's default response class: pydantic-core writes
+the JSON bytes in Rust instead of going through the stdlib json encoder.
+
+schema_response goes one step further for hot endpoints. It validates an
+ORM object against its schema once and serializes the model straight to
+bytes. Returning a Response also makes FastAPI skip its own response_model
+validation and jsonable_encoder pass; keep response_model on the route so
+the OpenAPI schema stays the same.
+"""
+from typing import Any, Type, TypeVar
+
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from pydantic_core import to_json
+from starlette.background import BackgroundTask
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with pydantic_core.to_json."""
+
+    def render(self, content: Any) -> bytes:
+        return to_json(content)
+
+
+class SchemaResponse(JSONResponse):
+    """Response for a validated pydantic model, serialized without re-validation."""
+
+    def __init__(self, content: BaseModel, status_code: int = 200,
+                 headers: Any = None, background: BackgroundTask | None = None) -> None:
+        super().__init__(content, status_code=status_code, headers=headers,
+                         background=background)
+
+    def render(self, content: BaseModel) -> bytes:
+        return content.__pydantic_serializer__.to_json(content)
+
+
+def schema_response(schema: Type[ModelT], obj: Any, status_code: int = 200) -> SchemaResponse:
+    """Validate obj (e.g. an ORM row) against schema once and return it as JSON."""
+    return SchemaResponse(schema.model_validate(obj), status_code=status_code)
@@ -1,9 +1,12 @@
-"""API Router for version 1."""
-from fastapi import APIRouter
+"""API routes for version 1: the apps registered in app/apps.json."""
+from fastapi import FastAPI
 
-from app.auth import views as auth_views
-from app.user import views as user_views
+from app.core.apps import include_apps
+from app.core.config import settings
 
-api_router = APIRouter()
-api_router.include_router(auth_views.router, prefix="/auth", tags=["Authentication"])
-api_router.include_router(user_views.router, prefix="/user", tags=["User"])
\ No newline at end of file
+PREFIX = "/api/v1"
+
+
+def include_api_routes(app: FastAPI) -> None:
+    """Mount every registered app's router under PREFIX."""
+    include_apps(app, PREFIX, lazy=settings.lazy_routers)
@@ -1,11 +1,21 @@
 """Security utilities for password hashing and JWT management."""
+import asyncio
+import hashlib
+import threading
+import time
+from concurrent.futures import (Executor, Future, ProcessPoolExecutor,
+                                ThreadPoolExecutor)
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, Tuple
+from typing import Any, Callable, Dict, Optional, Tuple, TypeVar
 
+from app.auth.exceptions import PasswordHashingBusyException
+from app.core.cache import TTLCache
 from app.core.config import settings
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 
+T = TypeVar("T")
+
 # static pepper for password hashing
 _PEPPER = settings.password_pepper
 
@@ -13,6 +23,71 @@ pwd_context = CryptContext(
     schemes=["argon2", "bcrypt"],
     deprecated="auto",
     argon2__type="ID",
+    argon2__time_cost=settings.argon2_time_cost,
+    argon2__memory_cost=settings.argon2_memory_cost,
+    argon2__parallelism=settings.argon2_parallelism,
+)
+
+
+class PasswordHashingPool:
+    """Bounded executor for password hashing.
+
+    Argon2 is slow and memory hungry on purpose, so hashes run on a small
+    dedicated pool instead of the request threads or the event loop. At most
+    `workers + queue_size` hashes may be running or waiting; further calls
+    fail fast with a 503 instead of queueing behind a login burst.
+    """
+
+    def __init__(self, workers: int, queue_size: int, kind: str = "thread") -> None:
+        self.workers = workers
+        self.kind = kind
+        self._slots = threading.BoundedSemaphore(workers + queue_size)
+        self._lock = threading.Lock()
+        self._executor: Optional[Executor] = None
+
+    def _get_executor(self) -> Executor:
+        # Created on first use so importing the app never forks processes
+        with self._lock:
+            if self._executor is None:
+                if self.kind == "process":
+                    self._executor = ProcessPoolExecutor(max_workers=self.workers)
+                else:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.workers, thread_name_prefix="password-hash")
+            return self._executor
+
+    def submit(self, fn: Callable[..., T], *args: Any) -> "Future[T]":
+        """Schedule fn(*args) or raise PasswordHashingBusyException when full."""
+        if not self._slots.acquire(blocking=False):
+            raise PasswordHashingBusyException()
+        try:
+            future = self._get_executor().submit(fn, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def run(self, fn: Callable[..., T], *args: Any) -> T:
+        """Run fn(*args) on the pool and block until it returns."""
+        return self.submit(fn, *args).result()
+
+    async def run_async(self, fn: Callable[..., T], *args: Any) -> T:
+        """Run fn(*args) on the pool without blocking the event loop."""
+        return await asyncio.wrap_future(self.submit(fn, *args))
+
+    def shutdown(self) -> None:
+        """Stop the workers, waiting for in-flight hashes."""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+
+
+hashing_pool = PasswordHashingPool(
+    workers=settings.password_hash_workers,
+    queue_size=settings.password_hash_queue_size,
+    kind=settings.password_hash_executor,
 )
 
 
@@ -26,6 +101,16 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password + _PEPPER)
 
 
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password on the hashing pool, for use in async endpoints."""
+    return await hashing_pool.run_async(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """Hash a password on the hashing pool, for use in async endpoints."""
+    return await hashing_pool.run_async(get_password_hash, password)
+
+
 def create_access_token(data: Dict[str, Any]) -> Tuple[str, datetime]:
     """Create a JWT access token with expiration."""
     to_encode = data.copy()
@@ -51,13 +136,38 @@ def create_refresh_token(data: Dict[str, Any]) -> str:
     return encoded_jwt
 
 
+# Claims of access tokens that already passed verification, so repeat
+# requests with the same bearer token skip the HMAC check and JSON decode.
+access_token_cache: TTLCache[Dict[str, Any]] = TTLCache(
+    maxsize=settings.access_token_cache_size,
+    ttl=settings.access_token_cache_ttl_seconds,
+)
+
+
+def token_digest(token: str) -> bytes:
+    """Return the SHA-256 digest of a token."""
+    return hashlib.sha256(token.encode("utf-8")).digest()
+
+
 def verify_token(token: str, credentials_exception: Exception, token_type: str) -> Dict[str, Any]:
     """Decode and verify a JWT token, raising an exception on failure."""
+    cache_key = None
+    if token_type == "access" and settings.access_token_cache_enabled:
+        cache_key = token_digest(token)
+        cached = access_token_cache.get(cache_key)
+        if cached is not None:
+            return dict(cached)
+
     try:
         payload = jwt.decode(token, settings.secret_key,
                              algorithms=[settings.algorithm])
         if payload.get("type") != token_type:
             raise JWTError()
-        return payload
     except JWTError:
         raise credentials_exception
+
+    # Only successful verifications are cached, never beyond the token's exp
+    if cache_key is not None and isinstance(payload.get("exp"), (int, float)):
+        access_token_cache.set(
+            cache_key, dict(payload), ttl=payload["exp"] - time.time())
+    return payload
@@ -1,18 +1,47 @@
 """Main application module for FastAPI server."""
 import os 
-from fastapi import FastAPI
+import sys
+from typing import Any, AsyncIterator
+from fastapi import FastAPI, Response
 from contextlib import asynccontextmanager
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv 
 load_dotenv()
 
-from app.core.db.base import Base
-from app.core.db.session import engine
+from app.core.db import session as db_session
+from app.core.db.pool import pool_status
+from app.core.db.profiler import QueryProfilerMiddleware
+from app.core.db.startup import prepare_database
+from app.core import metrics
+from app.core.apps import is_enabled
 from app.core.config import settings 
-from app.core.routers.v1 import api_router as api_router
+from app.core.responses import FastJSONResponse
+from app.core.routers.v1 import include_api_routes
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Check the database and run background tasks for the app's lifetime."""
+    await prepare_database()
+    if settings.metrics_enabled:
+        metrics.instrument_engine(db_session.engine)
+    # Only workers that serve the auth app (FASTERAPI_APPS) sweep refresh
+    # tokens; app.core.security (passlib and jose) is shut down only if one
+    # of the worker's apps imported it
+    sweeper = None
+    if is_enabled("auth"):
+        from app.auth.sweeper import start_sweeper, stop_sweeper
+        sweeper = start_sweeper()
+    yield
+    if sweeper is not None:
+        await stop_sweeper(sweeper)
+    security = sys.modules.get("app.core.security")
+    if security is not None:
+        security.hashing_pool.shutdown()
 
 app = FastAPI(
     title=settings.app_name,
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse,
     version="0.0.1",
     docs_url="/docs",
     redoc_url="/redoc"
@@ -27,15 +56,27 @@ app.add_middleware(
     allow_headers=["*"]   # Allows all headers
 )
 
+if settings.db_profiler_enabled:
+    app.add_middleware(QueryProfilerMiddleware)
+
+if settings.metrics_enabled:
+    app.add_middleware(metrics.MetricsMiddleware)
+
+    @app.get("/metrics", include_in_schema=False)
+    def prometheus_metrics() -> Response:
+        """Request and database metrics of this worker in the Prometheus text format."""
+        return Response(metrics.render(), media_type=metrics.CONTENT_TYPE)
+
 @app.get("/", tags=["Health Check"])
 def health_check() -> dict[str, str]:
     """Health check endpoint returning welcome message."""
     return {"message": f"Welcome to {settings.app_name}"}
 
-app.include_router(api_router, prefix="/api/v1")
+if settings.db_pool_stats_enabled:
+    @app.get("/health/db-pool", tags=["Health Check"], include_in_schema=False)
+    def db_pool_stats() -> dict[str, Any]:
+        """Live connection pool counters for this worker (see `fasterapi dbpool`)."""
+        return pool_status(db_session.engine.pool)
 
-@app.on_event("startup")
-def on_startup() -> None:
-    """Initialize database tables on application startup."""
-    Base.metadata.create_all(bind=engine)
+include_api_routes(app)
 
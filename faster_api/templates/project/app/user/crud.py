@@ -4,10 +4,17 @@ from typing import Any, Dict, Optional
 
 from app.auth.crud import get_user_by_email  # type: ignore
 from app.auth.crud import create_user, get_user  # type: ignore
+from app.auth.models import User as UserModel
+from app.auth.schemas import UserCreate
+from sqlalchemy import insert, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from .models import Preferences, Profile
 
+# Name SQLAlchemy gives the index created by unique=True, index=True on User.email
+EMAIL_INDEX = "ix_users_email"
+
 
 def get_preferences(db: Session, user_id: str) -> Optional[Preferences]:
     """Retrieve preferences for a user by ID."""
@@ -18,20 +25,21 @@ def create_preferences(db: Session, data: Dict[str, Any]) -> Preferences:
     """Create a new preferences entry. 'data' must include 'user_id' and any preferences fields."""
     db_prefs = Preferences(**data)
     db.add(db_prefs)
-    db.commit()
-    db.refresh(db_prefs)
+    db.flush()
     return db_prefs
 
 
 def update_preferences(db: Session, user_id: str, updates: Dict[str, Any]) -> Optional[Preferences]:
-    """Update user's preferences with provided fields."""
-    db_prefs = get_preferences(db, user_id)
-    if not db_prefs:
-        return None
-    for field, value in updates.items():
-        setattr(db_prefs, field, value)
-    db.commit()
-    db.refresh(db_prefs)
+    """Update user's preferences with provided fields.
+
+    Issues a single UPDATE ... RETURNING; returns None when no row matched.
+    """
+    if not updates:
+        return get_preferences(db, user_id)
+    db_prefs = db.scalars(
+        update(Preferences).where(Preferences.user_id == user_id).values(**updates).returning(Preferences),
+        execution_options={"populate_existing": True},
+    ).first()
     return db_prefs
 
 
@@ -44,18 +52,52 @@ def create_profile(db: Session, data: Dict[str, Any]) -> Profile:
     """Create a new profile entry. 'data' must include 'user_id' and any profile fields."""
     db_profile = Profile(**data)
     db.add(db_profile)
-    db.commit()
-    db.refresh(db_profile)
+    db.flush()
     return db_profile
 
 
 def update_profile(db: Session, user_id: str, updates: Dict[str, Any]) -> Optional[Profile]:
-    """Update user's profile with provided fields."""
-    db_profile = get_profile(db, user_id)
-    if not db_profile:
-        return None
-    for field, value in updates.items():
-        setattr(db_profile, field, value)
-    db.commit()
-    db.refresh(db_profile)
+    """Update user's profile with provided fields.
+
+    Issues a single UPDATE ... RETURNING; returns None when no row matched.
+    """
+    if not updates:
+        return get_profile(db, user_id)
+    db_profile = db.scalars(
+        update(Profile).where(Profile.user_id == user_id).values(**updates).returning(Profile),
+        execution_options={"populate_existing": True},
+    ).first()
     return db_profile
+
+
+def _is_duplicate_email(exc: IntegrityError) -> bool:
+    """Whether exc is a violation of the unique index on users.email.
+
+    SQLite names the column ("users.email"), PostgreSQL and MySQL the index.
+    """
+    message = str(exc.orig)
+    return "users.email" in message or EMAIL_INDEX in message
+
+
+def register_user(db: Session, user: UserCreate, hashed_password: str) -> Optional[UserModel]:
+    """Insert a user with its profile and preferences in a single transaction.
+
+    The user row comes back through INSERT ... RETURNING, and a duplicate email
+    is detected by the unique constraint rather than a SELECT beforehand.
+    The inserts run in a savepoint, so a duplicate email only undoes them and
+    leaves earlier work in the session alone; returns None in that case. Any
+    other integrity error is raised.
+    """
+    try:
+        with db.begin_nested():
+            db_user = db.scalars(
+                insert(UserModel).returning(UserModel),
+                [{"email": user.email, "hashed_password": hashed_password, "name": user.name}],
+            ).one()
+            db.execute(insert(Profile), [{"user_id": db_user.id}])
+            db.execute(insert(Preferences), [{"user_id": db_user.id}])
+    except IntegrityError as exc:
+        if not _is_duplicate_email(exc):
+            raise
+        return None
+    return db_user
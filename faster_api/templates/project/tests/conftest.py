@@ -1,50 +1,102 @@
-"""Pytest fixtures for application testing."""
+"""Pytest fixtures for application testing.
+
+The schema is created once per test session and every test runs in a
+transaction that is rolled back afterwards, so tests stay isolated without
+recreating tables. Set TEST_DATABASE_URL to run against PostgreSQL; with
+pytest-xdist each worker uses its own database.
+"""
+import os
+import sys
+
+# Add 'backend' directory to sys.path so 'app' package is importable
+sys.path.insert(0, os.path.abspath(
+    os.path.join(os.path.dirname(__file__), '..')))
+# Settings are read when app is first imported, so configure them before
+os.environ['DATABASE_URL'] = 'sqlite:///:memory:'  # for Pydantic Settings
+# Cheap argon2 parameters: hashes stay real but take microseconds
+os.environ.setdefault('ARGON2_TIME_COST', '1')
+os.environ.setdefault('ARGON2_MEMORY_COST', '8')
+os.environ.setdefault('ARGON2_PARALLELISM', '1')
+# Off by default; tests cover the unauthenticated /health/db-pool endpoint
+os.environ.setdefault('DB_POOL_STATS_ENABLED', 'true')
+
 from sqlalchemy.pool import StaticPool
 from sqlalchemy.orm import Session, sessionmaker
 from sqlalchemy import create_engine
 from fastapi.testclient import TestClient
 from app.main import app
 from app.core.deps import get_db
+from app.core.config import settings
 from app.core.db.base import Base
 from app.core.db import session as session_module
+from app.core.db.testing import (DEFAULT_TEST_DATABASE_URL, create_database,
+                                 enable_sqlite_savepoints, worker_database_url)
 from app.auth.schemas import UserCreate
 from app.auth.crud import create_user
 import pytest
 from typing import Any, Dict, Generator
-import os
-import sys
-
-# Add 'backend' directory to sys.path so 'app' package is importable
-sys.path.insert(0, os.path.abspath(
-    os.path.join(os.path.dirname(__file__), '..')))
-os.environ['DATABASE_URL'] = 'sqlite:///:memory:'  # for Pydantic Settings
 
 
-# SQLite in-memory database URL for tests
-SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
+# In-memory SQLite unless TEST_DATABASE_URL is set, one database per xdist worker
+SQLALCHEMY_DATABASE_URL = worker_database_url(
+    os.environ.get('TEST_DATABASE_URL', DEFAULT_TEST_DATABASE_URL),
+    os.environ.get('PYTEST_XDIST_WORKER'))
+create_database(SQLALCHEMY_DATABASE_URL)
 
 # Create test engine and sessionmaker
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL,
-    connect_args={"check_same_thread": False},
-    poolclass=StaticPool,
-)
+if SQLALCHEMY_DATABASE_URL.startswith("sqlite"):
+    engine = create_engine(
+        SQLALCHEMY_DATABASE_URL,
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+else:
+    engine = create_engine(SQLALCHEMY_DATABASE_URL)
+enable_sqlite_savepoints(engine)
 TestingSessionLocal = sessionmaker(
-    autocommit=False, autoflush=False, bind=engine)
+    autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
 
 # Override the session module's engine and SessionLocal for testing
 session_module.engine = engine
 session_module.SessionLocal = TestingSessionLocal
 
+# Tables are created once per session below, not from alembic migrations
+settings.db_schema_check = "off"
 
-@pytest.fixture(scope="function", autouse=True)
+
+@pytest.fixture
+def anyio_backend() -> str:
+    """Run async tests on asyncio only."""
+    return "asyncio"
+
+
+@pytest.fixture(scope="session", autouse=True)
 def setup_test_database() -> Generator[None, Any, Any]:
-    """Set up and tear down the test database for each test."""
-    # Create all tables before each test
+    """Create the schema once for the whole test session."""
+    Base.metadata.drop_all(bind=engine)
     Base.metadata.create_all(bind=engine)
     yield
-    # Drop all tables after each test to isolate tests
     Base.metadata.drop_all(bind=engine)
+    engine.dispose()
+
+
+@pytest.fixture(scope="function", autouse=True)
+def rollback_test_transaction(setup_test_database: None) -> Generator[None, Any, Any]:
+    """Run each test in a transaction that is rolled back afterwards.
+
+    Every session made by TestingSessionLocal during the test joins the
+    outer transaction; their commits only release SAVEPOINTs.
+    """
+    connection = engine.connect()
+    transaction = connection.begin()
+    TestingSessionLocal.configure(
+        bind=connection, join_transaction_mode="create_savepoint")
+    try:
+        yield
+    finally:
+        TestingSessionLocal.configure(bind=engine)
+        transaction.rollback()
+        connection.close()
 
 
 @pytest.fixture(scope="function")
@@ -61,10 +113,13 @@ def db_session() -> Generator[Session, None, None]:
 def client(db_session: Session) -> Generator[TestClient, None, None]:
     """Return a FastAPI TestClient using the test database session."""
     def override_get_db():
+        # Same unit of work semantics as deps.get_db
         try:
             yield db_session
-        finally:
-            pass
+            db_session.commit()
+        except Exception:
+            db_session.rollback()
+            raise
 
     app.dependency_overrides[get_db] = override_get_db
     with TestClient(app) as test_client:
@@ -0,0 +1,84 @@
+"""Tests for the app registry, FASTERAPI_APPS and lazily mounted routers."""
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Set
+
+import pytest
+from app.core.apps import LazyAppRoutes, enabled_apps, include_apps, load_apps
+from app.core.config import Settings, settings
+from app.core.routers.v1 import PREFIX
+from app.main import app
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+
+def test_registered_apps_are_mounted() -> None:
+    assert [config.name for config in load_apps()][:2] == ["auth", "user"]
+    paths = {getattr(route, "path", "") for route in app.routes}
+    assert f"{PREFIX}/auth/login" in paths
+    assert f"{PREFIX}/user/" in paths
+
+
+def test_lazy_routes_load_on_first_request() -> None:
+    lazy_app = FastAPI()
+    include_apps(lazy_app, PREFIX, lazy=True)
+    placeholders = [route for route in lazy_app.routes if isinstance(route, LazyAppRoutes)]
+    auth, user = placeholders[:2]
+
+    with TestClient(lazy_app) as client:
+        assert client.get(f"{PREFIX}/user/").status_code == 401
+        # Only the requested app was loaded, and its routes replaced the placeholder
+        assert user.routes is not None and user not in lazy_app.routes
+        assert auth.routes is None and auth in lazy_app.routes
+        assert client.get(f"{PREFIX}/auth/join").status_code == 405
+        assert client.get(f"{PREFIX}/unknown").status_code == 404
+
+        paths = client.get("/openapi.json").json()["paths"]
+        assert f"{PREFIX}/auth/login" in paths and f"{PREFIX}/user/" in paths
+
+
+def test_fasterapi_apps_is_comma_separated(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("FASTERAPI_APPS", "auth, user")
+    assert Settings(database_url=settings.database_url).enabled_apps == ["auth", "user"]
+    monkeypatch.setenv("FASTERAPI_APPS", "")
+    assert Settings(database_url=settings.database_url).enabled_apps == []
+
+
+def test_enabled_apps_only_mounts_selected_apps(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "enabled_apps", ["user"])
+    assert [config.name for config in enabled_apps()] == ["user"]
+
+    partial_app = FastAPI()
+    include_apps(partial_app, PREFIX)
+    paths = {getattr(route, "path", "") for route in partial_app.routes}
+    assert f"{PREFIX}/user/" in paths
+    assert not any(path.startswith(f"{PREFIX}/auth") for path in paths)
+
+    monkeypatch.setattr(settings, "enabled_apps", ["user", "billing"])
+    with pytest.raises(ValueError, match="billing"):
+        enabled_apps()
+
+
+def _imported_modules(module: str, **env: str) -> Set[str]:
+    """Modules a fresh interpreter has loaded after importing module."""
+    result = subprocess.run(
+        [sys.executable, "-c", f"import sys, {module}; print(*sys.modules, sep='\\n')"],
+        cwd=Path(__file__).resolve().parents[1], env={**os.environ, **env},
+        capture_output=True, text=True, check=True)
+    return set(result.stdout.split())
+
+
+def test_workers_load_auth_only_when_needed() -> None:
+    # Apps that only use deps.get_db don't pull in the auth app, passlib or jose
+    modules = _imported_modules("app.core.deps")
+    assert "app.core.deps" in modules
+    assert not modules & {"app.auth.models", "app.core.security", "jose", "passlib"}
+
+    # The user app builds on the auth models, CRUD and schemas and
+    # authenticates its callers, but the auth views and sweeper stay out
+    modules = _imported_modules("app.main", FASTERAPI_APPS="user")
+    assert "app.user.views" in modules
+    assert {"app.auth.models", "app.auth.crud", "app.core.security", "jose"} <= modules
+    assert "app.auth.views" not in modules and "app.auth.sweeper" not in modules
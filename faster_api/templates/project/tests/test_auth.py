@@ -58,3 +58,50 @@ def test_login_and_refresh_flow(client: TestClient, new_user_data: Dict[str, Any
     new_token_data = refresh_resp.json()
     assert "access_token" in new_token_data
     assert new_token_data.get("token_type") == "bearer"
+
+
+def test_access_token_embeds_principal_claims(client: TestClient, new_user_data: Dict[str, Any]) -> None:
+    from app.core.security import verify_token
+    from fastapi import HTTPException
+
+    client.post("/api/v1/auth/join", json=new_user_data)
+    login_resp = client.post(
+        "/api/v1/auth/login",
+        data={
+            "username": new_user_data["email"],
+            "password": new_user_data["password"],
+        },
+    )
+    payload = verify_token(login_resp.json()["access_token"], HTTPException(
+        status_code=401), token_type="access")
+    assert payload["email"] == new_user_data["email"]
+    assert payload["is_admin"] is False
+
+
+def test_refresh_token_cannot_be_reused(client: TestClient, new_user_data: Dict[str, Any]) -> None:
+    client.post("/api/v1/auth/join", json=new_user_data)
+    login_resp = client.post(
+        "/api/v1/auth/login",
+        data={
+            "username": new_user_data["email"],
+            "password": new_user_data["password"],
+        },
+    )
+    old_refresh_token = login_resp.cookies["refresh_token"]
+    client.cookies.clear()
+
+    headers = {"Cookie": f"refresh_token={old_refresh_token}"}
+    first = client.post("/api/v1/auth/refresh", headers=headers)
+    assert first.status_code == 200
+    # The rotated token was revoked atomically, replaying it fails
+    client.cookies.clear()
+    second = client.post("/api/v1/auth/refresh", headers=headers)
+    assert second.status_code == 401
+    # The replacement token is valid
+    new_refresh_token = first.cookies["refresh_token"]
+    client.cookies.clear()
+    third = client.post(
+        "/api/v1/auth/refresh",
+        headers={"Cookie": f"refresh_token={new_refresh_token}"},
+    )
+    assert third.status_code == 200
@@ -1,10 +1,16 @@
 """Tests for core security utilities."""
+import threading
 import time
 
 import pytest
-from app.core.security import (create_access_token, create_refresh_token,
-                               get_password_hash, verify_password,
-                               verify_token)
+from app.auth.exceptions import PasswordHashingBusyException
+from app.core.config import settings
+from app.core.cache import TTLCache
+from app.core.security import (PasswordHashingPool, access_token_cache,
+                               create_access_token, create_refresh_token,
+                               get_password_hash, get_password_hash_async,
+                               token_digest, verify_password,
+                               verify_password_async, verify_token)
 from fastapi import HTTPException
 
 
@@ -18,6 +24,37 @@ def test_password_hash_and_verify() -> None:
     assert not verify_password("wrongpass", hashed)
 
 
+def test_password_hash_uses_configured_argon2_cost() -> None:
+    hashed = get_password_hash("supersecret")
+    assert f"m={settings.argon2_memory_cost},t={settings.argon2_time_cost}" in hashed
+
+
+@pytest.mark.anyio
+async def test_password_hash_and_verify_async() -> None:
+    hashed = await get_password_hash_async("supersecret")
+    assert await verify_password_async("supersecret", hashed)
+    assert not await verify_password_async("wrongpass", hashed)
+
+
+def test_hashing_pool_rejects_when_full() -> None:
+    pool = PasswordHashingPool(workers=1, queue_size=0)
+    release = threading.Event()
+    try:
+        busy = pool.submit(release.wait)
+        # The only slot is taken, the next hash is shed with a 503
+        with pytest.raises(PasswordHashingBusyException) as exc_info:
+            pool.submit(release.wait)
+        assert exc_info.value.status_code == 503
+        assert exc_info.value.headers == {"Retry-After": "1"}
+        release.set()
+        busy.result()
+        # Slots are given back once a hash completes
+        assert pool.run(len, "abc") == 3
+    finally:
+        release.set()
+        pool.shutdown()
+
+
 def test_create_and_verify_access_token() -> None:
     data = {"sub": "user123"}
     token, _ = create_access_token(data)
@@ -47,3 +84,39 @@ def test_verify_token_invalid_raises() -> None:
     exc = HTTPException(status_code=401)
     with pytest.raises(HTTPException):
         verify_token(bad_token, exc, token_type="access")
+
+
+def test_verify_token_caches_access_claims() -> None:
+    access_token_cache.clear()
+    token, _ = create_access_token({"sub": "cached-user"})
+    exc = HTTPException(status_code=401)
+    first = verify_token(token, exc, token_type="access")
+    second = verify_token(token, exc, token_type="access")
+    assert first == second
+    assert access_token_cache.stats()["hits"] == 1
+    assert access_token_cache.get(token_digest(token)) == first
+    # A cached access token is still rejected for another token type
+    with pytest.raises(HTTPException):
+        verify_token(token, exc, token_type="refresh")
+
+
+def test_verify_token_cache_can_be_disabled(monkeypatch: pytest.MonkeyPatch) -> None:
+    access_token_cache.clear()
+    monkeypatch.setattr(settings, "access_token_cache_enabled", False)
+    token, _ = create_access_token({"sub": "uncached-user"})
+    verify_token(token, HTTPException(status_code=401), token_type="access")
+    assert access_token_cache.stats()["size"] == 0
+
+
+def test_ttl_cache_expiry_and_lru_eviction(monkeypatch: pytest.MonkeyPatch) -> None:
+    cache: TTLCache[str] = TTLCache(maxsize=2, ttl=60)
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now)
+    cache.set("a", "1")
+    cache.set("b", "2", ttl=5)
+    assert cache.get("a") == "1"
+    cache.set("c", "3")  # evicts "b", the least recently used
+    assert cache.get("b") is None
+    monkeypatch.setattr(time, "monotonic", lambda: now + 61)
+    assert cache.get("a") is None
+    assert cache.stats() == {"hits": 1, "misses": 2, "size": 1, "maxsize": 2}
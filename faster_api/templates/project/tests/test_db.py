@@ -0,0 +1,126 @@
+"""Tests for database engine configuration, startup checks and test fixtures."""
+import threading
+from pathlib import Path
+from typing import Any, Dict
+
+import app.core.db.startup as startup
+import pytest
+from app.core.config import Settings, settings
+from app.core.db import session as db_session
+from app.core.db.base import Base
+from app.core.db.pool import engine_options
+from app.core.db.testing import worker_database_url
+from app.main import app
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import QueuePool, StaticPool
+
+
+def test_engine_options_sqlite_uses_static_pool() -> None:
+    options = engine_options("sqlite:///:memory:")
+    assert options["poolclass"] is StaticPool
+    assert "pool_size" not in options
+
+
+def test_engine_options_sqlite_file_uses_regular_pool() -> None:
+    options = engine_options("sqlite:///./app.db")
+    assert "poolclass" not in options
+    assert options["connect_args"] == {"check_same_thread": False}
+
+
+def test_engine_options_postgres_pool_settings(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "db_pool_size", 20)
+    monkeypatch.setattr(settings, "db_statement_timeout", 5000)
+    options = engine_options("postgresql://user:pw@localhost/db")
+    assert options["pool_size"] == 20
+    assert options["max_overflow"] == settings.db_max_overflow
+    assert options["pool_pre_ping"] is settings.db_pool_pre_ping
+    assert options["connect_args"] == {"options": "-c statement_timeout=5000"}
+
+
+def test_db_pool_stats_endpoint(client: TestClient) -> None:
+    # The endpoint is unauthenticated, so it is opt-in
+    assert Settings.model_fields["db_pool_stats_enabled"].default is False
+    response = client.get("/health/db-pool")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["pool_class"] == "StaticPool"
+    assert isinstance(data["pid"], int)
+
+
+def test_check_revision_compares_alembic_heads(monkeypatch: pytest.MonkeyPatch) -> None:
+    engine = create_engine("sqlite:///:memory:", poolclass=StaticPool)
+    monkeypatch.setattr(startup, "expected_heads", lambda: {"abc123"})
+    with engine.connect() as conn:
+        with pytest.raises(startup.SchemaOutOfDateError, match=r"\(none\)"):
+            startup.check_revision(conn)
+        conn.execute(text("CREATE TABLE alembic_version (version_num VARCHAR(32))"))
+        conn.execute(text("INSERT INTO alembic_version VALUES ('old456')"))
+        with pytest.raises(startup.SchemaOutOfDateError, match="old456"):
+            startup.check_revision(conn)
+        conn.execute(text("UPDATE alembic_version SET version_num = 'abc123'"))
+        startup.check_revision(conn)
+
+
+def test_startup_fails_without_migrations(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "db_schema_check", "alembic")
+    monkeypatch.setattr(startup, "expected_heads", lambda: set())
+    with pytest.raises(startup.SchemaOutOfDateError, match="makemigrations"):
+        with TestClient(app):
+            pass
+
+
+@pytest.mark.anyio
+async def test_prewarm_pool_opens_connections(tmp_path: Path) -> None:
+    engine = create_engine(f"sqlite:///{tmp_path / 'prewarm.db'}",
+                           poolclass=QueuePool, pool_size=2)
+    # Capped at the pool size
+    await startup.prewarm_pool(engine, 5)
+    assert isinstance(engine.pool, QueuePool)
+    assert engine.pool.checkedin() == 2
+    engine.dispose()
+
+
+@pytest.mark.anyio
+async def test_init_models_keeps_the_event_loop_free(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    # A file database of its own: the test engine's one connection is in use
+    url = f"sqlite:///{tmp_path / 'init.db'}"
+    is_async = isinstance(db_session.engine, AsyncEngine)
+    engine: Any = create_async_engine(url.replace("sqlite:", "sqlite+aiosqlite:", 1)) if is_async else create_engine(url)
+    monkeypatch.setattr(db_session, "engine", engine)
+    threads = []
+
+    def record(target: Any, connection: Any, **kw: Any) -> None:
+        threads.append(threading.get_ident())
+    event.listen(Base.metadata, "before_create", record)
+    try:
+        await db_session.init_models()
+    finally:
+        event.remove(Base.metadata, "before_create", record)
+        if is_async:
+            await engine.dispose()
+        else:
+            engine.dispose()
+    assert len(threads) == 1
+    if not is_async:
+        # A sync engine blocks, so create_all must run in a worker thread
+        assert threads[0] != threading.get_ident()
+
+
+def test_worker_database_url_suffixes_database_name() -> None:
+    url = "postgresql://user:pw@localhost/app_test"
+    assert worker_database_url(url, None) == url
+    assert worker_database_url(url, "gw1") == "postgresql://user:pw@localhost/app_test_gw1"
+    assert worker_database_url("sqlite:///./test.db", "gw0") == "sqlite:///test_gw0.db"
+    assert worker_database_url("sqlite:///:memory:", "gw0") == "sqlite:///:memory:"
+
+
+# The two tests below run in order: the first commits a user through the API,
+# the second would fail to join with the same email if the commit leaked.
+def test_fixture_rolls_back_commits(client: TestClient, new_user_data: Dict[str, Any]) -> None:
+    assert client.post("/api/v1/auth/join", json=new_user_data).status_code == 201
+
+
+def test_fixture_rolls_back_commits_between_tests(client: TestClient, new_user_data: Dict[str, Any]) -> None:
+    assert client.post("/api/v1/auth/join", json=new_user_data).status_code == 201
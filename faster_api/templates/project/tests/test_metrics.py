@@ -0,0 +1,91 @@
+"""Tests for the Prometheus metrics middleware and engine instrumentation."""
+from app.core import metrics
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import StaticPool
+
+
+def _metrics_app() -> FastAPI:
+    engine = create_engine("sqlite:///:memory:", poolclass=StaticPool,
+                           connect_args={"check_same_thread": False})
+    metrics.instrument_engine(engine)
+    app = FastAPI()
+    app.add_middleware(metrics.MetricsMiddleware)
+
+    @app.get("/items/{item_id}")
+    def read_item(item_id: int) -> dict[str, int]:
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            conn.execute(text("SELECT 2"))
+        return {"item_id": item_id}
+
+    return app
+
+
+def test_requests_are_labelled_by_route_template() -> None:
+    client = TestClient(_metrics_app())
+    before = metrics.http_requests_total.value("GET", "/items/{item_id}", "200")
+    client.get("/items/1")
+    client.get("/items/2")
+    client.get("/missing")
+
+    assert metrics.http_requests_total.value("GET", "/items/{item_id}", "200") == before + 2
+    assert metrics.http_requests_total.value("GET", metrics.UNMATCHED_ROUTE, "404") >= 1
+    assert metrics.http_requests_in_progress.value("GET") == 0
+
+
+def test_database_work_is_attributed_to_the_request() -> None:
+    client = TestClient(_metrics_app())
+    before = metrics.http_request_db_queries.count("GET", "/items/{item_id}")
+    queries_before = metrics.db_query_duration_seconds.count()
+    checkouts_before = metrics.db_pool_checkouts_total.value()
+    connects_before = metrics.db_connect_duration_seconds.count()
+    client.get("/items/1")
+
+    assert metrics.http_request_db_queries.count("GET", "/items/{item_id}") == before + 1
+    assert metrics.db_query_duration_seconds.count() == queries_before + 2
+    assert metrics.db_pool_checkouts_total.value() == checkouts_before + 1
+    # The first checkout of a new engine opened its connection
+    assert metrics.db_connect_duration_seconds.count() == connects_before + 1
+    assert metrics.http_request_db_connect_seconds.count("GET", "/items/{item_id}") >= 1
+    assert metrics.db_pool_checked_out.value() == 0
+    # Two queries land in the "le=2" bucket of the per-request histogram
+    assert 'http_request_db_queries_bucket{method="GET",route="/items/{item_id}",le="2.0"}' in metrics.render()
+
+
+def test_histogram_renders_cumulative_buckets() -> None:
+    histogram = metrics.Histogram("test_seconds", "Test.", ("path",), buckets=(0.1, 1.0))
+    histogram.observe(0.05, "/a")
+    histogram.observe(0.5, "/a")
+    histogram.observe(5, "/a")
+    lines = histogram.collect()
+    assert 'test_seconds_bucket{path="/a",le="0.1"} 1' in lines
+    assert 'test_seconds_bucket{path="/a",le="1.0"} 2' in lines
+    assert 'test_seconds_bucket{path="/a",le="+Inf"} 3' in lines
+    assert 'test_seconds_count{path="/a"} 3' in lines
+
+
+def test_only_instrumented_engines_are_recorded() -> None:
+    instrumented = create_engine("sqlite://")
+    other = create_engine("sqlite://")
+    metrics.instrument_engine(instrumented)
+    metrics.instrument_engine(instrumented)
+    queries_before = metrics.db_query_duration_seconds.count()
+    with other.connect() as conn:
+        conn.execute(text("SELECT 1"))
+    assert metrics.db_query_duration_seconds.count() == queries_before
+
+    # dispose() swaps the pool; its events come along without instrumenting again
+    instrumented.dispose()
+    checkouts_before = metrics.db_pool_checkouts_total.value()
+    with instrumented.connect() as conn:
+        conn.execute(text("SELECT 1"))
+    assert metrics.db_query_duration_seconds.count() == queries_before + 1
+    assert metrics.db_pool_checkouts_total.value() == checkouts_before + 1
+
+
+def test_label_values_are_escaped() -> None:
+    counter = metrics.Counter("test_total", "Test.", ("route",))
+    counter.inc('/a\\b"c\nd')
+    assert counter.collect()[-1] == 'test_total{route="/a\\\\b\\"c\\nd"} 1'
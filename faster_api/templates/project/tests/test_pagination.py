@@ -0,0 +1,79 @@
+"""Tests for keyset pagination and NDJSON export."""
+import json
+from datetime import datetime, timedelta
+from typing import Any, Dict, Generator, List
+
+import pytest
+from app.auth.models import User
+from app.auth.schemas import User as UserSchema
+from app.core.db.base import Base
+from app.core.pagination import (InvalidCursorException, Keyset, PageParams,
+                                 decode_cursor, encode_cursor, stream_ndjson)
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+keyset = Keyset(User.created_at, User.id)
+
+
+@pytest.fixture
+def users_session() -> Generator[Session, None, None]:
+    """A separate sync database holding 7 users, two sharing created_at."""
+    engine = create_engine("sqlite:///:memory:", poolclass=StaticPool,
+                           connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    start = datetime(2024, 1, 1)
+    with Session(engine) as session:
+        session.execute(insert(User), [
+            {"id": f"user-{index}", "email": f"user{index}@example.com",
+             "hashed_password": "x",
+             "created_at": start + timedelta(minutes=min(index, 5))}
+            for index in range(7)
+        ])
+        yield session
+
+
+def _params(cursor: Any = None, limit: int = 3) -> PageParams:
+    return PageParams(cursor=cursor, limit=limit)
+
+
+def test_keyset_pages_cover_every_row_once(users_session: Session) -> None:
+    seen: List[str] = []
+    cursor = None
+    while True:
+        params = _params(cursor)
+        rows = users_session.scalars(keyset.apply(select(User), params)).all()
+        page = keyset.page(rows, params)
+        seen.extend(user.id for user in page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert seen == [f"user-{index}" for index in range(7)]
+
+
+def test_cursor_round_trip_and_rejects_garbage() -> None:
+    assert decode_cursor(encode_cursor(["a", 1])) == ["a", 1]
+    with pytest.raises(InvalidCursorException):
+        decode_cursor("not a cursor")
+    with pytest.raises(InvalidCursorException):
+        keyset.apply(select(User), _params(encode_cursor(["only-one-value"])))
+
+
+def test_stream_ndjson_exports_every_row(client: TestClient, new_user_data: Dict[str, Any]) -> None:
+    for index in range(3):
+        client.post("/api/v1/auth/join",
+                    json={**new_user_data, "email": f"user{index}@example.com"})
+
+    export = FastAPI()
+
+    @export.get("/export")
+    def export_users() -> Any:
+        return stream_ndjson(select(User).order_by(User.email), UserSchema, batch_size=2)
+
+    response = TestClient(export).get("/export")
+    assert response.headers["content-type"] == "application/x-ndjson"
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["email"] for line in lines] == [f"user{index}@example.com" for index in range(3)]
+    assert "hashed_password" not in lines[0]
@@ -0,0 +1,70 @@
+"""Per-endpoint query budgets and tests for the SQL profiler."""
+from typing import Any, Dict
+
+from app.core.db import session as session_module
+from app.core.db.profiler import (QueryProfilerMiddleware, assert_max_queries,
+                                  install_profiler, statement_shape)
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import StaticPool
+
+
+def _login(client: TestClient, new_user_data: Dict[str, Any]) -> Dict[str, str]:
+    response = client.post(
+        "/api/v1/auth/login",
+        data={
+            "username": new_user_data["email"],
+            "password": new_user_data["password"],
+        },
+    )
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def test_auth_query_budgets(client: TestClient, new_user_data: Dict[str, Any]) -> None:
+    # One INSERT each for the user, profile and preferences
+    with assert_max_queries(session_module.engine, 3):
+        client.post("/api/v1/auth/join", json=new_user_data)
+    # Look up the user, store the refresh token
+    with assert_max_queries(session_module.engine, 2):
+        _login(client, new_user_data)
+    # Revoke and replace the refresh token, load the user for new claims
+    with assert_max_queries(session_module.engine, 3):
+        assert client.post("/api/v1/auth/refresh").status_code == 200
+
+
+def test_user_query_budgets(client: TestClient, new_user_data: Dict[str, Any]) -> None:
+    client.post("/api/v1/auth/join", json=new_user_data)
+    headers = _login(client, new_user_data)
+    with assert_max_queries(session_module.engine, 1):
+        client.get("/api/v1/user/", headers=headers)
+    # Profile endpoints authenticate from token claims alone
+    with assert_max_queries(session_module.engine, 1):
+        client.get("/api/v1/user/profile", headers=headers)
+    with assert_max_queries(session_module.engine, 1):
+        client.patch("/api/v1/user/profile", headers=headers, json={"timezone": "UTC"})
+    with assert_max_queries(session_module.engine, 1):
+        client.get("/api/v1/user/preferences", headers=headers)
+
+
+def test_statement_shape_folds_in_lists() -> None:
+    assert statement_shape("SELECT *\n  FROM t WHERE id IN (?, ?, ?)") == \
+        statement_shape("SELECT * FROM t WHERE id IN (?)")
+
+
+def test_profiler_middleware_flags_repeated_statements() -> None:
+    engine = create_engine("sqlite:///:memory:", poolclass=StaticPool,
+                           connect_args={"check_same_thread": False})
+    install_profiler(engine)
+    app = FastAPI()
+    app.add_middleware(QueryProfilerMiddleware)
+
+    @app.get("/n-plus-one")
+    def n_plus_one() -> dict[str, int]:
+        with engine.connect() as conn:
+            for item_id in range(5):
+                conn.execute(text("SELECT :id"), {"id": item_id})
+        return {"items": 5}
+
+    response = TestClient(app).get("/n-plus-one")
+    assert response.headers["server-timing"].endswith('desc="5 queries, 1 repeated"')
@@ -0,0 +1,34 @@
+"""Tests for the pydantic-core JSON responses."""
+import json
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+from app.auth.schemas import User as UserSchema
+from app.core.responses import FastJSONResponse, schema_response
+from app.main import app
+
+
+def test_fast_json_response_matches_stdlib_json() -> None:
+    content = {"name": "Zoë", "items": [1, 2.5, None, True]}
+    response = FastJSONResponse(content)
+    assert json.loads(bytes(response.body)) == content
+    assert response.media_type == "application/json"
+
+
+def test_schema_response_serializes_orm_objects() -> None:
+    created = datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+    row = SimpleNamespace(id="1", email="a@example.com", name=None, is_admin=False,
+                          hashed_password="secret", created_at=created, updated_at=created)
+    response = schema_response(UserSchema, row, status_code=201)
+    assert response.status_code == 201
+    body = json.loads(bytes(response.body))
+    assert body["email"] == "a@example.com"
+    assert body["created_at"] == "2024-01-02T03:04:05Z"
+    # Only schema fields are written
+    assert "hashed_password" not in body
+
+
+def test_schema_response_routes_keep_openapi_models() -> None:
+    schema = app.openapi()["paths"]["/api/v1/user/profile"]["get"]
+    content = schema["responses"]["200"]["content"]["application/json"]
+    assert content["schema"]["$ref"].endswith("/Profile")
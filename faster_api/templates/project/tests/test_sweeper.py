@@ -0,0 +1,65 @@
+"""Tests for the refresh token sweeper."""
+from datetime import datetime, timedelta, timezone, tzinfo
+from typing import Any, Dict, Optional
+
+import app.auth.sweeper as sweeper
+import pytest
+from fastapi.testclient import TestClient
+
+
+def _login(client: TestClient, new_user_data: Dict[str, Any]) -> str:
+    response = client.post(
+        "/api/v1/auth/login",
+        data={
+            "username": new_user_data["email"],
+            "password": new_user_data["password"],
+        },
+    )
+    client.cookies.clear()
+    return response.cookies["refresh_token"]
+
+
+def _refresh(client: TestClient, refresh_token: str) -> Any:
+    response = client.post(
+        "/api/v1/auth/refresh",
+        headers={"Cookie": f"refresh_token={refresh_token}"},
+    )
+    client.cookies.clear()
+    return response
+
+
+def test_sweep_purges_revoked_tokens(client: TestClient, new_user_data: Dict[str, Any]) -> None:
+    client.post("/api/v1/auth/join", json=new_user_data)
+    old_token = _login(client, new_user_data)
+    new_token = _refresh(client, old_token).cookies["refresh_token"]
+
+    # Only the rotated token is dead
+    assert client.portal is not None
+    assert client.portal.call(sweeper.run_sweep, 1) == 1
+    assert client.portal.call(sweeper.run_sweep, 1) == 0
+    assert _refresh(client, old_token).status_code == 401
+    assert _refresh(client, new_token).status_code == 200
+
+
+def test_sweep_purges_expired_tokens_in_batches(client: TestClient, new_user_data: Dict[str, Any], monkeypatch: pytest.MonkeyPatch) -> None:
+    client.post("/api/v1/auth/join", json=new_user_data)
+    for _ in range(3):
+        _login(client, new_user_data)
+
+    class _Later(datetime):
+        @classmethod
+        def now(cls, tz: Optional[tzinfo] = None) -> "_Later":
+            return cls.fromtimestamp(
+                (datetime.now(tz) + timedelta(days=365)).timestamp(), tz)
+
+    assert client.portal is not None
+    assert client.portal.call(sweeper.run_sweep, 1) == 0
+    monkeypatch.setattr(sweeper, "datetime", _Later)
+    # Batches of one row are repeated until nothing is left
+    assert client.portal.call(sweeper.run_sweep, 1) == 3
+
+
+def test_add_months_wraps_year() -> None:
+    month = datetime(2024, 11, 1, tzinfo=timezone.utc)
+    assert sweeper._add_months(month, 1) == datetime(2024, 12, 1, tzinfo=timezone.utc)
+    assert sweeper._add_months(month, 2) == datetime(2025, 1, 1, tzinfo=timezone.utc)
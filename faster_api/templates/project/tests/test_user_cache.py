@@ -0,0 +1,79 @@
+"""Tests for the principal (user) cache."""
+from typing import Any, Dict, Generator, Optional
+
+import app.auth.cache as auth_cache
+import app.auth.crud as auth_crud
+import pytest
+from app.core.cache import MemoryCacheBackend, RedisCacheBackend
+from fastapi.testclient import TestClient
+
+
+class FakeRedis:
+    """In-memory stand-in for the subset of redis-py used by RedisCacheBackend."""
+
+    def __init__(self) -> None:
+        self.store: Dict[str, bytes] = {}
+
+    def get(self, name: str) -> Optional[bytes]:
+        return self.store.get(name)
+
+    def set(self, name: str, value: str, ex: Optional[int] = None) -> None:
+        self.store[name] = value.encode("utf-8")
+
+    def delete(self, *names: str) -> None:
+        for name in names:
+            self.store.pop(name, None)
+
+
+@pytest.fixture(params=["memory", "redis"])
+def user_cache(request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch) -> Generator[Any, None, None]:
+    """Enable the user cache with each backend."""
+    if request.param == "memory":
+        backend: Any = MemoryCacheBackend(maxsize=100, ttl=60)
+    else:
+        backend = RedisCacheBackend(FakeRedis(), prefix="test:")
+    monkeypatch.setattr(auth_cache, "user_cache", backend)
+    yield backend
+
+
+def _login(client: TestClient, user_data: Dict[str, Any]) -> Dict[str, str]:
+    client.post("/api/v1/auth/join", json=user_data)
+    login_resp = client.post(
+        "/api/v1/auth/login",
+        data={"username": user_data["email"], "password": user_data["password"]},
+    )
+    return {"Authorization": f"Bearer {login_resp.json()['access_token']}"}
+
+
+def test_current_user_served_from_cache(client: TestClient, new_user_data: Dict[str, Any], user_cache: Any, monkeypatch: pytest.MonkeyPatch) -> None:
+    headers = _login(client, new_user_data)
+    me = client.get("/api/v1/user/", headers=headers).json()
+    assert user_cache.get(f"user:{me['id']}") is not None
+
+    def no_db_lookup(*args: Any) -> None:
+        raise AssertionError("user should come from the cache")
+    monkeypatch.setattr(auth_crud, "get_user", no_db_lookup)
+    cached = client.get("/api/v1/user/", headers=headers)
+    assert cached.status_code == 200
+    assert cached.json() == me
+
+
+def test_profile_write_keeps_cached_user(client: TestClient, new_user_data: Dict[str, Any], user_cache: Any) -> None:
+    headers = _login(client, new_user_data)
+    me = client.get("/api/v1/user/", headers=headers).json()
+    assert user_cache.get(f"user:{me['id']}") is not None
+
+    resp = client.patch("/api/v1/user/profile",
+                        json={"timezone": "UTC"}, headers=headers)
+    assert resp.status_code == 200
+    assert user_cache.get(f"user:{me['id']}") is not None
+
+
+def test_cached_user_excludes_password_hash(client: TestClient, new_user_data: Dict[str, Any], user_cache: Any) -> None:
+    headers = _login(client, new_user_data)
+    me = client.get("/api/v1/user/", headers=headers).json()
+    raw = user_cache.get(f"user:{me['id']}")
+    assert "hashed_password" not in raw
+    user = auth_cache.get_cached_user(me["id"])
+    assert user is not None
+    assert user.email == new_user_data["email"]
@@ -1,9 +1,18 @@
 """Tests for user CRUD operations."""
+import datetime
 from typing import Any
 
+import app.auth.cache as auth_cache
 import pytest
+from app.auth.crud import create_refresh_token, get_refresh_token
+from app.auth.schemas import User as UserSchema
+from app.auth.schemas import UserCreate
+from app.core.cache import MemoryCacheBackend
+from app.core.security import token_digest
 from app.user.crud import (create_preferences, create_profile, get_preferences,
-                           get_profile, update_preferences, update_profile)
+                           get_profile, register_user, update_preferences,
+                           update_profile)
+from sqlalchemy import event
 from sqlalchemy.orm import Session
 
 
@@ -41,3 +50,78 @@ def test_profile_crud(db_session: Session, test_user: Any) -> None:
     assert updated.timezone == "UTC"
     # Updating non-existent profile returns None
     assert update_profile(db_session, "no-user", {"timezone": "UTC"}) is None
+
+
+def test_user_write_evicts_cached_user(db_session: Session, test_user: Any, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(auth_cache, "user_cache",
+                        MemoryCacheBackend(maxsize=10, ttl=60))
+    create_profile(db_session, {"user_id": test_user.id})
+    db_session.commit()
+    auth_cache.cache_user(UserSchema.model_validate(test_user))
+    # The cache only holds user columns, so profile writes leave it alone
+    update_profile(db_session, test_user.id, {"timezone": "UTC"})
+    db_session.commit()
+    cached = auth_cache.get_cached_user(test_user.id)
+    assert isinstance(cached, UserSchema) and cached.email == test_user.email
+    # Committing a write to the user drops it, flushing alone keeps it
+    test_user.name = "Renamed"
+    db_session.flush()
+    assert auth_cache.get_cached_user(test_user.id) is not None
+    db_session.commit()
+    assert auth_cache.get_cached_user(test_user.id) is None
+
+
+def test_register_user_single_transaction(db_session: Session) -> None:
+    user_in = UserCreate(email="new@example.com", password="pw", name="New")
+    user = register_user(db_session, user_in, hashed_password="hashed")
+    assert user is not None
+    # Server defaults come back through RETURNING
+    assert user.created_at is not None
+    assert (profile := get_profile(db_session, user.id))
+    assert profile.user_id == user.id
+    assert get_preferences(db_session, user.id)
+    # The unique email constraint rejects a second registration
+    assert register_user(db_session, user_in, hashed_password="hashed") is None
+
+
+def test_register_duplicate_keeps_earlier_work(db_session: Session, test_user: Any) -> None:
+    # Only the savepoint around the inserts is rolled back, not the flushed profile
+    create_profile(db_session, {"user_id": test_user.id, "timezone": "UTC"})
+    user_in = UserCreate(email=test_user.email, password="pw", name="Dup")
+    assert register_user(db_session, user_in, hashed_password="hashed") is None
+    profile = get_profile(db_session, test_user.id)
+    assert profile is not None and profile.timezone == "UTC"
+
+
+def test_update_profile_single_statement(db_session: Session, test_user: Any) -> None:
+    create_profile(db_session, {"user_id": test_user.id})
+    db_session.flush()
+    statements: list[str] = []
+
+    def record(conn: Any, cursor: Any, statement: str, *args: Any) -> None:
+        statements.append(statement)
+    engine = db_session.get_bind()
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        updated = update_profile(db_session, test_user.id, {"locale": "en_US"})
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    assert updated
+    assert updated.locale == "en_US"
+    assert len(statements) == 1
+    assert statements[0].startswith("UPDATE user_profiles")
+    assert "RETURNING" in statements[0]
+
+
+def test_refresh_token_stored_as_digest(db_session: Session, test_user: Any) -> None:
+    expires_at = datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(days=1)
+    db_token = create_refresh_token(db_session, test_user.id, "raw.jwt.value", expires_at)
+    # Only the fixed-width digest is persisted
+    assert db_token.token_hash == token_digest("raw.jwt.value")
+    assert len(db_token.token_hash) == 32
+    assert not hasattr(db_token, "token")
+    # Lookups hash the presented token
+    fetched = get_refresh_token(db_session, "raw.jwt.value")
+    assert fetched
+    assert fetched.id == db_token.id
+    assert get_refresh_token(db_session, "other.jwt.value") is None
@@ -0,0 +1,110 @@
+"""Async CRUD functions for User model."""
+import datetime
+from typing import Optional
+
+import app.auth.cache  # noqa: F401  (evicts cached users on commit)
+from app.auth.models import RefreshToken
+from app.auth.models import User as UserModel
+from app.auth.schemas import UserCreate
+from app.core.security import token_digest
+from sqlalchemy import insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+async def get_user(db: AsyncSession, user_id: str) -> Optional[UserModel]:
+    """Retrieve a user by ID."""
+    result = await db.execute(select(UserModel).where(UserModel.id == user_id))
+    return result.scalars().first()
+
+
+async def get_user_by_email(db: AsyncSession, email: str) -> Optional[UserModel]:
+    """Retrieve a user by email address."""
+    result = await db.execute(select(UserModel).where(UserModel.email == email))
+    return result.scalars().first()
+
+
+async def create_user(db: AsyncSession, user: UserCreate) -> UserModel:
+    """Create a new user with hashed password."""
+    from app.core.security import get_password_hash_async
+    db_user = UserModel(
+        email=user.email,
+        hashed_password=await get_password_hash_async(user.password),
+        name=user.name
+    )
+    db.add(db_user)
+    await db.flush()
+    return db_user
+
+
+async def create_superuser(db: AsyncSession, name: str, email: str, password: str) -> UserModel:
+    """Create a new superuser with admin privileges."""
+    from app.core.security import get_password_hash_async
+    db_user = UserModel(
+        email=email,
+        hashed_password=await get_password_hash_async(password),
+        name=name,
+        is_admin=True
+    )
+    db.add(db_user)
+    await db.flush()
+    return db_user
+
+
+async def create_refresh_token(db: AsyncSession, user_id: str, token: str, expires_at: datetime.datetime) -> RefreshToken:
+    """Create and persist a new refresh token."""
+    db_token = RefreshToken(
+        user_id=user_id,
+        token_hash=token_digest(token),
+        expires_at=expires_at,
+    )
+    db.add(db_token)
+    await db.flush()
+    return db_token
+
+
+async def get_refresh_token(db: AsyncSession, token: str) -> Optional[RefreshToken]:
+    """Retrieve a refresh token by the digest of its token string."""
+    result = await db.execute(select(RefreshToken).where(RefreshToken.token_hash == token_digest(token)))
+    return result.scalars().first()
+
+
+async def revoke_refresh_token(db: AsyncSession, db_token: RefreshToken) -> None:
+    """Mark a refresh token as revoked."""
+    db_token.revoked = True
+    db.add(db_token)
+    await db.flush()
+
+
+async def rotate_refresh_token(
+    db: AsyncSession,
+    token: str,
+    new_token: str,
+    expires_at: datetime.datetime,
+    now: datetime.datetime,
+) -> Optional[str]:
+    """Revoke a live refresh token and store its replacement.
+
+    The conditional UPDATE ... RETURNING only matches a token that is neither
+    revoked nor expired, so concurrent rotations of the same token cannot
+    both succeed. Returns the owning user id, or None if nothing matched.
+    """
+    result = await db.scalars(
+        update(RefreshToken)
+        .where(
+            RefreshToken.token_hash == token_digest(token),
+            RefreshToken.revoked.is_(False),
+            RefreshToken.expires_at > now,
+        )
+        .values(revoked=True)
+        .returning(RefreshToken.user_id),
+        execution_options={"synchronize_session": False},
+    )
+    user_id = result.first()
+    if user_id is None:
+        return None
+    await db.execute(insert(RefreshToken), [{
+        "user_id": user_id,
+        "token_hash": token_digest(new_token),
+        "expires_at": expires_at,
+    }])
+    return user_id
@@ -0,0 +1,145 @@
+"""User endpoints."""
+from datetime import datetime, timedelta, timezone
+
+from app.core import deps
+from app.core.config import settings
+from app.core.security import (create_access_token, create_refresh_token,
+                               get_password_hash_async, verify_password_async,
+                               verify_token)
+from app.user.crud import register_user
+from fastapi import (APIRouter, Depends, HTTPException, Request, Response,
+                     status)
+from fastapi.security import OAuth2PasswordRequestForm
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .crud import create_refresh_token as create_refresh_token_db
+from .crud import get_user
+from .crud import get_user_by_email
+from .crud import rotate_refresh_token as rotate_refresh_token_db
+from .exceptions import InvalidTokenPayloadException
+from .schemas import Token
+from .schemas import User as UserSchema
+from .schemas import UserCreate
+
+router = APIRouter()
+
+
+@router.post("/join", response_model=UserSchema, status_code=status.HTTP_201_CREATED)
+async def create_new_user(user_in: UserCreate, db: AsyncSession = Depends(deps.get_db)) -> UserSchema:
+    """Register a new user and initialize profile and preferences."""
+    hashed_password = await get_password_hash_async(user_in.password)
+
+    # User, profile and preferences are written in one transaction
+    new_user = await register_user(db, user_in, hashed_password)
+    if new_user is None:
+        raise HTTPException(status_code=400, detail="Email already registered")
+
+    return new_user
+
+
+@router.post("/login", response_model=Token)
+async def request_access_token(
+    response: Response,
+    db: AsyncSession = Depends(deps.get_db),
+    form_data: OAuth2PasswordRequestForm = Depends(),
+) -> Token:
+    """Authenticate user and issue access & refresh tokens."""
+    user = await get_user_by_email(db, form_data.username)
+    if not user or not await verify_password_async(form_data.password, user.hashed_password):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Incorrect username or password",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    # Create tokens
+    access_token, access_token_expires = create_access_token(
+        {"sub": user.id, "email": user.email, "is_admin": user.is_admin})
+    refresh_token = create_refresh_token({"sub": user.id})
+
+    # Calculate cookie expiration in seconds
+    max_age = settings.refresh_token_expire_days * 24 * 3600
+
+    # Persist the refresh token in the database along with expiry details
+    expires_at = datetime.now(timezone.utc) + \
+        timedelta(days=settings.refresh_token_expire_days)
+    await create_refresh_token_db(db, user.id, refresh_token, expires_at)
+
+    # Set the refresh token as an HttpOnly cookie
+    response.set_cookie(
+        key="refresh_token",
+        value=refresh_token,
+        httponly=True,
+        max_age=max_age,
+        secure=False,  # Support HTTP and HTTPS
+        samesite="lax",
+    )
+
+    # Return only the access token in the response body
+    return Token(
+        access_token=access_token,
+        expiry=round(access_token_expires.timestamp()),
+        token_type="bearer"
+    )
+
+
+@router.post("/refresh", response_model=Token)
+async def refresh_access_token(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(deps.get_db),
+) -> Token:
+    """Refresh access token using a valid refresh token from an HttpOnly cookie."""
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate refresh token",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+    # Retrieve the refresh token from the cookie
+    refresh_token_cookie = request.cookies.get("refresh_token")
+    if not refresh_token_cookie:
+        raise credentials_exception
+
+    # Verify the token signature and type
+    payload = verify_token(refresh_token_cookie,
+                           credentials_exception, token_type="refresh")
+
+    user_id = payload.get("sub")
+    if not user_id:
+        raise InvalidTokenPayloadException("Invalid token received.")
+
+    # Revoke the presented token and store its replacement in one transaction.
+    # The revoke only matches a live token, so of two concurrent refreshes
+    # with the same cookie exactly one succeeds.
+    now = datetime.now(timezone.utc)
+    new_refresh_token = create_refresh_token({"sub": user_id})
+    expires_at = now + timedelta(days=settings.refresh_token_expire_days)
+    if await rotate_refresh_token_db(db, refresh_token_cookie, new_refresh_token, expires_at, now) != user_id:
+        raise credentials_exception
+
+    # Reload the user so the new access token carries current claims
+    if not (user := await get_user(db, user_id)):
+        raise credentials_exception
+    access_token, access_token_expires = create_access_token(
+        {"sub": user.id, "email": user.email, "is_admin": user.is_admin})
+
+    # Calculate cookie expiration in seconds
+    max_age = settings.refresh_token_expire_days * 24 * 3600
+
+    # Set the new refresh token as an HTTP-only cookie
+    response.set_cookie(
+        key="refresh_token",
+        value=new_refresh_token,
+        httponly=True,
+        max_age=max_age,
+        secure=False,       # Set secure=True if you are serving over HTTPS
+        samesite="lax",    # Adjust samesite as needed ("lax" or "strict")
+    )
+
+    # Return only the access token and token type in the response body
+    return Token(
+        access_token=access_token,
+        expiry=round(access_token_expires.timestamp()),
+        token_type="bearer"
+    )
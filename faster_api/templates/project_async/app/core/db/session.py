@@ -0,0 +1,44 @@
+"""Async database session and engine."""
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from app.core.config import settings
+from app.core.db.base import Base
+from app.core.db.pool import engine_options
+from app.core.db.profiler import install_profiler
+
+# Map sync drivers onto their async counterparts so the same DATABASE_URL
+# can be shared with alembic, which keeps running synchronously.
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+psycopg",
+    "postgresql+psycopg2": "postgresql+psycopg",
+}
+
+
+def get_async_database_url(database_url: str) -> str:
+    """Return database_url with an async capable driver."""
+    url = make_url(database_url)
+    drivername = ASYNC_DRIVERS.get(url.drivername, url.drivername)
+    return url.set(drivername=drivername).render_as_string(hide_password=False)
+
+
+async_database_url = get_async_database_url(settings.database_url)
+
+# Pool sizing, recycling and timeouts are configured through Settings
+engine = create_async_engine(
+    async_database_url,
+    **engine_options(async_database_url),
+)
+
+# Debug-mode statement profiling, see app.core.db.profiler
+if settings.db_profiler_enabled:
+    install_profiler(engine)
+
+SessionLocal = async_sessionmaker(
+    bind=engine, autoflush=False, expire_on_commit=False)
+
+
+async def init_models() -> None:
+    """Create all tables that do not exist yet (DB_SCHEMA_CHECK=create_all)."""
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
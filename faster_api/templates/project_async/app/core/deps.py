@@ -0,0 +1,153 @@
+"""Dependencies for API routes.
+
+The auth app (its models and cache, and passlib and jose through
+app.core.security) is imported by the dependencies that need it when they
+first run, so apps that only use get_db don't load it.
+"""
+from typing import TYPE_CHECKING, AsyncGenerator, Optional
+
+from app.core.db.session import SessionLocal
+from fastapi import Depends, HTTPException, WebSocket, status
+from fastapi.security import OAuth2PasswordBearer
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+if TYPE_CHECKING:
+    from app.auth.models import User
+    from app.auth.schemas import Principal
+    from app.auth.schemas import User as UserSchema
+
+
+async def get_db() -> AsyncGenerator[AsyncSession, None]:
+    """Request scoped unit of work.
+
+    CRUD functions only flush; the session is committed once after the
+    endpoint returns, or rolled back if it raised.
+    """
+    async with SessionLocal() as db:
+        try:
+            yield db
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
+
+
+# OAuth2 scheme for access token
+oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
+
+
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+def _current_user_id(token: str) -> str:
+    """Return the user id of a verified access token."""
+    from app.core.security import verify_token
+
+    credentials_exception = _credentials_exception()
+    payload = verify_token(token, credentials_exception, token_type="access")
+    user_id: Optional[str] = payload.get("sub")
+    if user_id is None:
+        raise credentials_exception
+    return user_id
+
+
+async def get_current_user(
+    db: AsyncSession = Depends(get_db),
+    token: str = Depends(oauth2_scheme),
+) -> "User":
+    """Retrieve current user based on JWT access token."""
+    from app.auth.crud import get_user
+
+    user = await get_user(db, _current_user_id(token))
+    if user is None:
+        raise _credentials_exception()
+    return user
+
+
+async def get_current_user_schema(
+    db: AsyncSession = Depends(get_db),
+    token: str = Depends(oauth2_scheme),
+) -> "UserSchema":
+    """Retrieve the current user's public fields.
+
+    Served from the principal cache when it has them (see app.auth.cache),
+    so a hit skips the users query. Use get_current_user for the row itself.
+    """
+    from app.auth.cache import cache_user, get_cached_user
+    from app.auth.crud import get_user
+    from app.auth.schemas import User as UserSchema
+
+    user_id = _current_user_id(token)
+    user = get_cached_user(user_id)
+    if user is None:
+        db_user = await get_user(db, user_id)
+        if db_user is None:
+            raise _credentials_exception()
+        user = UserSchema.model_validate(db_user)
+        cache_user(user)
+    return user
+
+
+async def get_current_principal(token: str = Depends(oauth2_scheme)) -> "Principal":
+    """Identify the caller from signed access token claims.
+
+    Unlike get_current_user this never opens a database session, so endpoints
+    that only need the caller's id, email or admin flag don't hold a pooled
+    connection for it. Claims are as fresh as the token (see
+    access_token_expire_minutes).
+    """
+    from app.auth.schemas import Principal
+    from app.core.security import verify_token
+
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+    payload = verify_token(token, credentials_exception, token_type="access")
+    try:
+        return Principal(id=payload["sub"], email=payload["email"], is_admin=payload["is_admin"])
+    except (KeyError, ValidationError):
+        # Tokens issued before the claims were embedded
+        raise credentials_exception
+
+
+async def authenticate_websocket(websocket: WebSocket) -> "User":
+    """Authenticate a WebSocket connection using a JWT token."""
+    from app.auth.crud import get_user
+    from app.core.security import verify_token
+
+    token = websocket.query_params.get("token")
+    if not token:
+        await websocket.close(code=1008)
+        raise HTTPException(status_code=403, detail="Missing token")
+
+    try:
+        async with SessionLocal() as db:
+            payload = verify_token(token, HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Invalid token",
+            ), token_type="access")
+
+            user_id: Optional[str] = payload.get("sub")
+            if user_id is None:
+                await websocket.close(code=1008)
+                raise HTTPException(
+                    status_code=403, detail="Invalid user ID in token")
+
+            user = await get_user(db, user_id)
+            if user is None:
+                await websocket.close(code=1008)
+                raise HTTPException(status_code=403, detail="User not found")
+
+            return user
+
+    except Exception as e:
+        await websocket.close(code=1008)
+        raise e
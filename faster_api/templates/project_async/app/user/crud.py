@@ -0,0 +1,107 @@
+
+"""Async CRUD functions for User app."""
+from typing import Any, Dict, Optional
+
+from app.auth.crud import get_user_by_email  # type: ignore
+from app.auth.crud import create_user, get_user  # type: ignore
+from app.auth.models import User as UserModel
+from app.auth.schemas import UserCreate
+from sqlalchemy import insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .models import Preferences, Profile
+
+# Name SQLAlchemy gives the index created by unique=True, index=True on User.email
+EMAIL_INDEX = "ix_users_email"
+
+
+async def get_preferences(db: AsyncSession, user_id: str) -> Optional[Preferences]:
+    """Retrieve preferences for a user by ID."""
+    result = await db.execute(select(Preferences).where(Preferences.user_id == user_id))
+    return result.scalars().first()
+
+
+async def create_preferences(db: AsyncSession, data: Dict[str, Any]) -> Preferences:
+    """Create a new preferences entry. 'data' must include 'user_id' and any preferences fields."""
+    db_prefs = Preferences(**data)
+    db.add(db_prefs)
+    await db.flush()
+    return db_prefs
+
+
+async def update_preferences(db: AsyncSession, user_id: str, updates: Dict[str, Any]) -> Optional[Preferences]:
+    """Update user's preferences with provided fields.
+
+    Issues a single UPDATE ... RETURNING; returns None when no row matched.
+    """
+    if not updates:
+        return await get_preferences(db, user_id)
+    result = await db.scalars(
+        update(Preferences).where(Preferences.user_id == user_id).values(**updates).returning(Preferences),
+        execution_options={"populate_existing": True},
+    )
+    db_prefs = result.first()
+    return db_prefs
+
+
+async def get_profile(db: AsyncSession, user_id: str) -> Optional[Profile]:
+    """Retrieve profile for a user by ID."""
+    result = await db.execute(select(Profile).where(Profile.user_id == user_id))
+    return result.scalars().first()
+
+
+async def create_profile(db: AsyncSession, data: Dict[str, Any]) -> Profile:
+    """Create a new profile entry. 'data' must include 'user_id' and any profile fields."""
+    db_profile = Profile(**data)
+    db.add(db_profile)
+    await db.flush()
+    return db_profile
+
+
+async def update_profile(db: AsyncSession, user_id: str, updates: Dict[str, Any]) -> Optional[Profile]:
+    """Update user's profile with provided fields.
+
+    Issues a single UPDATE ... RETURNING; returns None when no row matched.
+    """
+    if not updates:
+        return await get_profile(db, user_id)
+    result = await db.scalars(
+        update(Profile).where(Profile.user_id == user_id).values(**updates).returning(Profile),
+        execution_options={"populate_existing": True},
+    )
+    db_profile = result.first()
+    return db_profile
+
+
+def _is_duplicate_email(exc: IntegrityError) -> bool:
+    """Whether exc is a violation of the unique index on users.email.
+
+    SQLite names the column ("users.email"), PostgreSQL and MySQL the index.
+    """
+    message = str(exc.orig)
+    return "users.email" in message or EMAIL_INDEX in message
+
+
+async def register_user(db: AsyncSession, user: UserCreate, hashed_password: str) -> Optional[UserModel]:
+    """Insert a user with its profile and preferences in a single transaction.
+
+    The user row comes back through INSERT ... RETURNING, and a duplicate email
+    is detected by the unique constraint rather than a SELECT beforehand.
+    The inserts run in a savepoint, so a duplicate email only undoes them and
+    leaves earlier work in the session alone; returns None in that case. Any
+    other integrity error is raised.
+    """
+    try:
+        async with db.begin_nested():
+            db_user = (await db.scalars(
+                insert(UserModel).returning(UserModel),
+                [{"email": user.email, "hashed_password": hashed_password, "name": user.name}],
+            )).one()
+            await db.execute(insert(Profile), [{"user_id": db_user.id}])
+            await db.execute(insert(Preferences), [{"user_id": db_user.id}])
+    except IntegrityError as exc:
+        if not _is_duplicate_email(exc):
+            raise
+        return None
+    return db_user
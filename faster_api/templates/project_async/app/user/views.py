@@ -0,0 +1,60 @@
+"""User endpoints."""
+from app.auth.schemas import Principal
+from app.core import deps
+from app.core.responses import SchemaResponse, schema_response
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .crud import (get_preferences, get_profile, update_preferences,
+                   update_profile)
+from .schemas import Preferences, PreferencesCreate, Profile, ProfileCreate
+from .schemas import User as UserSchema
+
+router = APIRouter()
+
+
+# Get User
+@router.get("/", response_model=UserSchema)
+async def my_account(current_user: UserSchema = Depends(deps.get_current_user_schema)) -> SchemaResponse:
+    """Get current authenticated user."""
+    return schema_response(UserSchema, current_user)
+
+
+# User Preferences
+@router.get("/preferences", response_model=Preferences)
+async def read_preferences(db: AsyncSession = Depends(deps.get_db), principal: Principal = Depends(deps.get_current_principal)) -> SchemaResponse:
+    """Get preferences for the current user."""
+    db_prefs = await get_preferences(db, user_id=principal.id)
+    if not db_prefs:
+        raise HTTPException(status_code=404, detail="Preferences not found")
+    return schema_response(Preferences, db_prefs)
+
+
+@router.patch("/preferences", response_model=Preferences)
+async def patch_preferences(prefs_in: PreferencesCreate, db: AsyncSession = Depends(deps.get_db), principal: Principal = Depends(deps.get_current_principal)) -> SchemaResponse:
+    """Update preferences for the current user."""
+    db_prefs = await update_preferences(
+        db, user_id=principal.id, updates=prefs_in.model_dump(exclude_unset=True))
+    if not db_prefs:
+        raise HTTPException(status_code=404, detail="Preferences not found")
+    return schema_response(Preferences, db_prefs)
+
+
+# User Profile
+@router.get("/profile", response_model=Profile)
+async def read_profile(db: AsyncSession = Depends(deps.get_db), principal: Principal = Depends(deps.get_current_principal)) -> SchemaResponse:
+    """Get profile for the current user."""
+    db_profile = await get_profile(db, user_id=principal.id)
+    if not db_profile:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return schema_response(Profile, db_profile)
+
+
+@router.patch("/profile", response_model=Profile)
+async def patch_profile(profile_in: ProfileCreate, db: AsyncSession = Depends(deps.get_db), principal: Principal = Depends(deps.get_current_principal)) -> SchemaResponse:
+    """Update profile for the current user."""
+    db_profile = await update_profile(
+        db, user_id=principal.id, updates=profile_in.model_dump(exclude_unset=True))
+    if not db_profile:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return schema_response(Profile, db_profile)
@@ -0,0 +1,164 @@
+"""Pytest fixtures for application testing (async database mode).
+
+The schema is created once per test session and every test runs in a
+transaction that is rolled back afterwards, so tests stay isolated without
+recreating tables. Set TEST_DATABASE_URL to run against PostgreSQL; with
+pytest-xdist each worker uses its own database.
+"""
+import os
+import sys
+
+# Add 'backend' directory to sys.path so 'app' package is importable
+sys.path.insert(0, os.path.abspath(
+    os.path.join(os.path.dirname(__file__), '..')))
+# Settings are read when app is first imported, so configure them before
+os.environ['DATABASE_URL'] = 'sqlite:///:memory:'  # for Pydantic Settings
+# Cheap argon2 parameters: hashes stay real but take microseconds
+os.environ.setdefault('ARGON2_TIME_COST', '1')
+os.environ.setdefault('ARGON2_MEMORY_COST', '8')
+os.environ.setdefault('ARGON2_PARALLELISM', '1')
+# Off by default; tests cover the unauthenticated /health/db-pool endpoint
+os.environ.setdefault('DB_POOL_STATS_ENABLED', 'true')
+
+import asyncio
+from sqlalchemy.pool import StaticPool
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession, async_sessionmaker, create_async_engine
+from fastapi.testclient import TestClient
+from app.main import app
+from app.core.deps import get_db
+from app.core.config import settings
+from app.core.db.base import Base
+from app.core.db import session as session_module
+from app.core.db.testing import (DEFAULT_TEST_DATABASE_URL, create_database,
+                                 enable_sqlite_savepoints, worker_database_url)
+from app.auth.schemas import UserCreate
+from app.auth.crud import create_user
+import pytest
+from typing import Any, AsyncGenerator, Dict, Generator
+
+
+# In-memory SQLite unless TEST_DATABASE_URL is set, one database per xdist worker
+TEST_DATABASE_URL = worker_database_url(
+    os.environ.get('TEST_DATABASE_URL', DEFAULT_TEST_DATABASE_URL),
+    os.environ.get('PYTEST_XDIST_WORKER'))
+create_database(TEST_DATABASE_URL)
+SQLALCHEMY_DATABASE_URL = session_module.get_async_database_url(TEST_DATABASE_URL)
+
+# Create test engine and sessionmaker
+if SQLALCHEMY_DATABASE_URL.startswith("sqlite"):
+    engine = create_async_engine(
+        SQLALCHEMY_DATABASE_URL,
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+else:
+    engine = create_async_engine(SQLALCHEMY_DATABASE_URL)
+enable_sqlite_savepoints(engine)
+TestingSessionLocal = async_sessionmaker(
+    bind=engine, autoflush=False, expire_on_commit=False)
+
+# Override the session module's engine and SessionLocal for testing
+session_module.engine = engine
+session_module.SessionLocal = TestingSessionLocal
+
+# Tables are created once per session below, not from alembic migrations
+settings.db_schema_check = "off"
+
+
+async def _create_all() -> None:
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+
+
+async def _drop_all() -> None:
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+    # Close the shared aiosqlite connection so its worker thread can exit
+    await engine.dispose()
+
+
+async def _begin() -> AsyncConnection:
+    connection = await engine.connect()
+    await connection.begin()
+    return connection
+
+
+async def _rollback(connection: AsyncConnection) -> None:
+    await connection.rollback()
+    await connection.close()
+
+
+@pytest.fixture
+def anyio_backend() -> str:
+    """Run async tests on asyncio only."""
+    return "asyncio"
+
+
+@pytest.fixture(scope="session", autouse=True)
+def setup_test_database() -> Generator[None, Any, Any]:
+    """Create the schema once for the whole test session."""
+    asyncio.run(_create_all())
+    yield
+    asyncio.run(_drop_all())
+
+
+@pytest.fixture(scope="function", autouse=True)
+def rollback_test_transaction(setup_test_database: None) -> Generator[None, Any, Any]:
+    """Run each test in a transaction that is rolled back afterwards.
+
+    Every session made by TestingSessionLocal during the test, including
+    the ones the TestClient opens on its own event loop, joins the outer
+    transaction; their commits only release SAVEPOINTs.
+    """
+    connection = asyncio.run(_begin())
+    TestingSessionLocal.configure(
+        bind=connection, join_transaction_mode="create_savepoint")
+    try:
+        yield
+    finally:
+        TestingSessionLocal.configure(bind=engine)
+        asyncio.run(_rollback(connection))
+
+
+@pytest.fixture(scope="function")
+async def db_session() -> AsyncGenerator[AsyncSession, None]:
+    """Return an async SQLAlchemy session for a test."""
+    async with TestingSessionLocal() as session:
+        yield session
+
+
+@pytest.fixture(scope="function")
+def client() -> Generator[TestClient, None, None]:
+    """Return a FastAPI TestClient using the test database.
+
+    The TestClient runs the app on its own event loop, so each request gets a
+    fresh session instead of sharing one across loops.
+    """
+    async def override_get_db() -> AsyncGenerator[AsyncSession, None]:
+        # Same unit of work semantics as deps.get_db
+        async with TestingSessionLocal() as session:
+            try:
+                yield session
+                await session.commit()
+            except Exception:
+                await session.rollback()
+                raise
+
+    app.dependency_overrides[get_db] = override_get_db
+    with TestClient(app) as test_client:
+        yield test_client
+    app.dependency_overrides.clear()
+
+
+@pytest.fixture(scope="function")
+def new_user_data() -> Dict[str, Any]:
+    """Default data for creating a new user."""
+    return {"email": "test@example.com", "password": "password123", "name": "Test User"}
+
+
+@pytest.fixture(scope="function")
+async def test_user(db_session: AsyncSession, new_user_data: Dict[str, Any]) -> Any:
+    """Create and return a test user."""
+    user_in = UserCreate(**new_user_data)
+    return await create_user(db_session, user_in)
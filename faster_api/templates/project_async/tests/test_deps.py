@@ -0,0 +1,98 @@
+# type: ignore[reportUnknownVariableType]
+"""Tests for dependency functions."""
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import app.auth.cache as auth_cache
+import app.auth.crud as auth_crud
+import app.core.deps as deps
+import app.core.security as security
+import pytest
+from app.auth.schemas import User as UserSchema
+from fastapi import HTTPException
+
+NOW = datetime.now(timezone.utc)
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_get_current_user_invalid_token(monkeypatch: pytest.MonkeyPatch) -> None:
+    # verify_token raises HTTPException
+    monkeypatch.setattr(security, 'verify_token', lambda token,
+                        exc, token_type: (_ for _ in ()).throw(exc))
+    with pytest.raises(HTTPException):
+        await deps.get_current_user(db=None, token='bad')
+
+
+async def test_get_current_user_missing_sub(monkeypatch: pytest.MonkeyPatch) -> None:
+    # verify_token returns no 'sub'
+    monkeypatch.setattr(security, 'verify_token',
+                        lambda token, exc, token_type: {})
+    with pytest.raises(HTTPException):
+        await deps.get_current_user(db=None, token='tok')
+
+
+async def test_get_current_user_not_found(monkeypatch: pytest.MonkeyPatch) -> None:
+    # valid payload but get_user returns None
+    payload = {'sub': 'user1'}
+
+    async def get_user(db, uid):
+        return None
+    monkeypatch.setattr(security, 'verify_token', lambda token,
+                        exc, token_type: payload)
+    monkeypatch.setattr(auth_crud, 'get_user', get_user)
+    with pytest.raises(HTTPException):
+        await deps.get_current_user(db=object(), token='tok')
+
+
+async def test_get_current_user_success(monkeypatch: pytest.MonkeyPatch) -> None:
+    # valid payload and get_user returns a user
+    user_obj = SimpleNamespace(id='u1')
+    payload = {'sub': 'u1'}
+
+    async def get_user(db, uid):
+        return user_obj
+    monkeypatch.setattr(security, 'verify_token', lambda token,
+                        exc, token_type: payload)
+    monkeypatch.setattr(auth_crud, 'get_user', get_user)
+    result = await deps.get_current_user(db=object(), token='tok')
+    assert result is user_obj
+
+
+async def test_get_current_user_schema_caches_user(monkeypatch: pytest.MonkeyPatch) -> None:
+    # the row is returned and cached as the public User schema
+    user_obj = SimpleNamespace(id='u1', email='u1@example.com', name=None, is_admin=False,
+                               created_at=NOW, updated_at=NOW)
+    payload = {'sub': 'u1'}
+    cached = []
+
+    async def get_user(db, uid):
+        return user_obj
+    monkeypatch.setattr(security, 'verify_token', lambda token,
+                        exc, token_type: payload)
+    monkeypatch.setattr(auth_crud, 'get_user', get_user)
+    monkeypatch.setattr(auth_cache, 'get_cached_user', lambda uid: None)
+    monkeypatch.setattr(auth_cache, 'cache_user', cached.append)
+    result = await deps.get_current_user_schema(db=object(), token='tok')
+    assert isinstance(result, UserSchema)
+    assert result.id == 'u1' and result.email == 'u1@example.com'
+    assert cached == [result]
+
+
+async def test_get_current_principal_from_claims(monkeypatch: pytest.MonkeyPatch) -> None:
+    # principal is built from token claims alone, no session involved
+    payload = {'sub': 'u1', 'email': 'u1@example.com', 'is_admin': True}
+    monkeypatch.setattr(security, 'verify_token', lambda token,
+                        exc, token_type: payload)
+    principal = await deps.get_current_principal(token='tok')
+    assert principal.id == 'u1'
+    assert principal.email == 'u1@example.com'
+    assert principal.is_admin is True
+
+
+async def test_get_current_principal_missing_claims(monkeypatch: pytest.MonkeyPatch) -> None:
+    # tokens without the embedded claims are rejected
+    monkeypatch.setattr(security, 'verify_token',
+                        lambda token, exc, token_type: {'sub': 'u1'})
+    with pytest.raises(HTTPException):
+        await deps.get_current_principal(token='tok')
@@ -0,0 +1,129 @@
+"""Tests for user CRUD operations (async database mode)."""
+import datetime
+from typing import Any
+
+import app.auth.cache as auth_cache
+import pytest
+from app.auth.crud import create_refresh_token, get_refresh_token
+from app.auth.schemas import User as UserSchema
+from app.auth.schemas import UserCreate
+from app.core.cache import MemoryCacheBackend
+from app.core.security import token_digest
+from app.user.crud import (create_preferences, create_profile, get_preferences,
+                           get_profile, register_user, update_preferences,
+                           update_profile)
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_preferences_crud(db_session: AsyncSession, test_user: Any) -> None:
+    # Initially no preferences exist for the user
+    assert await get_preferences(db_session, test_user.id) is None
+    # Create preferences
+    prefs = await create_preferences(db_session, {"user_id": test_user.id})
+    assert prefs.user_id == test_user.id
+    # Retrieve preferences
+    fetched = await get_preferences(db_session, test_user.id)
+    assert fetched
+    assert fetched.id == prefs.id
+    # Update preferences with empty data (no-op)
+    updated = await update_preferences(db_session, test_user.id, {})
+    assert updated
+    assert updated.id == prefs.id
+    # Updating non-existent preferences returns None
+    assert await update_preferences(db_session, "no-such-user", {}) is None
+
+
+async def test_profile_crud(db_session: AsyncSession, test_user: Any) -> None:
+    # Initially no profile exists for the user
+    assert await get_profile(db_session, test_user.id) is None
+    # Create profile
+    profile = await create_profile(db_session, {"user_id": test_user.id})
+    assert profile.user_id == test_user.id
+    # Retrieve profile
+    fetched = await get_profile(db_session, test_user.id)
+    assert fetched
+    assert fetched.id == profile.id
+    # Update profile field
+    updated = await update_profile(db_session, test_user.id, {"timezone": "UTC"})
+    assert updated
+    assert updated.timezone == "UTC"
+    # Updating non-existent profile returns None
+    assert await update_profile(db_session, "no-user", {"timezone": "UTC"}) is None
+
+
+async def test_user_write_evicts_cached_user(db_session: AsyncSession, test_user: Any, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(auth_cache, "user_cache",
+                        MemoryCacheBackend(maxsize=10, ttl=60))
+    await create_profile(db_session, {"user_id": test_user.id})
+    await db_session.commit()
+    auth_cache.cache_user(UserSchema.model_validate(test_user))
+    # The cache only holds user columns, so profile writes leave it alone
+    await update_profile(db_session, test_user.id, {"timezone": "UTC"})
+    await db_session.commit()
+    cached = auth_cache.get_cached_user(test_user.id)
+    assert isinstance(cached, UserSchema) and cached.email == test_user.email
+    # Committing a write to the user drops it, flushing alone keeps it
+    test_user.name = "Renamed"
+    await db_session.flush()
+    assert auth_cache.get_cached_user(test_user.id) is not None
+    await db_session.commit()
+    assert auth_cache.get_cached_user(test_user.id) is None
+
+
+async def test_register_user_single_transaction(db_session: AsyncSession) -> None:
+    user_in = UserCreate(email="new@example.com", password="pw", name="New")
+    user = await register_user(db_session, user_in, hashed_password="hashed")
+    assert user is not None
+    # Server defaults come back through RETURNING
+    assert user.created_at is not None
+    assert (profile := await get_profile(db_session, user.id))
+    assert profile.user_id == user.id
+    assert await get_preferences(db_session, user.id)
+    # The unique email constraint rejects a second registration
+    assert await register_user(db_session, user_in, hashed_password="hashed") is None
+
+
+async def test_register_duplicate_keeps_earlier_work(db_session: AsyncSession, test_user: Any) -> None:
+    # Only the savepoint around the inserts is rolled back, not the flushed profile
+    await create_profile(db_session, {"user_id": test_user.id, "timezone": "UTC"})
+    user_in = UserCreate(email=test_user.email, password="pw", name="Dup")
+    assert await register_user(db_session, user_in, hashed_password="hashed") is None
+    profile = await get_profile(db_session, test_user.id)
+    assert profile is not None and profile.timezone == "UTC"
+
+
+async def test_update_profile_single_statement(db_session: AsyncSession, test_user: Any) -> None:
+    await create_profile(db_session, {"user_id": test_user.id})
+    await db_session.flush()
+    statements: list[str] = []
+
+    def record(conn: Any, cursor: Any, statement: str, *args: Any) -> None:
+        statements.append(statement)
+    engine = db_session.bind.sync_engine
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        updated = await update_profile(db_session, test_user.id, {"locale": "en_US"})
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    assert updated
+    assert updated.locale == "en_US"
+    assert len(statements) == 1
+    assert statements[0].startswith("UPDATE user_profiles")
+    assert "RETURNING" in statements[0]
+
+
+async def test_refresh_token_stored_as_digest(db_session: AsyncSession, test_user: Any) -> None:
+    expires_at = datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(days=1)
+    db_token = await create_refresh_token(db_session, test_user.id, "raw.jwt.value", expires_at)
+    # Only the fixed-width digest is persisted
+    assert db_token.token_hash == token_digest("raw.jwt.value")
+    assert len(db_token.token_hash) == 32
+    assert not hasattr(db_token, "token")
+    # Lookups hash the presented token
+    fetched = await get_refresh_token(db_session, "raw.jwt.value")
+    assert fetched
+    assert fetched.id == db_token.id
+    assert await get_refresh_token(db_session, "other.jwt.value") is None
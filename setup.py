@@ -46,8 +46,27 @@ setup(
         "uvicorn",
         "rich",
         "python-dotenv",
-        "pydantic-settings",
+        "pydantic-settings>=2.7",
     ],
+    extras_require={
+        # Needed by projects generated with `startproject --async-db`
+        "async": [
+            "sqlalchemy[asyncio]",
+            "aiosqlite",
+        ],
+        # uvloop and httptools for `fasterapi serve`
+        "server": [
+            "uvicorn[standard]",
+        ],
+        # Async HTTP client for `fasterapi bench`
+        "bench": [
+            "httpx",
+        ],
+        # Shared user cache (USER_CACHE_BACKEND=redis)
+        "redis": [
+            "redis",
+        ],
+    },
 
     entry_points={
         "console_scripts": [
@@ -0,0 +1,39 @@
+"""Tests for the template registry and cached manifests."""
+from pathlib import Path
+
+import pytest
+
+from faster_api import registry
+
+
+@pytest.fixture(autouse=True)
+def user_dirs(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("FASTERAPI_CONFIG_DIR", str(tmp_path / "config"))
+    monkeypatch.setenv("FASTERAPI_CACHE_DIR", str(tmp_path / "cache"))
+
+
+def test_registered_template_resolves_to_its_directory(tmp_path: Path) -> None:
+    template = tmp_path / "tpl"
+    template.mkdir()
+    (template / "README.md").write_text("<<PROJECT_NAME>>\n")
+    manifest = registry.register_template("tpl", template)
+    assert list(manifest["files"]) == ["README.md"]
+    assert registry.resolve_template("tpl") == template.resolve()
+
+
+def test_removed_template_directory_is_not_found(tmp_path: Path) -> None:
+    template = tmp_path / "gone"
+    template.mkdir()
+    registry.register_template("gone", template)
+    template.rmdir()
+
+    with pytest.raises(registry.TemplateNotFoundError, match="not a directory"):
+        registry.resolve_template("gone")
+    # A cached manifest is not reused for a directory that went away
+    with pytest.raises(FileNotFoundError):
+        registry.load_manifest(template)
+
+
+def test_unknown_template_lists_registered_names() -> None:
+    with pytest.raises(registry.TemplateNotFoundError, match="registered: none"):
+        registry.resolve_template("missing")